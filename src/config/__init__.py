@@ -23,6 +23,23 @@ class Settings(BaseSettings):
     app_debug: bool
     app_name: str
     data_path: Path = BASE_DIR / "data"
+    # parser executor: inline | thread | process
+    parser_executor_mode: str = "inline"
+    parser_max_workers: int = 2
+    # body (bytes) lebih besar dari ini di-parse di worker pool
+    parser_offload_threshold: int = 65536
+    # parse catalog per chunk selama body upstream diterima (tanpa cache)
+    parser_streaming: bool = False
+    # dedup transaksi per (memberid, refid): lama response disimpan (detik)
+    trx_dedup_ttl: float = 600.0
+    trx_dedup_max_entries: int = 10_000
+    # sidecar cache record tervalidasi (.<file>.yaml.cache) untuk start cepat
+    data_cache: bool = True
+    # backend member: yaml (snapshot in-memory) | sqlite (lookup + LRU)
+    member_backend: str = "yaml"
+    # default <data_path>/members.db, diisi lewat srv_dtoimport
+    member_db_path: Path | None = None
+    member_cache_size: int = 10_000
 
 
 @lru_cache
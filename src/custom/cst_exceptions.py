@@ -38,6 +38,21 @@ class ServiceError(AppExceptionError):
     status_code = 503
 
 
+class UpstreamError(AppExceptionError):
+    default_message = "Upstream request failed."
+    status_code = 502
+
+
+class UpstreamTimeoutError(UpstreamError):
+    default_message = "Upstream request timed out."
+    status_code = 504
+
+
+class UpstreamResponseTooLargeError(UpstreamError):
+    default_message = "Upstream response exceeds the maximum body size."
+    status_code = 502
+
+
 class ValidationError(AppExceptionError):
     default_message = "Validation failed."
     status_code = 422
@@ -97,3 +112,9 @@ class ProductNotFoundError(AppExceptionError):
 class ProductAuthError(AppExceptionError):
     default_message = "Product authentication failed."
     status_code = 401
+
+
+# transaction exceptions
+class DuplicateTransactionError(AppExceptionError):
+    default_message = "Refid already used for a different transaction."
+    status_code = 409
@@ -8,7 +8,7 @@ data_service = DataService()
 
 
 @asynccontextmanager
-async def app_lifespan(app):  # noqa: ANN001, D103, RUF029
+async def app_lifespan(app):  # noqa: ANN001, D103
     try:
         data_service.start()
     except Exception as e:
@@ -19,3 +19,11 @@ async def app_lifespan(app):  # noqa: ANN001, D103, RUF029
         data_service.stop()
     except Exception as e:
         logger.error(f"Error stopping DataService: {e}")
+    try:
+        await data_service.upstream_clients.aclose()
+    except Exception as e:
+        logger.error(f"Error closing upstream clients: {e}")
+    try:
+        data_service.parser_executor.shutdown()
+    except Exception as e:
+        logger.error(f"Error stopping parser executor: {e}")
@@ -4,10 +4,20 @@ from fastapi import Depends, HTTPException, Request
 
 from src.domain.member.rep_member import MemberRepository
 from src.domain.module.rep_module import ModuleRepository
+from src.domain.parser.rep_parser import ParserRuleRepository
 from src.service.auth.srv_dgproductauth import DigiposProductAuthService
 from src.service.auth.srv_memberauth import MemberAuthService
 from src.service.auth.srv_moduleauth import ModuleAuthService
+from src.service.auth.srv_trxauth import TransactionAuthService
+from src.service.dedup.srv_dedup import TransactionDeduplicator
 from src.service.dto.srv_dtoservice import DataService, DigiposProductRepository
+from src.service.parser.digipos.executor_parser import ParserExecutor
+from src.service.srv_querybuilder import DigiposQueryBuilder
+from src.service.upstream.srv_breaker import CircuitBreakerRegistry
+from src.service.upstream.srv_forwarder import UpstreamForwarder
+from src.service.upstream.srv_health import ModuleHealthTracker
+from src.service.upstream.srv_httpclient import UpstreamClientRegistry
+from src.service.upstream.srv_limiter import ConcurrencyLimiterRegistry
 
 
 # -------------------------------
@@ -57,19 +67,118 @@ def get_digipos_repo(
 DepDigiposRepo = Annotated[DigiposProductRepository, Depends(get_digipos_repo)]
 
 
+def get_parser_rule_repo(
+    data_service: DataService = Depends(get_data_service),
+) -> ParserRuleRepository:
+    return data_service.parser_rule_repo
+
+
+DepParserRuleRepo = Annotated[ParserRuleRepository, Depends(get_parser_rule_repo)]
+
+
+# ParserExecutor Dependency
+def get_parser_executor(
+    data_service: DataService = Depends(get_data_service),
+) -> ParserExecutor:
+    return data_service.parser_executor
+
+
+DepParserExecutor = Annotated[ParserExecutor, Depends(get_parser_executor)]
+
+
+# DigiposQueryBuilder Dependency (singleton, template di-cache per product/module)
+def get_digipos_query_builder(
+    data_service: DataService = Depends(get_data_service),
+) -> DigiposQueryBuilder:
+    return data_service.query_builder
+
+
+DepDigiposQueryBuilder = Annotated[
+    DigiposQueryBuilder, Depends(get_digipos_query_builder)
+]
+
+
+# TransactionDeduplicator Dependency
+def get_trx_dedup(
+    data_service: DataService = Depends(get_data_service),
+) -> TransactionDeduplicator:
+    return data_service.trx_dedup
+
+
+DepTrxDedup = Annotated[TransactionDeduplicator, Depends(get_trx_dedup)]
+
+
 # -------------------------------
-# MemberAuthService Dependency
+# UpstreamClientRegistry Dependency
 # -------------------------------
-def get_member_auth_service(member_repo: DepMemberRepo) -> MemberAuthService:
-    return MemberAuthService(member_repo)
+def get_upstream_clients(
+    data_service: DataService = Depends(get_data_service),
+) -> UpstreamClientRegistry:
+    return data_service.upstream_clients
+
+
+DepUpstreamClients = Annotated[UpstreamClientRegistry, Depends(get_upstream_clients)]
+
+
+# CircuitBreakerRegistry Dependency
+def get_circuit_breakers(
+    data_service: DataService = Depends(get_data_service),
+) -> CircuitBreakerRegistry:
+    return data_service.circuit_breakers
+
+
+DepCircuitBreakers = Annotated[CircuitBreakerRegistry, Depends(get_circuit_breakers)]
+
+
+# ConcurrencyLimiterRegistry Dependency
+def get_concurrency_limiters(
+    data_service: DataService = Depends(get_data_service),
+) -> ConcurrencyLimiterRegistry:
+    return data_service.concurrency_limiters
+
+
+DepConcurrencyLimiters = Annotated[
+    ConcurrencyLimiterRegistry, Depends(get_concurrency_limiters)
+]
+
+
+# ModuleHealthTracker Dependency
+def get_module_health(
+    data_service: DataService = Depends(get_data_service),
+) -> ModuleHealthTracker:
+    return data_service.module_health
+
+
+DepModuleHealth = Annotated[ModuleHealthTracker, Depends(get_module_health)]
+
+
+# UpstreamForwarder Dependency
+def get_upstream_forwarder(
+    data_service: DataService = Depends(get_data_service),
+) -> UpstreamForwarder:
+    return data_service.upstream_forwarder
+
+
+DepUpstreamForwarder = Annotated[UpstreamForwarder, Depends(get_upstream_forwarder)]
+
+
+# -------------------------------
+# Auth services (singleton di DataService)
+# -------------------------------
+def get_member_auth_service(
+    data_service: DataService = Depends(get_data_service),
+) -> MemberAuthService:
+    return data_service.member_auth_service
 
 
 DepMemberAuthService = Annotated[MemberAuthService, Depends(get_member_auth_service)]
 
 
 # ModuleAuthService Dependency
-def get_module_auth_service(module_repo: DepModuleRepo) -> ModuleAuthService:
-    return ModuleAuthService(module_repo)
+def get_module_auth_service(
+    data_service: DataService = Depends(get_data_service),
+) -> ModuleAuthService:
+    return data_service.module_auth_service
 
 
 DepModuleAuthService = Annotated[ModuleAuthService, Depends(get_module_auth_service)]
@@ -77,11 +186,21 @@ DepModuleAuthService = Annotated[ModuleAuthService, Depends(get_module_auth_serv
 
 # ProductAuthService Dependency
 def get_digi_product_auth_service(
-    digipos_repo: DepDigiposRepo,
+    data_service: DataService = Depends(get_data_service),
 ) -> DigiposProductAuthService:
-    return DigiposProductAuthService(digipos_repo)
+    return data_service.product_auth_service
 
 
 DepDigiProductAuthService = Annotated[
     DigiposProductAuthService, Depends(get_digi_product_auth_service)
 ]
+
+
+# TransactionAuthService Dependency (member + produk + module sekaligus)
+def get_trx_auth_service(
+    data_service: DataService = Depends(get_data_service),
+) -> TransactionAuthService:
+    return data_service.trx_auth_service
+
+
+DepTrxAuthService = Annotated[TransactionAuthService, Depends(get_trx_auth_service)]
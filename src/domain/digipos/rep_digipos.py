@@ -2,58 +2,157 @@ from pathlib import Path
 
 from src.domain.digipos.sch_digipos import DGProductInDB  # pastikan model ini ada
 from src.mlogg import logger
-from src.service.dto.srv_dtoloader import GenericYamlLoader
+from src.service.dto.srv_dtoloader import GenericYamlLoader, LoadDiff, LoadResult
+from src.service.dto.srv_dtosnapshot import (
+    RepositorySnapshot,
+    SnapshotPublisher,
+    active_only,
+)
+
+# index sekunder, dibangun ulang bersama index primer setiap reload
+PRODUCT_INDEXES = {
+    "provider": lambda p: (p.provider,),
+    "type": lambda p: (p.type,),
+    "module": lambda p: p.list_modules,
+    "active": lambda p: (p.is_active,),
+    "active_provider": active_only(lambda p: (p.provider,)),
+    "active_type": active_only(lambda p: (p.type,)),
+    "active_module": active_only(lambda p: p.list_modules),
+}
 
 
 class DigiposProductRepository:
     """Repository for Digipos products data."""
 
-    def __init__(self, file_path: Path | str | None = None):
+    def __init__(self, file_path: Path | str | None = None, cache: bool = False):
         if file_path is None:
             file_path = Path("data/digipos.yaml")
         self.file_path = Path(file_path)
-        self.loader = GenericYamlLoader("products", "productid", DGProductInDB, logger)
-        self._products: list[DGProductInDB] = []
-        self._products_dict: dict[str, DGProductInDB] = {}
+        self.loader = GenericYamlLoader(
+            "products", "productid", DGProductInDB, logger, cache=cache
+        )
+        self._publisher: SnapshotPublisher[DGProductInDB] = SnapshotPublisher(
+            lambda p: p.productid, PRODUCT_INDEXES
+        )
         logger.info("Initializing DigiposProductRepository", path=self.file_path)
         self.reload()
 
-    def _load_data_from_file(self) -> list[DGProductInDB]:
-        return self.loader.load_and_validate(self.file_path)
+    def _load_data_from_file(self) -> LoadResult:
+        return self.loader.load_incremental(self.file_path)
 
-    def reload(self) -> None:
+    def reload(self) -> LoadDiff:
+        """Reload digipos.yaml; return productid diff (kosong jika gagal/tidak berubah)."""
         logger.info("Starting DigiposProductRepository reload")
         try:
-            products = self._load_data_from_file()
-            self._products = products
-            self._products_dict = {p.productid: p for p in products}
+            result = self._load_data_from_file()
+        except Exception as e:
+            # snapshot last-good tetap aktif, jangan kosongkan katalog produk
+            logger.error(
+                "DigiposProductRepository reload failed, keeping existing data",
+                error=str(e),
+                current_count=len(self._publisher.fail(e)),
+            )
+            return LoadDiff()
+
+        if not result.diff and self._publisher.current.version:
+            snapshot = self._publisher.unchanged()
             logger.info(
-                "DigiposProductRepository reload completed successfully",
-                count=len(products),
+                "DigiposProductRepository reload: no changes", count=len(snapshot)
             )
-        except Exception as e:
-            logger.error("DigiposProductRepository reload failed", error=str(e))
-            self._products = []
-            self._products_dict = {}
+            return result.diff
+        snapshot = self._publisher.publish(result.items)
+        logger.info(
+            "DigiposProductRepository reload completed successfully",
+            count=len(snapshot),
+            version=snapshot.version,
+            added=len(result.diff.added),
+            removed=len(result.diff.removed),
+            changed=len(result.diff.changed),
+        )
+        return result.diff
+
+    @property
+    def snapshot(self) -> RepositorySnapshot[DGProductInDB]:
+        return self._publisher.current
+
+    @property
+    def version(self) -> int:
+        return self._publisher.current.version
 
     def get_product_by_id(self, productid: str) -> DGProductInDB | None:
-        return self._products_dict.get(productid)
+        return self._publisher.current.by_id.get(productid)
 
     def get_all_products(self) -> list[DGProductInDB]:
-        return self._products
+        return list(self._publisher.current.items)
+
+    def get_active_products(self) -> list[DGProductInDB]:
+        return list(self._publisher.current.lookup("active", True))
+
+    def get_products_by_provider(
+        self, provider: str, active_only: bool = False
+    ) -> list[DGProductInDB]:
+        index = "active_provider" if active_only else "provider"
+        return list(self._publisher.current.lookup(index, provider))
+
+    def get_products_by_type(
+        self, product_type: str, active_only: bool = False
+    ) -> list[DGProductInDB]:
+        index = "active_type" if active_only else "type"
+        return list(self._publisher.current.lookup(index, product_type))
+
+    def get_products_by_module(
+        self, moduleid: str, active_only: bool = False
+    ) -> list[DGProductInDB]:
+        index = "active_module" if active_only else "module"
+        return list(self._publisher.current.lookup(index, moduleid))
+
+    def find_products(
+        self,
+        provider: str | None = None,
+        product_type: str | None = None,
+        moduleid: str | None = None,
+        active_only: bool = False,
+    ) -> list[DGProductInDB]:
+        """Filter produk lewat index: bucket terkecil dipakai, sisanya disaring."""
+        snapshot = self._publisher.current
+        prefix = "active_" if active_only else ""
+        filters = [
+            (f"{prefix}{index}", key)
+            for index, key in (
+                ("provider", provider),
+                ("type", product_type),
+                ("module", moduleid),
+            )
+            if key is not None
+        ]
+        if not filters:
+            return list(
+                snapshot.lookup("active", True) if active_only else snapshot.items
+            )
+
+        buckets = [snapshot.lookup(index, key) for index, key in filters]
+        smallest = min(buckets, key=len)
+        others = [
+            {id(p) for p in bucket} for bucket in buckets if bucket is not smallest
+        ]
+        return [p for p in smallest if all(id(p) in ids for ids in others)]
 
     def get_product_count(self) -> int:
-        return len(self._products)
+        return len(self._publisher.current)
 
     def is_product_active(self, productid: str) -> bool:
         product = self.get_product_by_id(productid)
         return bool(product and getattr(product, "is_active", False))
 
     def get_product_ids(self) -> list[str]:
-        return list(self._products_dict.keys())
+        return list(self._publisher.current.by_id)
 
     def has_product(self, productid: str) -> bool:
-        return productid in self._products_dict
+        return productid in self._publisher.current.by_id
+
+    def snapshot_stats(self) -> dict:
+        return self._publisher.stats()
 
     def clear_data(self) -> None:
-        self._products = []
+        self._publisher.publish(())
+        self.loader.reset()
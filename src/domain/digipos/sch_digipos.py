@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
 
@@ -23,6 +25,11 @@ class DGProductInDB(BaseModel):
     required_params: DGReqParams
     optional_params: dict[str, str | int] | None = None
     list_modules: list[str]  # moduleid saja
+    # fixed: pakai moduleid dari client, failover: pilih module tersehat
+    routing_mode: Literal["fixed", "failover"] = "fixed"
+    # aman dikirim ulang setelah sampai upstream (mis. cek catalog); default
+    # tidak: transaksi pembelian tidak boleh ter-eksekusi dua kali
+    idempotent: bool = False
 
 
 class DgProducList(BaseModel):
@@ -5,6 +5,8 @@ Repository pattern for member data management:
 - Delegates loading tasks to pure functions in srv_memberdata
 - Public interface for data access
 - Error handling with fallback behavior
+- Immutable snapshot swapped atomically on reload (lock-free reads)
+- Optional SQLite store backend (bounded LRU) for large member bases
 - Integration with FileWatcher via reload callback
 """
 
@@ -12,63 +14,74 @@ from pathlib import Path
 
 from src.domain.member.sch_member import MemberInDB
 from src.mlogg import logger
-from src.service.dto.srv_dtoloader import GenericYamlLoader
+from src.service.dto.srv_dtoloader import GenericYamlLoader, LoadDiff, LoadResult
+from src.service.dto.srv_dtosnapshot import RepositorySnapshot, SnapshotPublisher
+from src.service.dto.srv_dtostore import RecordView, SqliteRecordStore
 
 
 class MemberRepository:
     """Repository for member data with fallback behavior and clean interface."""
 
-    def __init__(self, file_path: Path | str | None = None):
+    def __init__(
+        self,
+        file_path: Path | str | None = None,
+        cache: bool = False,
+        store: SqliteRecordStore[MemberInDB] | None = None,
+    ):
         """Initialize MemberRepository with optional file path.
 
         Args:
             file_path: Path to members.yaml file. If None, uses default data/members.yaml
+            cache: Keep validated records in a sidecar cache for fast startup
+            store: Read members from this SQLite store instead of the YAML file
         """
         if file_path is None:
             file_path = Path("data/members.yaml")
 
-        self.file_path = Path(file_path)
-        self.loader = GenericYamlLoader("members", "memberid", MemberInDB, logger)
-        self._members: list[MemberInDB] = []
-        self._members_dict: dict[str, MemberInDB] = {}
+        self.store = store
+        # file yang di-watch: database SQLite jika memakai store
+        self.file_path = store.db_path if store is not None else Path(file_path)
+        self.loader = GenericYamlLoader(
+            "members", "memberid", MemberInDB, logger, cache=cache
+        )
+        self._publisher: SnapshotPublisher[MemberInDB] = SnapshotPublisher(
+            lambda m: m.memberid
+        )
 
         logger.info("Initializing MemberRepository", path=self.file_path)
         self.reload()
 
-    def _load_data_from_file(self) -> list[MemberInDB]:
-        """Load data using GenericYamlLoader.
+    def _load_data_from_file(self) -> LoadResult:
+        """Load data using GenericYamlLoader (only new/changed items re-validated).
 
         Returns:
-            List of validated MemberInDB objects or empty list if file is empty.
+            Validated MemberInDB objects plus the ID diff against the previous load.
 
         Raises:
             FileNotFoundError: If YAML file doesn't exist
             ValueError: If YAML structure is invalid or duplicates found
             ValidationError: If Pydantic validation fails
         """
-        return self.loader.load_and_validate(self.file_path)
+        return self.loader.load_incremental(self.file_path)
 
-    def reload(self) -> None:
+    def reload(self) -> LoadDiff:
         """Reload all data from file and update internal state.
 
         Uses fallback behavior - if reload fails, keeps existing data and logs error.
         This ensures the repository remains functional even if file becomes temporarily invalid.
+
+        Returns:
+            Added/removed/changed IDs, empty if nothing changed or reload failed.
         """
         logger.info("Starting MemberRepository reload")
+        if self.store is not None:
+            return self._refresh_store(self.store)
         try:
-            new_members = self._load_data_from_file()
-
-            # Update both list and dict storage
-            self._members = new_members
-            self._members_dict = {m.memberid: m for m in new_members}
-
-            logger.info(
-                "MemberRepository reload completed successfully", count=len(new_members)
-            )
-
+            result = self._load_data_from_file()
         except FileNotFoundError as e:
             # Only fallback if we already have data loaded, else propagate
-            if not self._members:
+            if not self._publisher.current.items:
+                self._publisher.fail(e)
                 logger.error(
                     "Member data file not found during initial load",
                     error=str(e),
@@ -78,20 +91,75 @@ class MemberRepository:
             logger.error(
                 "Failed to reload member data, keeping existing data",
                 error=str(e),
-                current_count=len(self._members),
+                current_count=len(self._publisher.fail(e)),
             )
+            return LoadDiff()
         except Exception as e:
             # Fallback behavior - keep existing data on reload failure
             logger.error(
                 "Failed to reload member data, keeping existing data",
                 error=str(e),
-                current_count=len(self._members),
+                current_count=len(self._publisher.fail(e)),
             )
             # Don't re-raise - this allows the repository to continue functioning
+            return LoadDiff()
+
+        if not result.diff and self._publisher.current.version:
+            snapshot = self._publisher.unchanged()
+            logger.info("MemberRepository reload: no changes", count=len(snapshot))
+            return result.diff
+
+        # List + index dibangun di sini, reader melihat snapshot lama/baru utuh
+        snapshot = self._publisher.publish(result.items)
+
+        logger.info(
+            "MemberRepository reload completed successfully",
+            count=len(snapshot),
+            version=snapshot.version,
+            added=len(result.diff.added),
+            removed=len(result.diff.removed),
+            changed=len(result.diff.changed),
+        )
+        return result.diff
+
+    def _refresh_store(self, store: SqliteRecordStore[MemberInDB]) -> LoadDiff:
+        """Follow the latest import; keeps serving the old rows on failure."""
+        try:
+            diff = store.refresh()
+        except Exception as e:
+            logger.error(
+                "Failed to refresh member store, keeping existing data",
+                error=str(e),
+                path=str(store.db_path),
+            )
+            return LoadDiff()
+        logger.info(
+            "MemberRepository store refreshed",
+            generation=store.generation,
+            added=len(diff.added),
+            removed=len(diff.removed),
+            changed=len(diff.changed),
+        )
+        return diff
+
+    def _records(self) -> RecordView[MemberInDB]:
+        return self.store if self.store is not None else self._publisher.current
+
+    @property
+    def snapshot(self) -> RepositorySnapshot[MemberInDB]:
+        """Current immutable snapshot (read once, use for consistent multi-lookups)."""
+        return self._publisher.current
+
+    @property
+    def version(self) -> int:
+        """Snapshot version (store generation), bumped on every successful reload."""
+        if self.store is not None:
+            return self.store.generation
+        return self._publisher.current.version
 
     def get_member_by_id(self, memberid: str) -> MemberInDB | None:
         """Get member by ID with O(1) lookup."""
-        member = self._members_dict.get(memberid)
+        member = self._records().get(memberid)
         if member:
             logger.debug("Member found", memberid=memberid)
         else:
@@ -99,12 +167,12 @@ class MemberRepository:
         return member
 
     def get_all_members(self) -> list[MemberInDB]:
-        """Get all members as a copy of the internal list."""
-        return self._members.copy()
+        """Get all members as a copy (full table scan with the SQLite store)."""
+        return list(self._records())
 
     def get_member_count(self) -> int:
         """Get total number of members."""
-        return len(self._members)
+        return len(self._records())
 
     def is_member_active(self, memberid: str) -> bool:
         """Quick check if member exists and is active."""
@@ -118,14 +186,22 @@ class MemberRepository:
 
     def get_member_ids(self) -> list[str]:
         """Get all member IDs."""
-        return list(self._members_dict.keys())
+        return self._records().ids()
 
     def has_member(self, memberid: str) -> bool:
         """Check if member exists."""
-        return memberid in self._members_dict
+        return memberid in self._records()
+
+    def snapshot_stats(self) -> dict:
+        """Snapshot version, count and failed reload counters (or store stats)."""
+        if self.store is not None:
+            return self.store.stats()
+        return self._publisher.stats()
 
     def clear_data(self) -> None:
-        """Clear all stored data (useful for testing)."""
-        self._members.clear()
-        self._members_dict.clear()
+        """Clear all stored data (useful for testing); only the LRU with a store."""
+        if self.store is not None:
+            self.store.clear_cache()
+        self._publisher.publish(())
+        self.loader.reset()
         logger.info("Member data cleared from repository")
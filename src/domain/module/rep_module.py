@@ -5,6 +5,7 @@ Repository pattern for member data management:
 - Delegates loading tasks to pure functions in srv_memberdata
 - Public interface for data access
 - Error handling with fallback behavior
+- Immutable snapshot swapped atomically on reload (lock-free reads)
 - Integration with FileWatcher via reload callback
 """
 
@@ -12,64 +13,74 @@ from pathlib import Path
 
 from src.domain.module.sch_module import ModuleInDB
 from src.mlogg import logger
-from src.service.dto.srv_dtoloader import GenericYamlLoader
+from src.service.dto.srv_dtoloader import GenericYamlLoader, LoadDiff, LoadResult
+from src.service.dto.srv_dtosnapshot import (
+    RepositorySnapshot,
+    SnapshotPublisher,
+    active_only,
+)
+
+# index sekunder, dibangun ulang bersama index primer setiap reload
+MODULE_INDEXES = {
+    "provider": lambda m: (m.provider,),
+    "active_provider": active_only(lambda m: (m.provider,)),
+}
 
 
 class ModuleRepository:
     """Repository for module data with fallback behavior and clean interface."""
 
-    def __init__(self, file_path: Path | str | None = None):
+    def __init__(self, file_path: Path | str | None = None, cache: bool = False):
         """Initialize ModuleRepository with optional file path.
 
         Args:
             file_path: Path to modules.yaml file. If None, uses default data/modules.yaml
+            cache: Keep validated records in a sidecar cache for fast startup
         """
         if file_path is None:
             file_path = Path("data/modules.yaml")
 
         self.file_path = Path(file_path)
 
-        self.loader = GenericYamlLoader("modules", "moduleid", ModuleInDB, logger)
-        self._modules: list[ModuleInDB] = []
-        self._modules_dict: dict[str, ModuleInDB] = {}
+        self.loader = GenericYamlLoader(
+            "modules", "moduleid", ModuleInDB, logger, cache=cache
+        )
+        self._publisher: SnapshotPublisher[ModuleInDB] = SnapshotPublisher(
+            lambda m: m.moduleid, MODULE_INDEXES
+        )
 
         logger.info("Initializing ModuleRepository", path=self.file_path)
         self.reload()
 
-    def _load_data_from_file(self) -> list[ModuleInDB]:
-        """Load data using GenericYamlLoader.
+    def _load_data_from_file(self) -> LoadResult:
+        """Load data using GenericYamlLoader (only new/changed items re-validated).
 
         Returns:
-            List of validated ModuleInDB objects or empty list if file is empty.
+            Validated ModuleInDB objects plus the ID diff against the previous load.
 
         Raises:
             FileNotFoundError: If YAML file doesn't exist
             ValueError: If YAML structure is invalid or duplicates found
             ValidationError: If Pydantic validation fails
         """
-        return self.loader.load_and_validate(self.file_path)
+        return self.loader.load_incremental(self.file_path)
 
-    def reload(self) -> None:
+    def reload(self) -> LoadDiff:
         """Reload all data from file and update internal state.
 
         Uses fallback behavior - if reload fails, keeps existing data and logs error.
         This ensures the repository remains functional even if file becomes temporarily invalid.
+
+        Returns:
+            Added/removed/changed IDs, empty if nothing changed or reload failed.
         """
         logger.info("Starting ModuleRepository reload")
         try:
-            new_modules = self._load_data_from_file()
-
-            # Update both list and dict storage
-            self._modules = new_modules
-            self._modules_dict = {m.moduleid: m for m in new_modules}
-
-            logger.info(
-                "ModuleRepository reload completed successfully", count=len(new_modules)
-            )
-
+            result = self._load_data_from_file()
         except FileNotFoundError as e:
             # Only fallback if we already have data loaded, else propagate
-            if not self._modules:
+            if not self._publisher.current.items:
+                self._publisher.fail(e)
                 logger.error(
                     "Module data file not found during initial load",
                     error=str(e),
@@ -79,20 +90,50 @@ class ModuleRepository:
             logger.error(
                 "Failed to reload module data, keeping existing data",
                 error=str(e),
-                current_count=len(self._modules),
+                current_count=len(self._publisher.fail(e)),
             )
+            return LoadDiff()
         except Exception as e:
             # Fallback behavior - keep existing data on reload failure
             logger.error(
                 "Failed to reload module data, keeping existing data",
                 error=str(e),
-                current_count=len(self._modules),
+                current_count=len(self._publisher.fail(e)),
             )
             # Don't re-raise - this allows the repository to continue functioning
+            return LoadDiff()
+
+        if not result.diff and self._publisher.current.version:
+            snapshot = self._publisher.unchanged()
+            logger.info("ModuleRepository reload: no changes", count=len(snapshot))
+            return result.diff
+
+        # List + index dibangun di sini, reader melihat snapshot lama/baru utuh
+        snapshot = self._publisher.publish(result.items)
+
+        logger.info(
+            "ModuleRepository reload completed successfully",
+            count=len(snapshot),
+            version=snapshot.version,
+            added=len(result.diff.added),
+            removed=len(result.diff.removed),
+            changed=len(result.diff.changed),
+        )
+        return result.diff
+
+    @property
+    def snapshot(self) -> RepositorySnapshot[ModuleInDB]:
+        """Current immutable snapshot (read once, use for consistent multi-lookups)."""
+        return self._publisher.current
+
+    @property
+    def version(self) -> int:
+        """Snapshot version, bumped on every successful reload."""
+        return self._publisher.current.version
 
     def get_module_by_id(self, moduleid: str) -> ModuleInDB | None:
         """Get module by ID with O(1) lookup."""
-        module = self._modules_dict.get(moduleid)
+        module = self._publisher.current.by_id.get(moduleid)
         if module:
             logger.debug("Module found", moduleid=moduleid)
         else:
@@ -101,11 +142,11 @@ class ModuleRepository:
 
     def get_all_modules(self) -> list[ModuleInDB]:
         """Get all modules as a copy of the internal list."""
-        return self._modules.copy()
+        return list(self._publisher.current.items)
 
     def get_module_count(self) -> int:
         """Get total number of modules."""
-        return len(self._modules)
+        return len(self._publisher.current)
 
     def is_module_active(self, moduleid: str) -> bool:
         """Quick check if module exists and is active."""
@@ -114,18 +155,26 @@ class ModuleRepository:
 
     def get_module_ids(self) -> list[str]:
         """Get all module IDs."""
-        return list(self._modules_dict.keys())
+        return list(self._publisher.current.by_id)
 
     def get_module_by_provider(self, provider: str) -> list[ModuleInDB]:
-        """Get all modules by provider."""
-        return [module for module in self._modules if module.provider == provider]
+        """Get all modules by provider (O(1) index lookup)."""
+        return list(self._publisher.current.lookup("provider", provider))
+
+    def get_active_modules_by_provider(self, provider: str) -> list[ModuleInDB]:
+        """Get active modules by provider (O(1) index lookup)."""
+        return list(self._publisher.current.lookup("active_provider", provider))
 
     def has_module(self, moduleid: str) -> bool:
         """Check if module exists."""
-        return moduleid in self._modules_dict
+        return moduleid in self._publisher.current.by_id
+
+    def snapshot_stats(self) -> dict:
+        """Snapshot version, count and failed reload counters."""
+        return self._publisher.stats()
 
     def clear_data(self) -> None:
         """Clear all stored data (useful for testing)."""
-        self._modules.clear()
-        self._modules_dict.clear()
+        self._publisher.publish(())
+        self.loader.reset()
         logger.info("Module data cleared from repository")
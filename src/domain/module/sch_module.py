@@ -21,3 +21,17 @@ class ModuleInDB(ModuleConfig):
     max_retries: int
     second_wait: int
     provider: str
+    # connection pool upstream (per module)
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    # circuit breaker upstream
+    breaker_failure_threshold: int = 5
+    breaker_recovery_timeout: float = 30.0
+    breaker_half_open_max_calls: int = 1
+    # concurrency limiter + admission queue
+    max_concurrency: int = 10
+    max_queue: int = 50
+    queue_timeout: float = 5.0
+    # batas ukuran body response upstream (bytes), 0 = tanpa batas
+    max_body_size: int = 5 * 1024 * 1024
@@ -0,0 +1,78 @@
+from pathlib import Path
+
+from src.domain.parser.sch_parser import ParserRuleInDB
+from src.mlogg import logger
+from src.service.dto.srv_dtoloader import GenericYamlLoader
+from src.service.parser.digipos.factory_parser import ProcessorFactory
+from src.service.parser.digipos.rules_parser import (
+    ParserRuleSet,
+    get_active_ruleset,
+    set_active_ruleset,
+)
+
+
+class ParserRuleRepository:
+    """Repository for parser exclusion/compaction rules (parser_rules.yaml).
+
+    Contoh:
+        rules:
+          - scope: RECHARGE
+            exclude_quota_metadata: ["Music RBT/NSP"]
+            word_replacements: {internet: Net, nasional: Nas}
+          - scope: DATA
+            exclude_productnames: ["Roaming Umroh"]
+
+    File tidak ada -> default bawaan processor. Reload gagal -> ruleset
+    terakhir yang valid tetap dipakai.
+    """
+
+    def __init__(self, file_path: Path | str | None = None):
+        if file_path is None:
+            file_path = Path("data/parser_rules.yaml")
+        self.file_path = Path(file_path)
+        self.loader = GenericYamlLoader("rules", "scope", ParserRuleInDB, logger)
+        self._rules: list[ParserRuleInDB] = []
+        logger.info("Initializing ParserRuleRepository", path=self.file_path)
+        self.reload()
+
+    def _load_data_from_file(self) -> list[ParserRuleInDB]:
+        if not self.file_path.exists():
+            logger.info(
+                "Parser rules file not found, using built-in defaults",
+                path=str(self.file_path),
+            )
+            return []
+        return self.loader.load_and_validate(self.file_path)
+
+    def reload(self) -> None:
+        logger.info("Starting ParserRuleRepository reload")
+        try:
+            rules = self._load_data_from_file()
+            # compile di luar swap, request berjalan tetap pakai ruleset lama
+            ruleset = ParserRuleSet({r.scope: r for r in rules})
+            ProcessorFactory.compile_rules(ruleset)
+        except Exception as e:
+            logger.error(
+                "ParserRuleRepository reload failed, keeping previous rules",
+                error=str(e),
+                version=get_active_ruleset().version,
+            )
+            return
+        self._rules = rules
+        set_active_ruleset(ruleset)
+        logger.info(
+            "ParserRuleRepository reload completed successfully",
+            count=len(rules),
+            version=ruleset.version,
+        )
+
+    def get_all_rules(self) -> list[ParserRuleInDB]:
+        return self._rules
+
+    def get_rule(self, scope: str) -> ParserRuleInDB | None:
+        scope = scope.upper()
+        return next((r for r in self._rules if r.scope.upper() == scope), None)
+
+    @property
+    def version(self) -> int:
+        return get_active_ruleset().version
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+
+
+class ParserRuleInDB(BaseModel):
+    # processor type (RECHARGE, ACTIVATION) atau category (DATA, VF, ...)
+    scope: str
+    # None = pakai default processor, [] = matikan exclusion
+    exclude_subcategories: list[str] | None = None
+    exclude_productnames: list[str] | None = None
+    exclude_quota_metadata: list[str] | None = None
+    unit_suffixes: dict[str, str] | None = None
+    word_replacements: dict[str, str] | None = None
+
+
+class ParserRuleList(BaseModel):
+    rules: list[ParserRuleInDB]
@@ -1,5 +1,6 @@
 from src.router.rtr_debug import router as member_router
 from src.router.rtr_digipos import router as digipos_router
+from src.router.rtr_upstream import router as upstream_router
 
 
 def register_routes(app):  # noqa: ANN001
@@ -12,3 +13,4 @@ def register_routes(app):  # noqa: ANN001
     """
     app.include_router(member_router, tags=["debug"])
     app.include_router(digipos_router, tags=["digipos"])
+    app.include_router(upstream_router, tags=["debug"])
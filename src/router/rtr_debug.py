@@ -1,6 +1,15 @@
 from fastapi import APIRouter
 
-from src.dependencies.dep_data import DepMemberRepo, DepModuleRepo
+from src.dependencies.dep_data import (
+    DepDigiposQueryBuilder,
+    DepDigiposRepo,
+    DepMemberRepo,
+    DepModuleRepo,
+    DepParserExecutor,
+    DepParserRuleRepo,
+    DepTrxDedup,
+)
+from src.service.parser.digipos.parser_service import get_cache_stats
 
 router = APIRouter()
 
@@ -29,3 +38,48 @@ async def debug_module(module_id: str, module_repo: DepModuleRepo):
     if not module:
         return {"error": "Module not found"}
     return module.model_dump()
+
+
+@router.get("/debug/parser/cache")
+async def debug_parser_cache():
+    """Show parsed-catalog cache size and hit/miss counters."""
+    return get_cache_stats()
+
+
+@router.get("/debug/parser/rules")
+async def debug_parser_rules(parser_rule_repo: DepParserRuleRepo):
+    """Show parser rule overrides and the active ruleset version."""
+    rules = [r.model_dump() for r in parser_rule_repo.get_all_rules()]
+    return {"version": parser_rule_repo.version, "rules": rules}
+
+
+@router.get("/debug/parser/executor")
+async def debug_parser_executor(parser_executor: DepParserExecutor):
+    """Show parser executor mode, offload counts and queue vs parse time."""
+    return parser_executor.stats()
+
+
+@router.get("/debug/querybuilder")
+async def debug_query_builder(query_builder: DepDigiposQueryBuilder):
+    """Show compiled query template count and invalidation generation."""
+    return query_builder.stats()
+
+
+@router.get("/debug/trx/dedup")
+async def debug_trx_dedup(trx_dedup: DepTrxDedup):
+    """Show in-flight and new / coalesced / replayed transaction counts."""
+    return trx_dedup.stats()
+
+
+@router.get("/debug/snapshots")
+async def debug_snapshots(
+    member_repo: DepMemberRepo,
+    module_repo: DepModuleRepo,
+    digipos_repo: DepDigiposRepo,
+):
+    """Show active snapshot version, count and failed reloads per repository."""
+    return {
+        "member": member_repo.snapshot_stats(),
+        "module": module_repo.snapshot_stats(),
+        "digipos": digipos_repo.snapshot_stats(),
+    }
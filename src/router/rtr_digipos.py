@@ -1,26 +1,47 @@
-from typing import Annotated
+from collections.abc import Awaitable
+from typing import Annotated, Any
 
-import httpx
-from fastapi import APIRouter, Depends, Query, Response
+from fastapi import APIRouter, Query, Response
 
+from src.custom.cst_exceptions import UpstreamError
 from src.dependencies.dep_data import (
+    DepDigiposQueryBuilder,
     DepDigiposRepo,
-    DepDigiProductAuthService,
-    DepMemberAuthService,
-    DepModuleAuthService,
-    DepModuleRepo,
+    DepParserExecutor,
+    DepTrxAuthService,
+    DepTrxDedup,
+    DepUpstreamForwarder,
 )
 from src.domain.transaction.sch_transaction import DigiposTrxModel
-from src.service.parser.digipos.parser_service import process_category_response
+from src.service.auth.srv_trxauth import TransactionContext
+from src.service.dedup.srv_dedup import DedupOutcome, StoredResponse
+from src.service.parser.digipos.base_parser import MAX_CHAR_LIMIT
+from src.service.parser.digipos.executor_parser import ParserExecutor
 from src.service.srv_querybuilder import DigiposQueryBuilder
+from src.service.upstream.srv_forwarder import UpstreamForwarder
+from src.service.upstream.srv_retry import UpstreamResult
 
 router = APIRouter()
 
+# field body upstream yang ikut dicetak di reply (di luar message)
+REPLY_RESERVE = ("to",)
+
 
 @router.get("/digipos/products")
-def get_digipos_products(digipos_repo: DepDigiposRepo):
-    products = [p.model_dump() for p in digipos_repo.get_all_products()]
-    return {"products": products}
+def get_digipos_products(
+    digipos_repo: DepDigiposRepo,
+    provider: str | None = None,
+    product_type: Annotated[str | None, Query(alias="type")] = None,
+    moduleid: str | None = None,
+    active: bool = False,
+):
+    found = digipos_repo.find_products(
+        provider=provider,
+        product_type=product_type,
+        moduleid=moduleid,
+        active_only=active,
+    )
+    return {"products": [p.model_dump() for p in found]}
 
 
 @router.get("/digipos/products/{product_id}")
@@ -42,39 +63,111 @@ async def digipos_buy():
     pass
 
 
-def get_digipos_query_builder(
-    product_repo: DepDigiposRepo,
-    module_repo: DepModuleRepo,
-) -> DigiposQueryBuilder:
-    return DigiposQueryBuilder(product_repo, module_repo)
+def upstream_headers(upstream: UpstreamResult) -> dict[str, str]:
+    """Header diagnostik retry dan antrian upstream untuk response ke client."""
+    return {
+        "X-Upstream-Attempts": str(upstream.attempts),
+        "X-Upstream-Retries": str(upstream.retries),
+        "X-Upstream-Retry-Wait-Ms": str(round(upstream.retry_wait * 1000, 2)),
+        "X-Upstream-Elapsed-Ms": str(round(upstream.elapsed * 1000, 2)),
+        "X-Upstream-Queue-Wait-Ms": str(round(upstream.queue_wait * 1000, 2)),
+        "X-Upstream-Module": upstream.moduleid,
+        "X-Upstream-Failovers": str(upstream.failovers),
+    }
+
+
+def reply_text(trxid: Any, status: int, to: Any, message: str) -> str:
+    """Body plain-text reply transaksi ke client."""
+    return f"trxid={trxid}&status={status}&to={to}&message={message}"
+
+
+async def forward_digipos_trx(
+    trx_query: DigiposTrxModel,
+    ctx: TransactionContext,
+    upstream_forwarder: UpstreamForwarder,
+    parser_executor: ParserExecutor,
+    query_builder: DigiposQueryBuilder,
+) -> StoredResponse:
+    """Forward transaksi ke upstream dan parse catalog jadi response plain-text."""
+    category = ctx.product.required_params.category
+    # streaming: catalog di-parse per chunk selama body upstream diterima
+    stream = parser_executor.open_stream(category, reserve=REPLY_RESERVE)
+    if ctx.candidates:
+        _, result, upstream = await upstream_forwarder.forward_with_failover(
+            ctx.candidates,
+            lambda m: query_builder.build_resolved(
+                trx_query.model_copy(update={"moduleid": m.moduleid}), ctx.product, m
+            ),
+            stream,
+            idempotent=ctx.product.idempotent,
+        )
+    else:
+        result = query_builder.build_resolved(trx_query, ctx.product, ctx.module)
+        upstream = await upstream_forwarder.forward(
+            ctx.module,
+            result["method"],
+            result["url"],
+            result["params"],
+            stream,
+            idempotent=ctx.product.idempotent,
+        )
+    resp = upstream.response
+    trxid = result["params"].get("trxid") or result["params"].get("refid")
+    status = resp.status_code
+    # budget message = MAX_CHAR_LIMIT - prefix reply; panjang `to` baru
+    # diketahui setelah decode, dikurangkan parser lewat REPLY_RESERVE
+    budget = MAX_CHAR_LIMIT - len(reply_text(trxid, status, "", ""))
+    # non-streaming: decode di parser; cache hit catalog tidak decode sama sekali
+    try:
+        if stream is not None and status < 400:
+            parsed = stream.finish(budget)
+        else:
+            parsed = await parser_executor.process(
+                category, upstream.body, budget=budget, reserve=REPLY_RESERVE
+            )
+    except ValueError as e:
+        raise UpstreamError(
+            "Upstream returned a non-JSON response",
+            context={"moduleid": upstream.moduleid, "status": resp.status_code},
+            cause=e,
+        ) from e
+    to = parsed.document.get("to", "")
+    plain_text = reply_text(trxid, status, to, parsed.output)
+    headers = upstream_headers(upstream)
+    headers["X-Compaction-Level"] = parsed.level.name
+    headers["X-Products-Dropped"] = str(parsed.dropped_products)
+    return StoredResponse(content=plain_text, headers=headers, upstream_status=status)
 
 
 @router.get("/digipos/trx")
 async def digipos_trx(
     trx_query: Annotated[DigiposTrxModel, Query()],
-    product_auth_service: DepDigiProductAuthService,
-    module_auth_service: DepModuleAuthService,
-    member_auth_service: DepMemberAuthService,
-    query_builder: DigiposQueryBuilder = Depends(get_digipos_query_builder),
+    trx_auth_service: DepTrxAuthService,
+    trx_dedup: DepTrxDedup,
+    upstream_forwarder: DepUpstreamForwarder,
+    parser_executor: DepParserExecutor,
+    query_builder: DepDigiposQueryBuilder,
 ):
-    member_obj = member_auth_service.authenticate_and_verify(trx_query)
-    product_obj = product_auth_service.authenticate_and_check(
-        trx_query.product, "digipos"
-    )
-    module_obj = module_auth_service.authenticate_and_check_provider(
-        trx_query.moduleid, "digipos"
+    # otorisasi dulu: response tersimpan hanya untuk member pemilik refid
+    ctx = trx_auth_service.authorize_digipos(trx_query)
+
+    def execute() -> Awaitable[StoredResponse]:
+        return forward_digipos_trx(
+            trx_query, ctx, upstream_forwarder, parser_executor, query_builder
+        )
+
+    if trx_query.refid:
+        stored, outcome = await trx_dedup.run(
+            (trx_query.memberid, trx_query.refid),
+            (trx_query.product, trx_query.dest, trx_query.moduleid),
+            execute,
+        )
+    else:
+        stored, outcome = await execute(), DedupOutcome.NEW
+    headers = {**stored.headers, "X-Dedup": outcome.value}
+    return Response(
+        content=stored.content,
+        status_code=stored.status_code,
+        media_type="text/plain",
+        headers=headers,
     )
-    result = query_builder.build(trx_query)
-    async with httpx.AsyncClient(timeout=module_obj.timeout) as client:
-        if result["method"].upper() == "GET":
-            resp = await client.get(result["url"], params=result["params"])
-        else:
-            resp = await client.post(result["url"], json=result["params"])
-    category = result["params"].get("category")
-    parsed = process_category_response(category, resp.text) if category else ""
-    trxid = result["params"].get("trxid") or result["params"].get("refid")
-    status = resp.status_code
-    body_json = resp.json()
-    to = body_json.get("to", "")
-    plain_text = f"trxid={trxid}&status={status}&to={to}&message={parsed}"
-    return Response(content=plain_text, media_type="text/plain")
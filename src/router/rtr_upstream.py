@@ -0,0 +1,34 @@
+from fastapi import APIRouter
+
+from src.dependencies.dep_data import (
+    DepCircuitBreakers,
+    DepConcurrencyLimiters,
+    DepModuleHealth,
+    DepUpstreamClients,
+)
+
+router = APIRouter()
+
+
+@router.get("/debug/upstream/pools")
+async def debug_upstream_pools(upstream_clients: DepUpstreamClients):
+    """Show upstream connection pool stats per module for debugging."""
+    return upstream_clients.stats()
+
+
+@router.get("/debug/upstream/breakers")
+async def debug_upstream_breakers(circuit_breakers: DepCircuitBreakers):
+    """Show circuit breaker state per module for debugging."""
+    return circuit_breakers.stats()
+
+
+@router.get("/debug/upstream/limiters")
+async def debug_upstream_limiters(concurrency_limiters: DepConcurrencyLimiters):
+    """Show concurrency limiter queue depth and wait time per module."""
+    return concurrency_limiters.stats()
+
+
+@router.get("/debug/upstream/health")
+async def debug_upstream_health(module_health: DepModuleHealth):
+    """Show live latency/error health per module used by failover routing."""
+    return module_health.stats()
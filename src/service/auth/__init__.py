@@ -1,7 +1,10 @@
 from src.service.auth.srv_memberauth import MemberAuthService
 from src.service.auth.srv_moduleauth import ModuleAuthService
+from src.service.auth.srv_trxauth import TransactionAuthService, TransactionContext
 
 __all__ = [
     "MemberAuthService",
     "ModuleAuthService",
+    "TransactionAuthService",
+    "TransactionContext",
 ]
@@ -20,25 +20,28 @@ class DigiposProductAuthService:
         """Autentikasi produk, cek provider, status aktif, dan modul."""
         with logger.contextualize(productid=productid, op="digipos_product_auth"):
             logger.info("Mulai autentikasi produk Digipos")
+            product_db = self.check(productid, provider)
+            logger.info("Autentikasi produk Digipos sukses")
+            return product_db
 
-            product_db = self._get_active_product(productid)
-
-            if product_db.provider != provider:
-                logger.error(f"Provider mismatch: {product_db.provider} != {provider}")
-                raise ProductAuthError(
-                    "Provider tidak sesuai",
-                    context={"productid": productid, "provider": provider},
-                )
+    def check(self, productid: str, provider: str) -> DGProductInDB:
+        """Cek produk aktif, provider, dan modul tanpa context log sendiri."""
+        product_db = self._get_active_product(productid)
 
-            if not product_db.list_modules or len(product_db.list_modules) == 0:
-                logger.error("Produk tidak memiliki modul aktif")
-                raise ProductAuthError(
-                    "Produk tidak memiliki modul aktif",
-                    context={"productid": productid},
-                )
+        if product_db.provider != provider:
+            logger.error(f"Provider mismatch: {product_db.provider} != {provider}")
+            raise ProductAuthError(
+                "Provider tidak sesuai",
+                context={"productid": productid, "provider": provider},
+            )
 
-            logger.info("Autentikasi produk Digipos sukses")
-            return product_db
+        if not product_db.list_modules or len(product_db.list_modules) == 0:
+            logger.error("Produk tidak memiliki modul aktif")
+            raise ProductAuthError(
+                "Produk tidak memiliki modul aktif",
+                context={"productid": productid},
+            )
+        return product_db
 
     def _get_active_product(self, productid: str) -> DGProductInDB:
         """Ambil produk dari DB + cek aktif."""
@@ -1,3 +1,4 @@
+import hmac
 from typing import Protocol, runtime_checkable
 
 from src.custom.cst_exceptions import (
@@ -28,17 +29,20 @@ class MemberAuthService:
         """Autentikasi member, cek status, dan validasi signature."""
         with logger.contextualize(memberid=request.memberid, op="auth_verify"):
             logger.info("Mulai autentikasi member")
-
-            member_db = self._get_active_member(request.memberid)
-
-            if request.sign:
-                self._verify_signature(request, member_db)
-            else:
-                self._verify_without_signature(request, member_db)
-
+            member_db = self.verify(request)
             logger.info("Autentikasi sukses")
             return member_db
 
+    def verify(self, request: TrxBaseModel) -> MemberInDB:
+        """Cek member + signature/PIN tanpa context log sendiri."""
+        member_db = self._get_active_member(request.memberid)
+
+        if request.sign:
+            self._verify_signature(request, member_db)
+        else:
+            self._verify_without_signature(request, member_db)
+        return member_db
+
     def _get_active_member(self, memberid: str) -> MemberInDB:
         """Ambil member dari DB + cek aktif."""
         member = self.member_manager.get_member_by_id(memberid)
@@ -65,6 +69,7 @@ class MemberAuthService:
 
     def _verify_signature(self, request: TrxBaseModel, member_db: MemberInDB):
         """Verifikasi signature yang dikirim client (OtomaX format)."""
+        received = str(request.sign or "")
         expected_data = {
             "memberid": request.memberid,
             "product": str(request.product or ""),
@@ -73,19 +78,13 @@ class MemberAuthService:
             "pin": member_db.pin.get_secret_value(),
             "password": member_db.password.get_secret_value(),
         }
-
-        logger.debug(f"Expected data: {expected_data}")
-        logger.debug(f"Received signature: {request.sign}")
-
-        verify_result = self.otomax_sign_service.verify_signature(
-            expected_data, str(request.sign or "")
+        # hitung sekali: dipakai untuk compare dan log kegagalan
+        expected_sig = self.otomax_sign_service.generate_transaction_signature(
+            **expected_data
         )
-        logger.debug(f"Verify result: {verify_result}")
+        logger.debug(f"Received signature: {request.sign}")
 
-        if not verify_result:
-            expected_sig = self.otomax_sign_service.generate_transaction_signature(
-                **expected_data
-            )
+        if not hmac.compare_digest(received.encode(), expected_sig.encode()):
             logger.error(
                 "Signature tidak valid. Diterima={}, Diharapkan={}",
                 request.sign,
@@ -25,16 +25,30 @@ class ModuleAuthService:
         """Autentikasi module, cek status aktif, dan provider."""
         with logger.contextualize(moduleid=moduleid, op="module_auth"):
             logger.info("Mulai autentikasi module")
-
-            module_db = self._get_active_module(moduleid)
-
-            if module_db.provider != provider:
-                logger.error(f"Provider mismatch: {module_db.provider} != {provider}")
-                raise ModuleAuthError("Provider tidak sesuai")
-
+            module_db = self.check_provider(moduleid, provider)
             logger.info("Autentikasi module sukses")
             return module_db
 
+    def check_provider(self, moduleid: str, provider: str) -> ModuleInDB:
+        """Cek module aktif + provider tanpa context log sendiri."""
+        module_db = self._get_active_module(moduleid)
+
+        if module_db.provider != provider:
+            logger.error(f"Provider mismatch: {module_db.provider} != {provider}")
+            raise ModuleAuthError("Provider tidak sesuai")
+        return module_db
+
+    def get_active_modules(
+        self, moduleids: list[str], provider: str
+    ) -> list[ModuleInDB]:
+        """Ambil module aktif dengan provider sesuai, lewati yang tidak valid."""
+        modules = []
+        for moduleid in moduleids:
+            module = self.module_manager.get_module_by_id(moduleid)
+            if module is not None and module.is_active and module.provider == provider:
+                modules.append(module)
+        return modules
+
     def _get_active_module(self, moduleid: str) -> ModuleInDB:
         """Ambil module dari DB + cek aktif."""
         module = self.module_manager.get_module_by_id(moduleid)
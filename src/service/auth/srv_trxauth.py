@@ -0,0 +1,73 @@
+"""Otorisasi transaksi: member, produk dan module dalam satu langkah.
+
+Hasilnya `TransactionContext` berisi objek yang sudah di-resolve, sehingga
+router dan query builder tidak perlu lookup repository lagi.
+"""
+
+from dataclasses import dataclass, field
+
+from src.domain.digipos.sch_digipos import DGProductInDB
+from src.domain.member.sch_member import MemberInDB
+from src.domain.module.sch_module import ModuleInDB
+from src.domain.transaction.sch_transaction import DigiposTrxModel
+from src.mlogg import logger
+from src.service.auth.srv_dgproductauth import DigiposProductAuthService
+from src.service.auth.srv_memberauth import MemberAuthService
+from src.service.auth.srv_moduleauth import ModuleAuthService
+
+
+@dataclass(frozen=True)
+class TransactionContext:
+    """Member, produk dan module yang sudah terotorisasi untuk satu request."""
+
+    member: MemberInDB
+    product: DGProductInDB
+    module: ModuleInDB
+    # kandidat failover (module diminta dulu), kosong untuk routing fixed
+    candidates: list[ModuleInDB] = field(default_factory=list)
+
+
+class TransactionAuthService:
+    """Layanan otorisasi transaksi gabungan member + produk + module."""
+
+    def __init__(
+        self,
+        member_auth: MemberAuthService,
+        product_auth: DigiposProductAuthService,
+        module_auth: ModuleAuthService,
+    ):
+        self.member_auth = member_auth
+        self.product_auth = product_auth
+        self.module_auth = module_auth
+
+    def authorize_digipos(
+        self, trx: DigiposTrxModel, provider: str = "digipos"
+    ) -> TransactionContext:
+        """Validasi member, produk dan module, lalu kembalikan context-nya.
+
+        Raises:
+            MemberNotFoundError, MemberAuthError, MemberInvalidSignatureError,
+            MemberInvalidCredentialsError: Member tidak valid
+            ProductNotFoundError, ProductAuthError: Produk tidak valid
+            ModuleNotFoundError, ModuleAuthError: Module tidak valid
+        """
+        with logger.contextualize(
+            memberid=trx.memberid,
+            productid=trx.product,
+            moduleid=trx.moduleid,
+            op="trx_auth",
+        ):
+            member = self.member_auth.verify(trx)
+            product = self.product_auth.check(trx.product, provider)
+            module = self.module_auth.check_provider(trx.moduleid, provider)
+            candidates = []
+            if product.routing_mode == "failover":
+                candidates = [
+                    module,
+                    *self.module_auth.get_active_modules(
+                        [mid for mid in product.list_modules if mid != module.moduleid],
+                        provider,
+                    ),
+                ]
+            logger.info("Otorisasi transaksi sukses")
+            return TransactionContext(member, product, module, candidates)
@@ -0,0 +1,15 @@
+from src.service.dedup.srv_dedup import (
+    DedupOutcome,
+    DedupStore,
+    InMemoryDedupStore,
+    StoredResponse,
+    TransactionDeduplicator,
+)
+
+__all__ = [
+    "DedupOutcome",
+    "DedupStore",
+    "InMemoryDedupStore",
+    "StoredResponse",
+    "TransactionDeduplicator",
+]
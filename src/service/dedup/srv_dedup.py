@@ -0,0 +1,190 @@
+"""Dedup transaksi idempotent per (memberid, refid).
+
+Retry H2H untuk refid yang sama tidak boleh diteruskan ke upstream lagi:
+- Masih in-flight: duplikat menunggu future upstream yang sama (coalescing,
+  lokal per proses)
+- Sudah selesai: duplikat mendapat response tersimpan dari store (TTL)
+- Upstream 5xx tidak disimpan: retry berikutnya mencoba upstream lagi
+
+Store di balik `DedupStore` Protocol; default in-memory, store bersama
+(mis. Redis) cukup implementasi Protocol yang sama.
+Upstream dijalankan sebagai task terpisah: client pertama disconnect tidak
+membatalkan transaksi yang sudah terkirim, hasilnya tetap disimpan.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field, replace
+from enum import StrEnum
+from typing import Protocol, runtime_checkable
+
+from src.custom.cst_exceptions import DuplicateTransactionError
+from src.mlogg import logger
+
+DEFAULT_TTL = 600.0  # detik
+DEFAULT_MAX_ENTRIES = 10_000
+
+DedupKey = tuple[str, str]  # (memberid, refid)
+
+
+class DedupOutcome(StrEnum):
+    NEW = "new"  # diteruskan ke upstream
+    COALESCED = "coalesced"  # menunggu request in-flight yang sama
+    REPLAYED = "replayed"  # response tersimpan
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    """Response plain-text transaksi yang bisa diputar ulang."""
+
+    content: str
+    status_code: int = 200
+    headers: dict[str, str] = field(default_factory=dict)
+    # identitas transaksi (product, dest, moduleid) untuk deteksi refid bentrok
+    fingerprint: tuple[str, ...] = ()
+    # status HTTP upstream (response ke client tetap 200, status ada di teks)
+    upstream_status: int = 200
+
+    @property
+    def replayable(self) -> bool:
+        """Hanya hasil upstream non-5xx yang boleh diputar ulang."""
+        return self.upstream_status < 500
+
+
+@runtime_checkable
+class DedupStore(Protocol):
+    async def get(self, key: DedupKey) -> StoredResponse | None: ...
+
+    async def put(self, key: DedupKey, response: StoredResponse) -> None: ...
+
+
+class InMemoryDedupStore:
+    """Store lokal LRU + TTL (satu proses)."""
+
+    def __init__(
+        self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: float = DEFAULT_TTL
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[DedupKey, tuple[float, StoredResponse]] = (
+            OrderedDict()
+        )
+
+    async def get(self, key: DedupKey) -> StoredResponse | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, response = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return response
+
+    async def put(self, key: DedupKey, response: StoredResponse) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _consume_exception(task: asyncio.Task) -> None:
+    if not task.cancelled():
+        task.exception()
+
+
+class TransactionDeduplicator:
+    """Coalescing request in-flight + replay response tersimpan."""
+
+    def __init__(self, store: DedupStore | None = None):
+        self.store = store or InMemoryDedupStore()
+        self._inflight: dict[
+            DedupKey, tuple[tuple[str, ...], asyncio.Task[StoredResponse]]
+        ] = {}
+        self.counts = dict.fromkeys(DedupOutcome, 0)
+
+    async def run(
+        self,
+        key: DedupKey,
+        fingerprint: tuple[str, ...],
+        execute: Callable[[], Awaitable[StoredResponse]],
+    ) -> tuple[StoredResponse, DedupOutcome]:
+        """Jalankan `execute` sekali per key; duplikat ikut hasil yang sama.
+
+        Exception dari `execute` dan response upstream 5xx diteruskan ke
+        semua yang menunggu tapi tidak disimpan (retry berikutnya diteruskan
+        lagi).
+
+        Raises:
+            DuplicateTransactionError: Refid sudah dipakai transaksi lain
+        """
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            stored = await self.store.get(key)
+            if stored is not None:
+                self._check_fingerprint(key, stored.fingerprint, fingerprint)
+                self.counts[DedupOutcome.REPLAYED] += 1
+                logger.info("Duplicate transaction replayed", key=key)
+                return stored, DedupOutcome.REPLAYED
+            # request lain bisa mulai selama menunggu store
+            inflight = self._inflight.get(key)
+
+        if inflight is not None:
+            self._check_fingerprint(key, inflight[0], fingerprint)
+            self.counts[DedupOutcome.COALESCED] += 1
+            logger.info("Duplicate transaction coalesced", key=key)
+            return await asyncio.shield(inflight[1]), DedupOutcome.COALESCED
+
+        task = asyncio.create_task(self._execute(key, fingerprint, execute))
+        # semua pemanggil bisa disconnect: exception tetap dianggap sudah diambil
+        task.add_done_callback(_consume_exception)
+        self._inflight[key] = (fingerprint, task)
+        self.counts[DedupOutcome.NEW] += 1
+        return await asyncio.shield(task), DedupOutcome.NEW
+
+    async def _execute(
+        self,
+        key: DedupKey,
+        fingerprint: tuple[str, ...],
+        execute: Callable[[], Awaitable[StoredResponse]],
+    ) -> StoredResponse:
+        try:
+            response = replace(await execute(), fingerprint=fingerprint)
+            if not response.replayable:
+                # gagal di upstream: retry refid yang sama harus dicoba ulang
+                logger.info(
+                    "Upstream error response not stored for dedup",
+                    key=key,
+                    upstream_status=response.upstream_status,
+                )
+                return response
+            try:
+                await self.store.put(key, response)
+            except Exception as e:
+                # transaksi sudah sukses di upstream, jangan gagalkan response
+                logger.error("Failed to store dedup response", key=key, error=str(e))
+            return response
+        finally:
+            self._inflight.pop(key, None)
+
+    @staticmethod
+    def _check_fingerprint(
+        key: DedupKey, stored: tuple[str, ...], fingerprint: tuple[str, ...]
+    ) -> None:
+        if stored != fingerprint:
+            raise DuplicateTransactionError(
+                context={"memberid": key[0], "refid": key[1]}
+            )
+
+    def stats(self) -> dict:
+        return {
+            "inflight": len(self._inflight),
+            **{outcome.value: n for outcome, n in self.counts.items()},
+        }
@@ -0,0 +1,51 @@
+r"""Import YAML -> SQLite untuk backend `member_backend=sqlite`.
+
+    python -m src.service.dto.srv_dtoimport members data/members.yaml \\
+        --db data/members.db
+
+Boleh dijalankan ulang setelah YAML berubah: hanya baris yang berubah yang
+ditulis, app yang sedang berjalan mengikuti lewat watcher file database.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from src.custom.cst_exceptions import AppExceptionError
+from src.domain.member.sch_member import MemberInDB
+from src.service.dto.srv_dtostore import import_yaml
+
+# kind -> (id field, model); module/produk tetap YAML (kecil, butuh index sekunder)
+KINDS: dict[str, tuple[str, type]] = {"members": ("memberid", MemberInDB)}
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Argumen CLI: kind, path YAML, path database (opsional)."""
+    parser = argparse.ArgumentParser(description="Import YAML data into SQLite")
+    parser.add_argument("kind", choices=list(KINDS))
+    parser.add_argument("yaml_path", type=Path)
+    parser.add_argument(
+        "--db", type=Path, default=None, help="default: <yaml dir>/<kind>.db"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Jalankan import; exit code 1 jika YAML tidak valid."""
+    args = parse_args(argv)
+    id_field, model = KINDS[args.kind]
+    db_path = args.db or args.yaml_path.with_name(f"{args.kind}.db")
+    try:
+        diff = import_yaml(args.yaml_path, db_path, args.kind, id_field, model)
+    except (FileNotFoundError, ValueError, AppExceptionError) as e:
+        sys.stderr.write(f"import failed: {e}\n")
+        return 1
+    sys.stdout.write(
+        f"{db_path}: added={len(diff.added)} removed={len(diff.removed)} "
+        f"changed={len(diff.changed)}\n"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
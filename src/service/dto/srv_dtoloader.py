@@ -1,3 +1,21 @@
+"""Loader YAML generik dengan validasi inkremental dan sidecar cache.
+
+- Parse memakai libyaml (`CSafeLoader`) jika tersedia
+- Reload hanya memvalidasi ulang item yang baru / berubah (digest per item)
+- Opsional: record tervalidasi disimpan ke sidecar pickle di samping file
+  YAML (`.<nama>.yaml.cache`, key: ukuran + digest isi file + skema model).
+  Start berikutnya dengan isi file yang sama melewati parse YAML dan
+  validasi Pydantic.
+  Sidecar ada di direktori data yang sama, jadi trust-nya sama dengan YAML-nya.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
@@ -5,13 +23,71 @@ import yaml
 
 from src.custom.cst_exceptions import FileLoaderError, InternalError, ValidationError
 
+# libyaml jauh lebih cepat; fallback ke pure-Python jika PyYAML tanpa libyaml
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+# naikkan jika struktur sidecar berubah
+CACHE_FORMAT = 1
+
+
+def file_digest(raw: bytes) -> bytes:
+    """Digest isi file (blake2b 16 byte)."""
+    return hashlib.blake2b(raw, digest_size=16).digest()
+
+
+def cache_path_for(yaml_path: Path) -> Path:
+    """Lokasi sidecar cache, mis. data/.members.yaml.cache."""
+    return yaml_path.with_name(f".{yaml_path.name}.cache")
+
+
+def item_digest(item: Any) -> bytes:
+    """Digest item mentah YAML (urutan key tidak berpengaruh)."""
+    raw = json.dumps(item, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.blake2b(raw.encode(), digest_size=16).digest()
+
+
+@dataclass(frozen=True)
+class LoadDiff:
+    """ID yang berubah dibanding load sukses sebelumnya."""
+
+    added: frozenset[str] = frozenset()
+    removed: frozenset[str] = frozenset()
+    changed: frozenset[str] = frozenset()
+    reordered: bool = False  # isi sama, urutan item di file berubah
+
+    @property
+    def stale(self) -> frozenset[str]:
+        """ID yang objek lamanya tidak berlaku lagi (changed + removed)."""
+        return self.changed | self.removed
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed or self.reordered)
+
+
+@dataclass(frozen=True)
+class LoadResult:
+    items: list[Any]
+    diff: LoadDiff
+
 
 class GenericYamlLoader:
-    def __init__(self, key_name: str, id_field: str, model: type, logger: Any):
+    def __init__(
+        self,
+        key_name: str,
+        id_field: str,
+        model: type,
+        logger: Any,
+        cache: bool = False,
+    ):
         self.key_name = key_name
         self.id_field = id_field
         self.model = model
         self.logger = logger
+        self.cache = cache
+        # id -> (digest item mentah, model tervalidasi) dari load sukses terakhir
+        self._validated: dict[Any, tuple[bytes, Any]] = {}
+        self._file_digest: bytes | None = None
+        self._model_key: str | None = None
+        self._lock = threading.Lock()
 
     def check_duplicates(self, items: list[dict]) -> list[str]:
         seen = set()
@@ -25,49 +101,199 @@ class GenericYamlLoader:
         return duplicates
 
     def load_and_validate(self, yaml_path: Path) -> list[Any]:
+        return self.load_incremental(yaml_path).items
+
+    def load_incremental(self, yaml_path: Path) -> LoadResult:
+        """Load YAML, validasi ulang hanya item yang baru / berubah.
+
+        Item dengan digest sama dengan load sukses sebelumnya memakai instance
+        model lama; isi file identik dengan load terakhir tidak di-parse sama
+        sekali. State hanya diganti jika seluruh file valid.
+        """
+        with (
+            self._lock,
+            self.logger.contextualize(path=yaml_path, operation="load_yaml"),
+        ):
+            start = time.perf_counter()
+            raw = self._read_bytes(yaml_path)
+            digest = file_digest(raw)
+            previous = self._validated
+            if digest == self._file_digest:
+                return LoadResult(self._models(previous), LoadDiff())
+
+            validated = self._load_cache(yaml_path, len(raw), digest)
+            source = "cache"
+            if validated is None:
+                source = "yaml"
+                items = self._parse_items(yaml_path, raw)
+                validated = self._validate_items(items, previous)
+
+            diff = self._diff(previous, validated)
+            self._validated = validated
+            self._file_digest = digest
+            if source == "yaml":
+                self._save_cache(yaml_path, len(raw), digest, validated)
+            self.logger.debug(
+                "YAML items loaded",
+                source=source,
+                count=len(validated),
+                added=len(diff.added),
+                removed=len(diff.removed),
+                changed=len(diff.changed),
+                elapsed_ms=round((time.perf_counter() - start) * 1000, 3),
+            )
+            return LoadResult(self._models(validated), diff)
+
+    def read_items(self, yaml_path: Path) -> list[Any]:
+        """Item mentah (belum divalidasi) setelah cek struktur dan duplikat."""
         with self.logger.contextualize(path=yaml_path, operation="load_yaml"):
-            if not yaml_path.exists():
-                self.logger.error("YAML file not found", path=str(yaml_path))
-                raise FileNotFoundError(f"YAML file not found: {yaml_path}")
-
-            try:
-                with yaml_path.open("r", encoding="utf-8") as f:
-                    data = yaml.safe_load(f)
-            except yaml.YAMLError as e:
-                self.logger.exception(
-                    "Failed to parse YAML file", error=str(e), path=str(yaml_path)
-                )
-                raise FileLoaderError("Failed to parse YAML file") from e
-
-            if not isinstance(data, dict) or self.key_name not in data:
-                self.logger.error(
-                    f"YAML must contain '{self.key_name}' key", path=str(yaml_path)
-                )
-                raise InternalError(f"YAML must contain '{self.key_name}' key")
-
-            items = data[self.key_name]
-            if not isinstance(items, list):
-                self.logger.error(
-                    f"'{self.key_name}' must be a list", path=str(yaml_path)
-                )
-                raise ValidationError(f"'{self.key_name}' must be a list")
-
-            duplicates = self.check_duplicates(items)
-            if duplicates:
-                self.logger.error(
-                    "Duplicate IDs found", duplicates=duplicates, path=str(yaml_path)
-                )
-                raise ValueError(f"Duplicate {self.id_field}s found: {duplicates}")
-
-            validated_items = []
-            for i, item in enumerate(items):
-                try:
-                    validated = self.model(**item)
-                    validated_items.append(validated)
-                except ValidationError as e:
-                    self.logger.exception(
-                        "Validation failed", index=i, item=item, error=str(e)
-                    )
-                    raise ValueError(f"Validation failed at index {i}: {e}") from e
-
-            return validated_items
+            return self._parse_items(yaml_path, self._read_bytes(yaml_path))
+
+    def reset(self) -> None:
+        """Lupakan load sebelumnya (load berikutnya validasi semua item)."""
+        with self._lock:
+            self._validated = {}
+            self._file_digest = None
+
+    @staticmethod
+    def _models(validated: dict[Any, tuple[bytes, Any]]) -> list[Any]:
+        return [model for _, model in validated.values()]
+
+    @staticmethod
+    def _diff(
+        previous: dict[Any, tuple[bytes, Any]], validated: dict[Any, tuple[bytes, Any]]
+    ) -> LoadDiff:
+        added = validated.keys() - previous.keys()
+        removed = previous.keys() - validated.keys()
+        changed = {
+            item_id
+            for item_id, (digest, _) in validated.items()
+            if item_id in previous and previous[item_id][0] != digest
+        }
+        return LoadDiff(
+            frozenset(added),
+            frozenset(removed),
+            frozenset(changed),
+            reordered=not (added or removed or changed)
+            and list(previous) != list(validated),
+        )
+
+    def _validate_items(
+        self, items: list[Any], previous: dict[Any, tuple[bytes, Any]]
+    ) -> dict[Any, tuple[bytes, Any]]:
+        validated: dict[Any, tuple[bytes, Any]] = {}
+        for i, item in enumerate(items):
+            item_id = item.get(self.id_field)
+            digest = item_digest(item)
+            cached = previous.get(item_id)
+            if cached is not None and cached[0] == digest:
+                validated[item_id] = cached
+            else:
+                validated[item_id] = (digest, self._validate(i, item))
+        return validated
+
+    def _read_bytes(self, yaml_path: Path) -> bytes:
+        if not yaml_path.exists():
+            self.logger.error("YAML file not found", path=str(yaml_path))
+            raise FileNotFoundError(f"YAML file not found: {yaml_path}")
+        return yaml_path.read_bytes()
+
+    def _parse_items(self, yaml_path: Path, raw: bytes) -> list[Any]:
+        try:
+            data = yaml.load(raw, Loader=SafeLoader)
+        except yaml.YAMLError as e:
+            self.logger.exception(
+                "Failed to parse YAML file", error=str(e), path=str(yaml_path)
+            )
+            raise FileLoaderError("Failed to parse YAML file") from e
+
+        if not isinstance(data, dict) or self.key_name not in data:
+            self.logger.error(
+                f"YAML must contain '{self.key_name}' key", path=str(yaml_path)
+            )
+            raise InternalError(f"YAML must contain '{self.key_name}' key")
+
+        items = data[self.key_name]
+        if not isinstance(items, list):
+            self.logger.error(f"'{self.key_name}' must be a list", path=str(yaml_path))
+            raise ValidationError(f"'{self.key_name}' must be a list")
+
+        duplicates = self.check_duplicates(items)
+        if duplicates:
+            self.logger.error(
+                "Duplicate IDs found", duplicates=duplicates, path=str(yaml_path)
+            )
+            raise ValueError(f"Duplicate {self.id_field}s found: {duplicates}")
+
+        return items
+
+    def _validate(self, index: int, item: Any) -> Any:
+        try:
+            return self.model(**item)
+        except ValidationError as e:
+            self.logger.exception(
+                "Validation failed", index=index, item=item, error=str(e)
+            )
+            raise ValueError(f"Validation failed at index {index}: {e}") from e
+
+    def _cache_model_key(self) -> str:
+        """Identitas model + skema: sidecar dari skema lama tidak dipakai."""
+        if self._model_key is None:
+            schema = json.dumps(self.model.model_json_schema(), sort_keys=True)
+            self._model_key = (
+                f"{self.model.__module__}.{self.model.__qualname__}:"
+                f"{file_digest(schema.encode()).hex()}"
+            )
+        return self._model_key
+
+    def _load_cache(
+        self, yaml_path: Path, size: int, digest: bytes
+    ) -> dict[Any, tuple[bytes, Any]] | None:
+        path = cache_path_for(yaml_path)
+        if not self.cache or not path.exists():
+            return None
+        try:
+            with path.open("rb") as f:
+                payload = pickle.load(f)
+            if (
+                payload.get("format") != CACHE_FORMAT
+                or payload.get("model") != self._cache_model_key()
+                or payload.get("size") != size
+                or payload.get("digest") != digest
+            ):
+                self.logger.debug("YAML cache stale", cache=str(path))
+                return None
+            return {item_id: (d, model) for item_id, d, model in payload["entries"]}
+        except Exception as e:
+            # sidecar rusak / tidak kompatibel: load dari YAML seperti biasa
+            self.logger.warning("Failed to read YAML cache", error=str(e))
+            return None
+
+    def _save_cache(
+        self,
+        yaml_path: Path,
+        size: int,
+        digest: bytes,
+        validated: dict[Any, tuple[bytes, Any]],
+    ) -> None:
+        if not self.cache:
+            return
+        path = cache_path_for(yaml_path)
+        payload = {
+            "format": CACHE_FORMAT,
+            "model": self._cache_model_key(),
+            "size": size,
+            "mtime_ns": yaml_path.stat().st_mtime_ns,
+            "digest": digest,
+            "entries": [
+                (item_id, d, model) for item_id, (d, model) in validated.items()
+            ],
+        }
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            with tmp.open("wb") as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except Exception as e:
+            tmp.unlink(missing_ok=True)
+            self.logger.warning("Failed to write YAML cache", error=str(e))
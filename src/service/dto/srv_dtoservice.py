@@ -1,16 +1,34 @@
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
 
-from src.config import get_settings
+from src.config import Settings, get_settings
 from src.domain.digipos.rep_digipos import DigiposProductRepository
 from src.domain.member.rep_member import MemberRepository
+from src.domain.member.sch_member import MemberInDB
 from src.domain.module.rep_module import ModuleRepository
+from src.domain.parser.rep_parser import ParserRuleRepository
 from src.mlogg import logger
+from src.service.auth.srv_dgproductauth import DigiposProductAuthService
+from src.service.auth.srv_memberauth import MemberAuthService
+from src.service.auth.srv_moduleauth import ModuleAuthService
+from src.service.auth.srv_trxauth import TransactionAuthService
+from src.service.dedup.srv_dedup import InMemoryDedupStore, TransactionDeduplicator
+from src.service.dto.srv_dtostore import SqliteRecordStore
+from src.service.parser.digipos.executor_parser import ParserExecutor
+from src.service.srv_querybuilder import DigiposQueryBuilder
+from src.service.upstream.srv_breaker import CircuitBreakerRegistry
+from src.service.upstream.srv_forwarder import UpstreamForwarder
+from src.service.upstream.srv_health import ModuleHealthTracker
+from src.service.upstream.srv_httpclient import UpstreamClientRegistry
+from src.service.upstream.srv_limiter import ConcurrencyLimiterRegistry
 from src.service.watcher.srv_watcher import FileWatcher
 
 MEMBERS_YAML = "members.yaml"
 MODULES_YAML = "modules.yaml"
 DGPRODUCTS_YAML = "digipos.yaml"
+PARSER_RULES_YAML = "parser_rules.yaml"
+MEMBERS_DB = "members.db"
 
 
 class DataService:
@@ -20,47 +38,132 @@ class DataService:
     """
 
     def __init__(self) -> None:
-        self.data_path = Path(get_settings().data_path)
+        settings = get_settings()
+        self.data_path = Path(settings.data_path)
         self.repos: dict[str, Any] = {}
         self.watchers: dict[str, FileWatcher] = {}
-        self._init_repositories()
+        self.upstream_clients = UpstreamClientRegistry()
+        self.circuit_breakers = CircuitBreakerRegistry()
+        self.concurrency_limiters = ConcurrencyLimiterRegistry()
+        self.module_health = ModuleHealthTracker()
+        self.upstream_forwarder = UpstreamForwarder(
+            self.upstream_clients,
+            self.circuit_breakers,
+            self.concurrency_limiters,
+            self.module_health,
+        )
+        self.parser_executor = ParserExecutor.from_settings(settings)
+        self.trx_dedup = TransactionDeduplicator(
+            InMemoryDedupStore(
+                max_entries=settings.trx_dedup_max_entries,
+                ttl=settings.trx_dedup_ttl,
+            )
+        )
+        self._init_repositories(settings.data_cache, self._member_store(settings))
+        self.query_builder = DigiposQueryBuilder(self.digipos_repo, self.module_repo)
+        self._init_auth_services()
         self._init_watchers()
 
-    def _init_repositories(self) -> None:
+    def _member_store(self, settings: Settings) -> SqliteRecordStore | None:
+        """SQLite store member jika `member_backend=sqlite`, None untuk YAML."""
+        if settings.member_backend == "yaml":
+            return None
+        if settings.member_backend != "sqlite":
+            raise ValueError(f"Unknown member_backend: {settings.member_backend}")
+        return SqliteRecordStore(
+            settings.member_db_path or self.data_path / MEMBERS_DB,
+            "members",
+            MemberInDB,
+            max_cached=settings.member_cache_size,
+        )
+
+    def _init_repositories(
+        self, cache: bool = False, member_store: SqliteRecordStore | None = None
+    ) -> None:
         """Initialize all repositories."""
-        self.repos["member"] = MemberRepository(self.data_path / MEMBERS_YAML)
+        self.repos["member"] = MemberRepository(
+            self.data_path / MEMBERS_YAML, cache=cache, store=member_store
+        )
         logger.info("MemberRepository initialized")
-        self.repos["module"] = ModuleRepository(self.data_path / MODULES_YAML)
+        self.repos["module"] = ModuleRepository(
+            self.data_path / MODULES_YAML, cache=cache
+        )
         logger.info("ModuleRepository initialized")
         self.repos["digipos"] = DigiposProductRepository(
-            self.data_path / DGPRODUCTS_YAML
+            self.data_path / DGPRODUCTS_YAML, cache=cache
         )
         logger.info("DigiposProductRepository initialized")
+        self.repos["parser_rules"] = ParserRuleRepository(
+            self.data_path / PARSER_RULES_YAML
+        )
+        logger.info("ParserRuleRepository initialized")
         # Add more repositories here as needed
 
+    def _init_auth_services(self) -> None:
+        """Auth service long-lived: repository di-reload in place, aman di-share."""
+        self.member_auth_service = MemberAuthService(self.member_repo)
+        self.module_auth_service = ModuleAuthService(self.module_repo)
+        self.product_auth_service = DigiposProductAuthService(self.digipos_repo)
+        self.trx_auth_service = TransactionAuthService(
+            self.member_auth_service,
+            self.product_auth_service,
+            self.module_auth_service,
+        )
+
     def _init_watchers(self) -> None:
         """Initialize all file watchers."""
+        # members.yaml, atau database SQLite untuk backend sqlite
         self.watchers["member"] = FileWatcher(
-            self.data_path / MEMBERS_YAML, self.repos["member"].reload
+            self.member_repo.file_path, self.member_repo.reload
         )
         logger.info(
-            "Member FileWatcher initialized", path=str(self.data_path / MEMBERS_YAML)
+            "Member FileWatcher initialized", path=str(self.member_repo.file_path)
         )
         self.watchers["module"] = FileWatcher(
-            self.data_path / MODULES_YAML, self.repos["module"].reload
+            self.data_path / MODULES_YAML, self._reload_modules
         )
         logger.info(
             "Module FileWatcher initialized", path=str(self.data_path / MODULES_YAML)
         )
         self.watchers["digipos"] = FileWatcher(
-            self.data_path / DGPRODUCTS_YAML, self.repos["digipos"].reload
+            self.data_path / DGPRODUCTS_YAML, self._reload_digipos
         )
         logger.info(
             "Digipos FileWatcher initialized",
             path=str(self.data_path / DGPRODUCTS_YAML),
         )
+        self.watchers["parser_rules"] = FileWatcher(
+            self.data_path / PARSER_RULES_YAML, self.repos["parser_rules"].reload
+        )
+        logger.info(
+            "Parser rules FileWatcher initialized",
+            path=str(self.data_path / PARSER_RULES_YAML),
+        )
         # Add more watchers here as needed
 
+    def _reload_callback(self, name: str) -> Callable[[], None] | None:
+        """Callback reload untuk repository (dipakai watcher dan reload_all)."""
+        if name == "module":
+            return self._reload_modules
+        if name == "digipos":
+            return self._reload_digipos
+        repo = self.repos.get(name)
+        reload = getattr(repo, "reload", None)
+        return reload if callable(reload) else None
+
+    def _reload_modules(self) -> None:
+        """Reload modules.yaml lalu sinkronkan upstream client pool."""
+        diff = self.module_repo.reload()
+        if diff:
+            self.upstream_clients.rebuild(self.module_repo.get_all_modules())
+            self.query_builder.invalidate(moduleids=diff.stale)
+
+    def _reload_digipos(self) -> None:
+        """Reload digipos.yaml lalu buang template query yang sudah dikompilasi."""
+        diff = self.digipos_repo.reload()
+        if diff:
+            self.query_builder.invalidate(productids=diff.stale)
+
     def start(self) -> None:
         """Start all watchers."""
         for name, watcher in self.watchers.items():
@@ -71,13 +174,15 @@ class DataService:
                 logger.error(f"Failed to start {name} watcher", error=str(e))
 
     def stop(self) -> None:
-        """Stop all watchers."""
+        """Stop all watchers and close the member store (unregisters its reader)."""
         for name, watcher in self.watchers.items():
             try:
                 watcher.stop()
                 logger.info(f"{name.capitalize()} watcher stopped")
             except Exception as e:
                 logger.error(f"Failed to stop {name} watcher", error=str(e))
+        if self.member_repo.store is not None:
+            self.member_repo.store.close()
 
     def start_all(self) -> None:
         """Start all file watchers."""
@@ -110,6 +215,10 @@ class DataService:
     def digipos_repo(self) -> DigiposProductRepository:
         return self.repos["digipos"]
 
+    @property
+    def parser_rule_repo(self) -> ParserRuleRepository:
+        return self.repos["parser_rules"]
+
     # Just For Ease Of Accsess
     def get_repo(self, name: str) -> Any:
         """Get repository by name (generic accessor)."""
@@ -118,9 +227,10 @@ class DataService:
     def reload_all(self) -> None:
         """Reload all repositories that have a reload method."""
         for name, repo in self.repos.items():
-            if hasattr(repo, "reload") and callable(repo.reload):
+            reload = self._reload_callback(name)
+            if reload is not None:
                 try:
-                    repo.reload()
+                    reload()
                     logger.info(
                         f"Reloaded repository: {name} ({repo.__class__.__name__})"
                     )
@@ -0,0 +1,133 @@
+"""Snapshot immutable untuk data repository.
+
+Reload jalan di thread timer watchdog, sedangkan request membaca dari event
+loop. Karena itu semua isi repository (list + index by id) dibangun lengkap
+dulu di thread reload, lalu dipublish dengan satu assignment reference.
+Reader cukup mengambil snapshot sekali per operasi: tidak pernah melihat list
+baru dengan dict lama, dan tidak perlu lock. Reload gagal tidak mengganti
+snapshot, jadi snapshot aktif selalu data valid terakhir (last-good).
+
+Index sekunder (mis. provider -> items) dibangun bersama index primer di
+snapshot yang sama, jadi ikut ter-swap atomik dan lookup-nya O(1).
+"""
+
+import threading
+import time
+from collections.abc import Callable, Hashable, Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any
+
+# item -> key index sekunder (boleh lebih dari satu, mis. list_modules)
+type Indexer[T] = Callable[[T], Iterable[Hashable]]
+
+
+def active_only[T](indexer: Indexer[T]) -> Indexer[T]:
+    """Indexer yang hanya memasukkan item `is_active`."""
+    return lambda item: indexer(item) if item.is_active else ()
+
+
+def build_indexes[T](
+    items: Iterable[T], indexers: Mapping[str, Indexer[T]]
+) -> Mapping[str, Mapping[Hashable, tuple[T, ...]]]:
+    """Bangun index sekunder read-only; urutan item mengikuti file."""
+    buckets: dict[str, dict[Hashable, list[T]]] = {name: {} for name in indexers}
+    for item in items:
+        for name, indexer in indexers.items():
+            for key in dict.fromkeys(indexer(item)):
+                buckets[name].setdefault(key, []).append(item)
+    return MappingProxyType(
+        {
+            name: MappingProxyType({key: tuple(v) for key, v in bucket.items()})
+            for name, bucket in buckets.items()
+        }
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class RepositorySnapshot[T]:
+    """Isi repository pada satu versi; tidak pernah diubah setelah dipublish."""
+
+    items: tuple[T, ...] = ()
+    by_id: Mapping[str, T] = field(default_factory=lambda: MappingProxyType({}))
+    version: int = 0  # 0 = belum pernah load
+    loaded_at: float = 0.0  # time.time() saat dipublish
+    # nama index -> key -> items
+    indexes: Mapping[str, Mapping[Hashable, tuple[T, ...]]] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self.items)
+
+    def __contains__(self, record_id: object) -> bool:
+        return record_id in self.by_id
+
+    def get(self, record_id: str) -> T | None:
+        return self.by_id.get(record_id)
+
+    def ids(self) -> list[str]:
+        return list(self.by_id)
+
+    def lookup(self, index: str, key: Hashable) -> tuple[T, ...]:
+        """Items dengan `key` di index sekunder `index` (KeyError jika index tidak ada)."""
+        return self.indexes[index].get(key, ())
+
+
+class SnapshotPublisher[T]:
+    """Pemegang snapshot aktif + serialisasi writer (reader tanpa lock)."""
+
+    def __init__(
+        self,
+        key: Callable[[T], str],
+        indexers: Mapping[str, Indexer[T]] | None = None,
+    ):
+        self.key = key
+        self.indexers = dict(indexers or {})
+        self.current: RepositorySnapshot[T] = RepositorySnapshot(
+            indexes=build_indexes((), self.indexers)
+        )
+        self.failed_reloads = 0
+        self.last_error: str | None = None
+        # hanya antar writer (watcher vs reload manual), reader tidak ikut
+        self._lock = threading.Lock()
+
+    def publish(self, items: Iterable[T]) -> RepositorySnapshot[T]:
+        """Bangun snapshot versi berikutnya lalu swap reference-nya."""
+        items = tuple(items)
+        by_id = MappingProxyType({self.key(item): item for item in items})
+        indexes = build_indexes(items, self.indexers)
+        with self._lock:
+            snapshot = RepositorySnapshot(
+                items, by_id, self.current.version + 1, time.time(), indexes
+            )
+            self.current = snapshot
+            self.last_error = None
+        return snapshot
+
+    def unchanged(self) -> RepositorySnapshot[T]:
+        """Reload sukses tanpa perubahan: snapshot aktif tetap dipakai."""
+        with self._lock:
+            self.last_error = None
+            return self.current
+
+    def fail(self, error: Exception) -> RepositorySnapshot[T]:
+        """Catat reload gagal; snapshot last-good tetap aktif."""
+        with self._lock:
+            self.failed_reloads += 1
+            self.last_error = str(error)
+            return self.current
+
+    def stats(self) -> dict[str, Any]:
+        snapshot = self.current
+        return {
+            "version": snapshot.version,
+            "count": len(snapshot),
+            "loaded_at": snapshot.loaded_at,
+            "indexes": {name: len(keys) for name, keys in snapshot.indexes.items()},
+            "failed_reloads": self.failed_reloads,
+            "last_error": self.last_error,
+        }
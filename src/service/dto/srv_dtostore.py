@@ -0,0 +1,489 @@
+"""Record store SQLite untuk data besar (mis. ratusan ribu member).
+
+Snapshot YAML menyimpan semua record di memory. Store ini hanya menyimpan
+record yang sering dipakai di LRU terbatas; sisanya dibaca dari SQLite lewat
+primary key, jadi memory mengikuti working set, bukan ukuran data.
+
+Data ditulis oleh `import_yaml` (tool one-shot / re-import). Setiap import
+yang mengubah data menaikkan `generation` dan mencatat ID yang ditulis,
+sehingga `refresh()` cukup membuang record basi dari LRU tanpa membaca
+ulang seluruh tabel. Store mendaftarkan generation yang sudah dikonsumsi di
+tabel `readers`; import memangkas `changes` sampai generation terendah itu.
+
+Biaya lookup: cache miss = satu query primary key + validasi pydantic
+(~40 µs per member) di thread pemanggil, yaitu event loop untuk route
+async. `max_cached` sebaiknya menampung working set supaya miss jarang
+terjadi. Supaya miss tidak ikut menunggu import:
+- Database memakai WAL (diset `import_yaml`): reader tidak diblokir writer
+- Lookup lewat koneksi read-only dengan busy timeout pendek; database yang
+  tetap terkunci jadi `ServiceError` (503), bukan 500
+- Lock LRU tidak pernah dipegang saat query / menunggu SQLite; hanya
+  `refresh()` (thread watcher) yang menunggu write lock import
+"""
+
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from collections import OrderedDict
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, Protocol, runtime_checkable
+
+from src.custom.cst_exceptions import ServiceError
+from src.mlogg import logger
+from src.service.dto.srv_dtoloader import GenericYamlLoader, LoadDiff, item_digest
+
+DEFAULT_MAX_CACHED = 10_000
+DEFAULT_MAX_MISSING = 1_024
+DEFAULT_READ_TIMEOUT = 0.25  # detik; lookup tidak ikut menunggu import
+WRITE_TIMEOUT = 5.0  # detik; hanya baris `readers` (register / close)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS records (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    digest BLOB NOT NULL,
+    data TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS records_position ON records (position);
+CREATE TABLE IF NOT EXISTS changes (
+    generation INTEGER NOT NULL,
+    id TEXT NOT NULL,
+    change TEXT NOT NULL,
+    PRIMARY KEY (generation, id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS readers (
+    reader TEXT PRIMARY KEY,
+    pid INTEGER NOT NULL,
+    generation INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+@runtime_checkable
+class RecordView[T](Protocol):
+    """Akses record by id; dipenuhi `RepositorySnapshot` dan `SqliteRecordStore`."""
+
+    def get(self, record_id: str) -> T | None: ...
+
+    def ids(self) -> list[str]: ...
+
+    def __contains__(self, record_id: object) -> bool: ...
+
+    def __len__(self) -> int: ...
+
+    def __iter__(self) -> Iterator[T]: ...
+
+
+def _meta(conn: sqlite3.Connection, key: str) -> str | None:
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # proses milik user lain
+    return True
+
+
+class SqliteRecordStore[T]:
+    """Lookup by id dari SQLite dengan LRU record panas (thread-safe)."""
+
+    def __init__(
+        self,
+        db_path: Path | str,
+        kind: str,
+        model: type[T],
+        max_cached: int = DEFAULT_MAX_CACHED,
+        max_missing: int = DEFAULT_MAX_MISSING,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+    ):
+        self.db_path = Path(db_path)
+        self.kind = kind
+        self.model = model
+        self.max_cached = max_cached
+        self.max_missing = max_missing
+        if not self.db_path.exists():
+            raise FileNotFoundError(f"SQLite store not found: {self.db_path}")
+        # rw hanya untuk baris `readers`; data record tidak pernah ditulis di sini
+        self._conn = self._connect("rw", WRITE_TIMEOUT)
+        self._read_conn = self._connect("ro", read_timeout)
+        self._lock = threading.Lock()  # LRU + counter, tidak dipegang saat I/O
+        self._read_lock = threading.Lock()  # koneksi read-only
+        self._write_lock = threading.Lock()  # koneksi rw
+        self._refresh_lock = threading.Lock()
+        self._reader = uuid.uuid4().hex
+        self._cache: OrderedDict[str, T] = OrderedDict()
+        # ID tak dikenal: LRU terpisah, scan ID acak tidak mengusir record panas
+        self._missing: OrderedDict[str, None] = OrderedDict()
+        self._count: int | None = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        stored_kind = self._read_meta("kind")
+        if stored_kind != kind:
+            raise ValueError(
+                f"SQLite store {self.db_path} holds '{stored_kind}', not '{kind}'"
+            )
+        self.generation = self._register()
+
+    def _connect(self, mode: str, timeout: float) -> sqlite3.Connection:
+        return sqlite3.connect(
+            f"{self.db_path.resolve().as_uri()}?mode={mode}",
+            uri=True,
+            check_same_thread=False,
+            timeout=timeout,
+            isolation_level=None,
+        )
+
+    def _read(self, sql: str, params: tuple = ()) -> list[tuple]:
+        with self._read_lock:
+            return self._read_conn.execute(sql, params).fetchall()
+
+    def _read_meta(self, key: str) -> str | None:
+        with self._read_lock:
+            return _meta(self._read_conn, key)
+
+    def _register(self, generation: int | None = None) -> int:
+        """Catat generation yang sudah dikonsumsi reader ini (batas prune).
+
+        Tanpa `generation`: baca generation terbaru di transaksi yang sama,
+        supaya import tidak bisa memangkas changes di antaranya. Bisa
+        menunggu import selesai (WRITE_TIMEOUT): jangan dipanggil dengan
+        `_lock` terpegang.
+        """
+        with self._write_lock:
+            return self._register_locked(generation)
+
+    def _register_locked(self, generation: int | None) -> int:
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if generation is None:
+                    generation = int(_meta(self._conn, "generation") or 0)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO readers (reader, pid, generation) "
+                    "VALUES (?, ?, ?)",
+                    (self._reader, os.getpid(), generation),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        except sqlite3.OperationalError as e:
+            # mis. file read-only: tetap jalan, refresh jatuh ke invalidasi penuh
+            # jika changes yang dibutuhkan sudah terpangkas
+            logger.warning(
+                "SQLite store reader not registered",
+                path=str(self.db_path),
+                error=str(e),
+            )
+            if generation is None:
+                generation = int(_meta(self._conn, "generation") or 0)
+        return generation
+
+    def get(self, record_id: str) -> T | None:
+        """Record by id; miss membaca SQLite + validasi model (lihat docstring modul).
+
+        Raises:
+            ServiceError: Cache miss dan database terkunci / tidak bisa dibaca
+        """
+        with self._lock:
+            record = self._cache.get(record_id)
+            if record is not None:
+                self._cache.move_to_end(record_id)
+                self.hits += 1
+                return record
+            if record_id in self._missing:
+                self._missing.move_to_end(record_id)
+                self.hits += 1
+                return None
+            self.misses += 1
+            generation = self.generation
+
+        # query + validasi di luar lock: lookup thread lain tidak ikut menunggu
+        try:
+            rows = self._read("SELECT data FROM records WHERE id = ?", (record_id,))
+        except sqlite3.OperationalError as e:
+            raise ServiceError(
+                f"{self.kind} store is unavailable",
+                context={"path": str(self.db_path), "id": record_id},
+                cause=e,
+            ) from e
+        record = self.model(**json.loads(rows[0][0])) if rows else None
+        with self._lock:
+            if generation != self.generation:
+                return record  # refresh di tengah jalan: jangan cache data lama
+            if record is None:
+                self._remember(self._missing, record_id, None, self.max_missing)
+            else:
+                self.evictions += self._remember(
+                    self._cache, record_id, record, self.max_cached
+                )
+        return record
+
+    @staticmethod
+    def _remember[V](
+        cache: OrderedDict[str, V], record_id: str, value: V, limit: int
+    ) -> int:
+        if limit <= 0:
+            return 0
+        cache[record_id] = value
+        evicted = 0
+        while len(cache) > limit:
+            cache.popitem(last=False)
+            evicted += 1
+        return evicted
+
+    def __contains__(self, record_id: object) -> bool:
+        return isinstance(record_id, str) and self.get(record_id) is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            count, generation = self._count, self.generation
+        if count is None:
+            count = self._read("SELECT COUNT(*) FROM records")[0][0]
+            with self._lock:
+                if generation == self.generation:
+                    self._count = count
+        return count
+
+    def ids(self) -> list[str]:
+        rows = self._read("SELECT id FROM records ORDER BY position")
+        return [row[0] for row in rows]
+
+    def __iter__(self) -> Iterator[T]:
+        """Semua record (full scan, tidak masuk LRU); untuk debug/export saja."""
+        rows = self._read("SELECT data FROM records ORDER BY position")
+        return (self.model(**json.loads(row[0])) for row in rows)
+
+    def refresh(self) -> LoadDiff:
+        """Ikuti import terbaru: buang record berubah dari LRU, kembalikan diff-nya.
+
+        Lookup tetap jalan selama refresh: lock LRU hanya dipegang saat
+        membuang record, register reader (menunggu import) di luar lock.
+        """
+        with self._refresh_lock:
+            generation = int(self._read_meta("generation") or 0)
+            if generation == self.generation:
+                return LoadDiff()
+            pruned = int(self._read_meta("pruned_through") or 0)
+            if pruned > self.generation:
+                diff = self._refresh_all(generation)
+            else:
+                diff = self._refresh_changes(generation)
+            self._register(generation)
+            return diff
+
+    def _refresh_changes(self, generation: int) -> LoadDiff:
+        rows = self._read(
+            "SELECT id, change FROM changes "
+            "WHERE generation > ? AND generation <= ? ORDER BY generation",
+            (self.generation, generation),
+        )
+        first: dict[str, str] = {}
+        last: dict[str, str] = {}
+        with self._lock:
+            for record_id, change in rows:
+                first.setdefault(record_id, change)
+                last[record_id] = change
+                self._cache.pop(record_id, None)
+                self._missing.pop(record_id, None)
+            self.generation = generation
+            self._count = None
+
+        # beberapa import sejak refresh terakhir: gabungkan per id
+        added, removed, changed = set(), set(), set()
+        for record_id, change in last.items():
+            if change == "removed":
+                if first[record_id] != "added":
+                    removed.add(record_id)
+            elif first[record_id] == "added":
+                added.add(record_id)
+            else:
+                changed.add(record_id)
+        return LoadDiff(frozenset(added), frozenset(removed), frozenset(changed))
+
+    def _refresh_all(self, generation: int) -> LoadDiff:
+        """Changes yang dibutuhkan sudah terpangkas: kosongkan LRU, semua ID berubah."""
+        logger.warning(
+            "SQLite store changes log pruned past this reader, dropping its cache",
+            path=str(self.db_path),
+            generation=self.generation,
+        )
+        ids = frozenset(row[0] for row in self._read("SELECT id FROM records"))
+        with self._lock:
+            self._cache.clear()
+            self._missing.clear()
+            self.generation = generation
+            self._count = None
+        return LoadDiff(changed=ids)
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._missing.clear()
+
+    def close(self) -> None:
+        with self._write_lock:
+            # read-only / tabel belum ada: reader memang tidak terdaftar
+            with contextlib.suppress(sqlite3.OperationalError):
+                self._conn.execute(
+                    "DELETE FROM readers WHERE reader = ?", (self._reader,)
+                )
+            self._conn.close()
+        with self._read_lock:
+            self._read_conn.close()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": "sqlite",
+                "path": str(self.db_path),
+                "generation": self.generation,
+                "cached": len(self._cache),
+                "max_cached": self.max_cached,
+                "missing": len(self._missing),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+def _prune_changes(conn: sqlite3.Connection, generation: int) -> int:
+    """Hapus changes yang sudah dikonsumsi semua reader; return batas prune.
+
+    Reader dari proses yang sudah mati (tanpa `close()`) dibuang dulu supaya
+    tidak menahan prune selamanya. Reader yang tertinggal melewati batas
+    (mis. proses di host lain) jatuh ke invalidasi penuh saat refresh.
+    """
+    readers = conn.execute("SELECT reader, pid, generation FROM readers").fetchall()
+    dead = [(reader,) for reader, pid, _ in readers if not _pid_alive(pid)]
+    conn.executemany("DELETE FROM readers WHERE reader = ?", dead)
+    dead_ids = {reader for (reader,) in dead}
+    floor = min(
+        (gen for reader, _, gen in readers if reader not in dead_ids),
+        default=generation,
+    )
+    floor = max(floor, int(_meta(conn, "pruned_through") or 0))
+    conn.execute("DELETE FROM changes WHERE generation <= ?", (floor,))
+    return floor
+
+
+def import_yaml(
+    yaml_path: Path, db_path: Path, kind: str, id_field: str, model: type
+) -> LoadDiff:
+    """Import / sinkronkan YAML ke SQLite; hanya baris yang berubah ditulis.
+
+    Semua item divalidasi dulu; file tidak valid tidak mengubah database.
+    Setiap ID yang ditulis/dihapus dicatat di `changes` (termasuk import ke
+    tabel kosong: reader bisa menyimpan ID itu sebagai "tidak ada"), lalu
+    `changes` dipangkas sampai generation terendah reader yang masih hidup.
+
+    Raises:
+        FileNotFoundError, AppExceptionError, ValueError: YAML tidak valid
+    """
+    loader = GenericYamlLoader(kind, id_field, model, logger)
+    items = loader.read_items(yaml_path)
+    rows = {}
+    for i, item in enumerate(items):
+        try:
+            model(**item)
+        except ValueError as e:
+            raise ValueError(f"Validation failed at index {i}: {e}") from e
+        data = json.dumps(item, default=str, separators=(",", ":"))
+        rows[str(item[id_field])] = (i, item_digest(item), data)
+
+    conn = sqlite3.connect(db_path, timeout=30.0)
+    try:
+        # WAL: store yang sedang membaca tidak diblokir import (persisten di file)
+        conn.execute("PRAGMA journal_mode=WAL")
+        with conn:
+            conn.executescript(_SCHEMA)
+            stored_kind = _meta(conn, "kind")
+            if stored_kind not in (None, kind):
+                raise ValueError(f"{db_path} holds '{stored_kind}', not '{kind}'")
+            existing = {
+                record_id: (position, digest)
+                for record_id, position, digest in conn.execute(
+                    "SELECT id, position, digest FROM records"
+                )
+            }
+            added = rows.keys() - existing.keys()
+            removed = existing.keys() - rows.keys()
+            changed = {
+                record_id
+                for record_id in rows.keys() & existing.keys()
+                if rows[record_id][1] != existing[record_id][1]
+            }
+            moved = [
+                (rows[record_id][0], record_id)
+                for record_id in rows.keys() & existing.keys()
+                if record_id not in changed
+                and rows[record_id][0] != existing[record_id][0]
+            ]
+            diff = LoadDiff(
+                frozenset(added),
+                frozenset(removed),
+                frozenset(changed),
+                reordered=bool(moved),
+            )
+            if not diff and stored_kind is not None:
+                return diff
+
+            conn.executemany(
+                "DELETE FROM records WHERE id = ?", [(rid,) for rid in removed]
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO records (id, position, digest, data) "
+                "VALUES (?, ?, ?, ?)",
+                [(rid, *rows[rid]) for rid in added | changed],
+            )
+            conn.executemany("UPDATE records SET position = ? WHERE id = ?", moved)
+
+            generation = int(_meta(conn, "generation") or 0) + 1
+            conn.executemany(
+                "INSERT INTO changes (generation, id, change) VALUES (?, ?, ?)",
+                [
+                    (generation, rid, change)
+                    for change, ids in (
+                        ("added", added),
+                        ("removed", removed),
+                        ("changed", changed),
+                    )
+                    for rid in ids
+                ],
+            )
+            pruned = _prune_changes(conn, generation)
+            conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [
+                    ("kind", kind),
+                    ("generation", str(generation)),
+                    ("pruned_through", str(pruned)),
+                ],
+            )
+    finally:
+        conn.close()
+
+    logger.info(
+        "YAML imported to SQLite",
+        kind=kind,
+        path=str(db_path),
+        generation=generation,
+        pruned_through=pruned,
+        added=len(added),
+        removed=len(removed),
+        changed=len(changed),
+    )
+    return diff
@@ -4,25 +4,88 @@ Contains the core processing pipeline and abstract methods
 that must be implemented by specific processor types.
 """
 
-import json
-import re
 from abc import ABC, abstractmethod
-from typing import Any
+from collections.abc import Mapping
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from functools import cached_property
+from typing import Any, ClassVar
 
 from src.mlogg import logger
 from src.mlogg.utils import timeit
+from src.service.parser.digipos.codec_parser import (
+    IncrementalItemsDecoder,
+    decode_json,
+)
+from src.service.parser.digipos.rules_parser import (
+    DEFAULT_QUOTA_RULES,
+    ParserRuleSet,
+    ProcessorRules,
+    QuotaRuleEngine,
+    RuleSpec,
+    get_active_ruleset,
+)
 
 # Character limit constant
 MAX_CHAR_LIMIT = 7000
 
+# Rules yang dipakai request yang sedang diproses (per thread/task), supaya
+# processor yang di-share tetap konsisten walau ruleset di-swap di tengah jalan
+_request_rules: ContextVar[ProcessorRules | None] = ContextVar(
+    "parser_request_rules", default=None
+)
+
+
+def reserved_length(document: Mapping[str, Any], reserve: tuple[str, ...]) -> int:
+    """Length of the `reserve` document fields as printed next to the output."""
+    return sum(len(str(document.get(name, ""))) for name in reserve)
+
+
+class CompactionLevel(IntEnum):
+    """Output compaction levels, escalated until the output fits."""
+
+    NONE = 0
+    STRIP_METADATA = 1
+    SHORTEN_UNITS = 2
+    ABBREVIATE = 3
+    DROP_PRODUCTS = 4
+
+
+COMPACTION_STEPS = (
+    CompactionLevel.STRIP_METADATA,
+    CompactionLevel.SHORTEN_UNITS,
+    CompactionLevel.ABBREVIATE,
+)
+
+
+@dataclass(frozen=True)
+class ProcessResult:
+    """Processed output plus what it took to fit the budget."""
+
+    output: str
+    level: CompactionLevel = CompactionLevel.NONE
+    total_products: int = 0
+    kept_products: int = 0
+    dropped_products: int = 0
+    # field body selain list produk (mis. `to`), ikut di-cache bersama output
+    document: Mapping[str, Any] = field(default_factory=dict)
+
 
 class BaseProcessor(ABC):
     """Abstract base class for all response processors."""
 
+    # Default quota rules (bisa di-override parser_rules.yaml)
+    default_quota_rules: ClassVar[QuotaRuleEngine] = DEFAULT_QUOTA_RULES
+    # Key list produk di response JSON
+    items_key: ClassVar[str] = "paket"
+
     def __init__(self, category: str, processor_type: str):
         self.category = category
         self.processor_type = processor_type
         self.logger = logger.bind(category=category, processor_type=processor_type)
+        # (ruleset, rules) terakhir, supaya resolve cukup cek identity
+        self._resolved: tuple[ParserRuleSet, ProcessorRules] | None = None
 
     @abstractmethod
     def get_exclude_subcategories(self) -> list[str]:
@@ -49,134 +112,307 @@ class BaseProcessor(ABC):
         """Format individual product for output."""
         pass
 
-    @timeit
-    def process_response(self, response_data: str) -> str:
-        """Main processing pipeline - same for all processor types."""
-        # 1. Check character limit first
-        char_count = len(response_data)
-        self.logger.info(f"Response character count: {char_count}")
-
-        data = json.loads(response_data)
-
-        # 2. Always apply filtering (to clean irrelevant data)
-        self.logger.info("Applying filters to clean data...")
-
-        # Filter by subcategory
-        filtered_data = self._filter_by_subcategory(data)
+    @cached_property
+    def default_rule_spec(self) -> RuleSpec:
+        """Rules bawaan processor (dari exclusion hooks + default quota rules)."""
+        return RuleSpec(
+            exclude_subcategories=tuple(self.get_exclude_subcategories()),
+            exclude_productnames=tuple(self.get_exclude_productnames()),
+            exclude_quota_metadata=tuple(self.get_exclude_quota_metadata()),
+            unit_suffixes=tuple(self.default_quota_rules.unit_suffixes.items()),
+            word_replacements=tuple(self.default_quota_rules.word_replacements.items()),
+        )
 
-        # Filter by product name patterns
-        filtered_data = self._filter_by_productname(filtered_data)
+    def resolve_rules(self, ruleset: ParserRuleSet | None = None) -> ProcessorRules:
+        """Compiled rules untuk processor ini dari ruleset (default: aktif)."""
+        ruleset = ruleset or get_active_ruleset()
+        resolved = self._resolved
+        if resolved is not None and resolved[0] is ruleset:
+            return resolved[1]
+        rules = ruleset.resolve(
+            self.category, self.processor_type, self.default_rule_spec
+        )
+        self._resolved = (ruleset, rules)
+        return rules
 
-        # Filter by quota metadata patterns
-        filtered_data = self._filter_by_quota_metadata(filtered_data)
+    @property
+    def rules(self) -> ProcessorRules:
+        """Rules request berjalan, atau rules dari ruleset aktif."""
+        return _request_rules.get() or self.resolve_rules()
 
-        # 3. Apply text optimization only if needed
-        if char_count <= MAX_CHAR_LIMIT:
-            self.logger.info("Response within limit, skipping text optimization")
-            final_data = filtered_data
-        else:
-            self.logger.info("Response exceeds limit, applying text optimization")
-            final_data = self._optimize_quotas(filtered_data)
+    @property
+    def quota_rules(self) -> QuotaRuleEngine:
+        return self.rules.quota_rules
 
-        # Final character check
-        final_output = self._format_output(final_data)
-        final_char_count = len(final_output)
-        self.logger.info(f"Final output character count: {final_char_count}")
+    def clean_quota_metadata(self, quota: str) -> str:
+        """Strip quota metadata (part before '/') from each quota item."""
+        return self.quota_rules.clean_metadata(quota)
 
-        return final_output
+    def get_product_priority(self, product: dict[str, Any]) -> float:  # noqa: ARG002
+        """Priority used when dropping products to fit the budget.
 
-    def _filter_by_subcategory(self, data: dict[str, Any]) -> dict[str, Any]:
-        """Filter products by excluded subcategories."""
-        exclude_list = self.get_exclude_subcategories()
-        if not exclude_list or not any(
-            exclude_list
-        ):  # Skip if empty or all empty strings
-            return data
+        Lower priority is dropped first; ties are dropped from the end of the
+        catalog (upstream lists the most relevant products first).
+        """
+        return 0.0
 
-        original_count = len(data.get("paket", []))
-        filtered_paket = []
+    def process_response(self, response_data: str | bytes) -> str:
+        """Main processing pipeline - same for all processor types."""
+        return self.process_with_report(response_data).output
 
-        for product in data.get("paket", []):
-            subcategory = product.get("productSubCategory", "")
-            if subcategory not in exclude_list:
-                filtered_paket.append(product)
+    @timeit
+    def process_with_report(
+        self,
+        response_data: str | bytes,
+        budget: int = MAX_CHAR_LIMIT,
+        data: dict[str, Any] | None = None,
+        rules: ProcessorRules | None = None,
+        reserve: tuple[str, ...] = (),
+    ) -> ProcessResult:
+        """Process response and guarantee the output fits in `budget` chars.
+
+        `data` is the already decoded body (skips decoding it again).
+        `rules` pins the compiled rules for this call (default: active ruleset).
+        `reserve` lists document fields printed next to the output (e.g.
+        `to`); their length is taken from the budget once the body is decoded.
+
+        1. Single pass per product: exclusion -> format (no compaction)
+        2. If the formatted output is over budget, escalate compaction level
+           (metadata strip, unit shortening, abbreviation) one level at a time,
+           transforming each product once per level and tracking the total
+           length incrementally instead of re-joining the output
+        3. Still over budget: drop lowest-priority products until it fits
+        """
+        token = _request_rules.set(rules or self.resolve_rules())
+        try:
+            return self._process(response_data, budget, data, reserve)
+        finally:
+            _request_rules.reset(token)
+
+    def open_stream(
+        self,
+        budget: int = MAX_CHAR_LIMIT,
+        rules: ProcessorRules | None = None,
+        reserve: tuple[str, ...] = (),
+    ) -> "ProcessorStream":
+        """Streaming variant of `process_with_report` (body fed per chunk)."""
+        return ProcessorStream(self, rules or self.resolve_rules(), budget, reserve)
+
+    def _process(
+        self,
+        response_data: str | bytes,
+        budget: int,
+        data: dict[str, Any] | None,
+        reserve: tuple[str, ...] = (),
+    ) -> ProcessResult:
+        # 1. Check character limit first
+        char_count = len(response_data)
+        self.logger.info(f"Response character count: {char_count}")
 
-        data["paket"] = filtered_paket
+        if data is None:
+            data = decode_json(response_data)
+        products = data.get(self.items_key, [])
+        document = {k: v for k, v in data.items() if k != self.items_key}
+
+        # 2. Always apply filtering, format without compaction
+        kept: list[dict[str, Any]] = []
+        formatted: list[str] = []
+        total = self._filter_format(products, kept, formatted)
+
+        self.logger.info(f"Filter: {len(products)} → {len(kept)} products")
+        budget -= reserved_length(document, reserve)
+        return self._fit_budget(kept, formatted, total, len(products), budget, document)
+
+    def _filter_format(
+        self,
+        products: list[dict[str, Any]],
+        kept: list[dict[str, Any]],
+        formatted: list[str],
+    ) -> int:
+        """Exclusion -> format per product, appending to `kept`/`formatted`.
+
+        Returns the total length of the lines added.
+        """
+        is_excluded = self.rules.exclusion
+        total = 0
+        for product in products:
+            if is_excluded is not None and is_excluded(product):
+                continue
+            line = self.format_product_output(product)
+            kept.append(product)
+            formatted.append(line)
+            total += len(line)
+        return total
+
+    def _fit_budget(
+        self,
+        kept: list[dict[str, Any]],
+        formatted: list[str],
+        total: int,
+        total_products: int,
+        budget: int,
+        document: Mapping[str, Any],
+    ) -> ProcessResult:
+        # 3. Escalate compaction only while the formatted output is over budget
+        level = CompactionLevel.NONE
+        if total > budget:
+            originals = [p.get("quota", "") for p in kept]
+            for next_level in COMPACTION_STEPS:
+                if total <= budget:
+                    break
+                level = next_level
+                for i, product in enumerate(kept):
+                    if not self._compact_product(product, level, originals[i]):
+                        continue
+                    line = self.format_product_output(product)
+                    total += len(line) - len(formatted[i])
+                    formatted[i] = line
+
+        dropped = 0
+        if total > budget:
+            level = CompactionLevel.DROP_PRODUCTS
+            dropped, total = self._drop_to_budget(kept, formatted, total, budget)
+
+        final_output = "".join(formatted)
         self.logger.info(
-            f"Subcategory filter: {original_count} → {len(filtered_paket)} products"
+            f"Final output character count: {len(final_output)}",
+            compaction_level=level.name,
+            dropped=dropped,
         )
-        return data
-
-    def _filter_by_productname(self, data: dict[str, Any]) -> dict[str, Any]:
-        """Filter products by excluded product name patterns."""
-        exclude_patterns = self.get_exclude_productnames()
-        if not exclude_patterns or not any(
-            exclude_patterns
-        ):  # Skip if empty or all empty strings
-            return data
-
-        original_count = len(data.get("paket", []))
-        filtered_paket = []
-
-        for product in data.get("paket", []):
-            product_name = product.get("productName", "")
-            should_exclude = any(
-                re.match(rf"^{re.escape(pattern)}", product_name, re.IGNORECASE)
-                for pattern in exclude_patterns
-                if pattern.strip()
-            )
-
-            if not should_exclude:
-                filtered_paket.append(product)
-
-        data["paket"] = filtered_paket
-        self.logger.info(
-            f"Product name filter: {original_count} → {len(filtered_paket)} products"
+        return ProcessResult(
+            output=final_output,
+            level=level,
+            total_products=total_products,
+            kept_products=len(kept) - dropped,
+            dropped_products=dropped,
+            document=document,
         )
-        return data
-
-    def _filter_by_quota_metadata(self, data: dict[str, Any]) -> dict[str, Any]:
-        """Filter products by excluded quota metadata patterns."""
-        exclude_patterns = self.get_exclude_quota_metadata()
-        if not exclude_patterns or not any(
-            exclude_patterns
-        ):  # Skip if empty or all empty strings
-            return data
-
-        original_count = len(data.get("paket", []))
-        filtered_paket = []
-
-        for product in data.get("paket", []):
-            quota = product.get("quota", "")
-            should_exclude = any(
-                pattern in quota for pattern in exclude_patterns if pattern.strip()
-            )
-
-            if not should_exclude:
-                filtered_paket.append(product)
 
-        data["paket"] = filtered_paket
-        self.logger.info(
-            f"Quota metadata filter: {original_count} → {len(filtered_paket)} products"
+    def _compact_product(
+        self, product: dict[str, Any], level: CompactionLevel, original_quota: str
+    ) -> bool:
+        """Apply one compaction level to a product in place.
+
+        Returns True if the product changed (needs re-formatting).
+        """
+        quota = product.get("quota", "")
+        if level == CompactionLevel.STRIP_METADATA:
+            new_quota = self.quota_rules.cleanup(self.clean_quota_metadata(quota))
+        elif level == CompactionLevel.SHORTEN_UNITS:
+            new_quota = self.quota_rules.shorten_units(quota)
+        else:  # ABBREVIATE: full processor optimization hook + product name
+            new_quota = self.optimize_quota(original_quota)
+            name = product.get("productName", "")
+            short_name = self.quota_rules.abbreviate(name)
+            if short_name != name:
+                product["productName"] = short_name
+                product["quota"] = new_quota
+                return True
+
+        if new_quota == quota:
+            return False
+        product["quota"] = new_quota
+        return True
+
+    def _drop_to_budget(
+        self,
+        kept: list[dict[str, Any]],
+        formatted: list[str],
+        total: int,
+        budget: int,
+    ) -> tuple[int, int]:
+        """Blank out lowest-priority lines until `total` fits in `budget`."""
+        order = sorted(
+            range(len(kept)),
+            key=lambda i: (self.get_product_priority(kept[i]), -i),
         )
-        return data
-
-    def _optimize_quotas(self, data: dict[str, Any]) -> dict[str, Any]:
-        """Apply quota optimization to all products."""
-        for product in data.get("paket", []):
-            original_quota = product.get("quota", "")
-            optimized_quota = self.optimize_quota(original_quota)
-            product["quota"] = optimized_quota
-
-        self.logger.info(f"Optimized quotas for {len(data.get('paket', []))} products")
-        return data
-
-    def _format_output(self, data: dict[str, Any]) -> str:
-        """Format final output using processor-specific formatting."""
-        output_parts = []
-
-        for product in data.get("paket", []):
-            formatted = self.format_product_output(product)
-            output_parts.append(formatted)
-
-        return "".join(output_parts)
+        dropped = 0
+        for i in order:
+            if total <= budget:
+                break
+            total -= len(formatted[i])
+            formatted[i] = ""
+            dropped += 1
+        return dropped, total
+
+
+class ProcessorStream:
+    """Process a catalog body chunk by chunk.
+
+    Products are filtered and formatted as soon as they are decoded, while
+    the body is still being received; only compaction (which needs the
+    total length) waits for `finish()`. The rules are pinned at creation.
+    """
+
+    def __init__(
+        self,
+        processor: BaseProcessor,
+        rules: ProcessorRules,
+        budget: int = MAX_CHAR_LIMIT,
+        reserve: tuple[str, ...] = (),
+    ):
+        self.processor = processor
+        self.rules = rules
+        self.budget = budget
+        self.reserve = reserve
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop partial state (retry / failover to another module)."""
+        self._decoder = IncrementalItemsDecoder(self.processor.items_key)
+        self._kept: list[dict[str, Any]] = []
+        self._formatted: list[str] = []
+        self._total = 0
+        self.total_products = 0
+        self.received = 0
+        self.document: dict[str, Any] = {}
+
+    def feed(self, chunk: bytes) -> None:
+        self.received += len(chunk)
+        products = self._decoder.feed(chunk)
+        if products:
+            self._accept(products)
+
+    def finish(self, budget: int | None = None) -> ProcessResult:
+        """Finish the body and fit the output in the budget.
+
+        `budget` overrides the one given at creation, for callers that only
+        know it once the response arrived. `document` holds the rest of the
+        body (e.g. `to`) afterwards.
+
+        Raises:
+            ValueError: Body is not valid JSON or truncated
+        """
+        products, self.document = self._decoder.close()
+        if budget is None:
+            budget = self.budget
+        budget -= reserved_length(self.document, self.reserve)
+        token = _request_rules.set(self.rules)
+        try:
+            self._accept(products)
+            self.processor.logger.info(
+                f"Response character count: {self.received}", streamed=True
+            )
+            self.processor.logger.info(
+                f"Filter: {self.total_products} → {len(self._kept)} products"
+            )
+            return self.processor._fit_budget(
+                self._kept,
+                self._formatted,
+                self._total,
+                self.total_products,
+                budget,
+                self.document,
+            )
+        finally:
+            _request_rules.reset(token)
+
+    def _accept(self, products: list[dict[str, Any]]) -> None:
+        token = _request_rules.set(self.rules)
+        try:
+            self.total_products += len(products)
+            self._total += self.processor._filter_format(
+                products, self._kept, self._formatted
+            )
+        finally:
+            _request_rules.reset(token)
@@ -0,0 +1,88 @@
+"""LRU/TTL cache untuk hasil parsing catalog Digipos.
+
+Catalog DATA/VOICE_SMS yang sama dikirim ulang upstream berkali-kali dengan
+body identik. Key cache = (category, versi ruleset, budget, field reserve,
+digest body), value = `ProcessResult` final, jadi catalog berulang cukup satu hash + dict lookup.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from src.service.parser.digipos.base_parser import ProcessResult
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_TTL = 300.0  # detik
+
+# (category, versi ruleset, budget, field reserve, digest body)
+type CatalogKey = tuple[str, int, int, tuple[str, ...], bytes]
+
+
+def body_digest(response_data: str | bytes) -> bytes:
+    """Digest body response (blake2b 16 byte, cukup untuk key cache)."""
+    if isinstance(response_data, str):
+        response_data = response_data.encode()
+    return hashlib.blake2b(response_data, digest_size=16).digest()
+
+
+class ParsedCatalogCache:
+    """Cache `ProcessResult` per `CatalogKey` dengan LRU + TTL."""
+
+    def __init__(
+        self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: float = DEFAULT_TTL
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[CatalogKey, tuple[float, ProcessResult]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expired = 0
+
+    def get(self, key: CatalogKey) -> ProcessResult | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, result = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key: CatalogKey, result: ProcessResult) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expired": self.expired,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
@@ -0,0 +1,183 @@
+"""Decode layer untuk body JSON upstream.
+
+Body upstream di-decode sekali oleh parser; field selain list produk
+(mis. `to`) dibawa di `ProcessResult.document` untuk router. Backend dipilih otomatis dari yang terpasang:
+orjson -> msgspec -> stdlib `json`.
+
+`IncrementalItemsDecoder` untuk mode streaming: item array `paket`/`res`
+di-decode satu per satu selama body masih diterima.
+"""
+
+import codecs
+import json
+from collections.abc import Callable
+from typing import Any
+
+from src.mlogg import logger
+
+JsonLoads = Callable[[str | bytes], Any]
+
+
+def _stdlib_loads(data: str | bytes) -> Any:
+    return json.loads(data)
+
+
+def _available_backends() -> dict[str, JsonLoads]:
+    backends: dict[str, JsonLoads] = {}
+    try:
+        import orjson  # noqa: PLC0415
+
+        backends["orjson"] = orjson.loads
+    except ImportError:
+        pass
+    try:
+        import msgspec  # noqa: PLC0415
+
+        # untyped decode: processor memodifikasi dict produk saat compaction
+        backends["msgspec"] = msgspec.json.Decoder().decode
+    except ImportError:
+        pass
+    backends["json"] = _stdlib_loads
+    return backends
+
+
+BACKENDS: dict[str, JsonLoads] = _available_backends()
+
+
+JSON_BACKEND = next(iter(BACKENDS))
+_loads: JsonLoads = BACKENDS[JSON_BACKEND]
+
+
+def set_json_backend(name: str) -> None:
+    """Paksa backend tertentu (benchmark / troubleshooting)."""
+    global JSON_BACKEND, _loads
+    if name not in BACKENDS:
+        raise ValueError(f"JSON backend {name!r} not installed: {list(BACKENDS)}")
+    logger.info("JSON backend selected", backend=name)
+    JSON_BACKEND = name
+    _loads = BACKENDS[name]
+
+
+def decode_json(data: str | bytes) -> Any:
+    """Decode body JSON dengan backend tercepat yang tersedia.
+
+    Raises:
+        ValueError: Body bukan JSON valid (semua backend raise subclass
+            ValueError)
+    """
+    return _loads(data)
+
+
+_WHITESPACE = " \t\r\n"
+
+
+class IncrementalItemsDecoder:
+    """Decode item array `items_key` dari body JSON yang datang per chunk.
+
+    Header (field sebelum array) di-scan per karakter sampai array
+    `items_key` di level teratas ditemukan; setiap item kemudian di-decode
+    dengan `raw_decode` begitu lengkap. Teks di luar array disimpan sebagai
+    kerangka dokumen (array dikosongkan) untuk `close()`.
+    """
+
+    def __init__(self, items_key: str):
+        self.items_key = items_key
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._skeleton: list[str] = []
+        self._state = "header"  # header -> items -> trailer
+        # state scan header
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string = ""
+        self._key: str | None = None
+
+    def feed(self, chunk: bytes) -> list[Any]:
+        """Tambahkan chunk, kembalikan item yang sudah lengkap."""
+        self._buf += self._text.decode(chunk)
+        return self._drain()
+
+    def close(self) -> tuple[list[Any], dict[str, Any]]:
+        """Akhiri stream: (item tersisa, dokumen tanpa item).
+
+        Raises:
+            ValueError: Body bukan JSON valid atau terpotong
+        """
+        self._buf += self._text.decode(b"", final=True)
+        items = self._drain()
+        if self._state == "items":
+            raise ValueError(f"Truncated JSON body: {self.items_key!r} not closed")
+        if self._state == "header":
+            # array tidak ditemukan: decode biasa (mis. body error upstream)
+            document = json.loads(self._buf)
+            if not isinstance(document, dict):
+                raise ValueError("JSON body is not an object")
+            return items + list(document.pop(self.items_key, None) or []), document
+        document = json.loads("".join(self._skeleton))
+        document.pop(self.items_key, None)
+        return items, document
+
+    def _drain(self) -> list[Any]:
+        if self._state == "header":
+            self._scan_header()
+        items = self._read_items() if self._state == "items" else []
+        if self._state == "trailer":
+            self._skeleton.append(self._buf)
+            self._buf = ""
+        return items
+
+    def _scan_header(self) -> None:  # noqa: C901
+        buf = self._buf
+        i = self._pos
+        while i < len(buf):
+            char = buf[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    self._last_string = buf[self._string_start : i + 1]
+            elif char == '"':
+                self._in_string = True
+                self._string_start = i
+            elif char == ":" and self._depth == 1:
+                self._key = json.loads(self._last_string)
+            elif char == "," and self._depth == 1:
+                self._key = None
+            elif char in "{[":
+                self._depth += 1
+                if char == "[" and self._depth == 2 and self._key == self.items_key:
+                    self._skeleton.append(buf[: i + 1])
+                    self._buf = buf[i + 1 :]
+                    self._state = "items"
+                    return
+            elif char in "}]":
+                self._depth -= 1
+            i += 1
+        self._pos = i
+
+    def _read_items(self) -> list[Any]:
+        buf = self._buf
+        pos = 0
+        items: list[Any] = []
+        while True:
+            while pos < len(buf) and (buf[pos] in _WHITESPACE or buf[pos] == ","):
+                pos += 1
+            if pos >= len(buf):
+                break
+            if buf[pos] == "]":
+                self._state = "trailer"
+                break
+            try:
+                item, pos = self._decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                break  # item belum lengkap, tunggu chunk berikutnya
+            items.append(item)
+        self._buf = buf[pos:]
+        return items
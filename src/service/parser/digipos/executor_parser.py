@@ -0,0 +1,305 @@
+"""Executor untuk parsing catalog tanpa memblok event loop.
+
+Mode:
+- inline: parse langsung di event loop (default, tanpa overhead)
+- thread: offload ke thread pool, processor + ruleset di-share
+- process: offload ke process pool (lepas dari GIL); worker di-warm saat
+  start (registry processor + compile rules), ruleset dikirim per versi
+
+Hanya body >= `offload_threshold` byte yang di-offload; catalog kecil dan
+cache hit tetap inline. Metrics: queue time (submit -> worker mulai,
+termasuk transfer ke process) vs parse time (di worker).
+
+`streaming=True`: catalog di-parse per chunk selama body upstream diterima
+(lihat `open_stream`), tanpa cache dan tanpa offload.
+"""
+
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from enum import StrEnum
+from typing import Any
+
+from src.mlogg import logger
+from src.service.parser.digipos import parser_service
+from src.service.parser.digipos.base_parser import (
+    MAX_CHAR_LIMIT,
+    ProcessorStream,
+    ProcessResult,
+)
+from src.service.parser.digipos.factory_parser import ProcessorFactory
+from src.service.parser.digipos.rules_parser import (
+    ParserRuleSet,
+    get_active_ruleset,
+)
+
+DEFAULT_OFFLOAD_THRESHOLD = 64 * 1024
+
+
+class ParserExecutorMode(StrEnum):
+    INLINE = "inline"
+    THREAD = "thread"
+    PROCESS = "process"
+
+
+# ---- worker process side -------------------------------------------------
+
+_worker_ruleset: ParserRuleSet | None = None
+
+
+def _warm_worker() -> None:
+    """Initializer worker process: bangun processor + compile default rules."""
+    ProcessorFactory.compile_rules(get_active_ruleset())
+
+
+def _worker_rules(overrides: dict[str, Any], version: int) -> ParserRuleSet:
+    global _worker_ruleset
+    if _worker_ruleset is None or _worker_ruleset.version != version:
+        ruleset = ParserRuleSet(overrides, version=version)
+        ProcessorFactory.compile_rules(ruleset)
+        _worker_ruleset = ruleset
+    return _worker_ruleset
+
+
+def _parse_in_process(
+    category: str,
+    response_data: bytes,
+    overrides: dict[str, Any],
+    version: int,
+    budget: int,
+    reserve: tuple[str, ...],
+) -> tuple[ProcessResult, float]:
+    start = time.perf_counter()
+    ruleset = _worker_rules(overrides, version)
+    result = parser_service.parse_category(
+        category, response_data, None, ruleset, budget, reserve
+    )
+    return result, time.perf_counter() - start
+
+
+def _parse_in_thread(
+    category: str,
+    response_data: str | bytes,
+    data: dict[str, Any] | None,
+    ruleset: ParserRuleSet,
+    budget: int,
+    reserve: tuple[str, ...],
+) -> tuple[ProcessResult, float]:
+    start = time.perf_counter()
+    result = parser_service.parse_category(
+        category, response_data, data, ruleset, budget, reserve
+    )
+    return result, time.perf_counter() - start
+
+
+# ---- event loop side -----------------------------------------------------
+
+
+class _TimingStats:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def snapshot(self) -> dict:
+        avg = self.total / self.count if self.count else 0.0
+        return {
+            "count": self.count,
+            "avg_ms": round(avg * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class ParserExecutor:
+    """Jalankan parser catalog inline atau di worker pool bersama."""
+
+    def __init__(
+        self,
+        mode: ParserExecutorMode | str = ParserExecutorMode.INLINE,
+        max_workers: int = 2,
+        offload_threshold: int = DEFAULT_OFFLOAD_THRESHOLD,
+        streaming: bool = False,
+    ):
+        self.mode = ParserExecutorMode(mode)
+        self.streaming = streaming
+        self.max_workers = max(max_workers, 1)
+        self.offload_threshold = offload_threshold
+        self._pool: Executor | None = None
+        self._lock = threading.Lock()
+        self.inline = 0
+        self.offloaded = 0
+        self.pending = 0
+        self.streamed = 0
+        self.queue_time = _TimingStats()
+        self.parse_time = _TimingStats()
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> "ParserExecutor":
+        return cls(
+            mode=settings.parser_executor_mode,
+            max_workers=settings.parser_max_workers,
+            offload_threshold=settings.parser_offload_threshold,
+            streaming=settings.parser_streaming,
+        )
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = self._create_pool()
+        return self._pool
+
+    def _create_pool(self) -> Executor:
+        logger.info(
+            "Starting parser worker pool",
+            mode=self.mode.value,
+            max_workers=self.max_workers,
+        )
+        if self.mode == ParserExecutorMode.PROCESS:
+            # spawn: jangan fork proses yang sudah punya thread (watcher, pool)
+            return ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_worker,
+            )
+        return ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="parser"
+        )
+
+    def should_offload(self, response_data: str | bytes) -> bool:
+        return (
+            self.mode != ParserExecutorMode.INLINE
+            and len(response_data) >= self.offload_threshold
+        )
+
+    def open_stream(
+        self, category: str, reserve: tuple[str, ...] = ()
+    ) -> ProcessorStream | None:
+        """Streaming parser untuk category, None jika streaming tidak aktif.
+
+        Budget diberikan saat `finish()` (lihat `process` untuk `reserve`).
+
+        Raises:
+            ValueError: If category is not supported
+        """
+        if not self.streaming:
+            # tetap validasi: category salah gagal sebelum request ke upstream
+            ProcessorFactory.get_processor_type(category)
+            return None
+        self.streamed += 1
+        return parser_service.open_category_stream(category, reserve=reserve)
+
+    async def process(
+        self,
+        category: str,
+        response_data: str | bytes,
+        data: dict[str, Any] | None = None,
+        budget: int = MAX_CHAR_LIMIT,
+        reserve: tuple[str, ...] = (),
+    ) -> ProcessResult:
+        """Parse catalog (cache -> inline/offload), hasil sama dengan inline.
+
+        Cache hit tidak decode body: field lain (mis. `to`) ada di
+        `ProcessResult.document`. `budget` = sisa karakter untuk output;
+        panjang field `reserve` (mis. `to`) ikut dikurangkan setelah decode.
+
+        Raises:
+            ValueError: If category is not supported or body is not valid JSON
+        """
+        ruleset = get_active_ruleset()
+        cache = parser_service.catalog_cache
+        key = parser_service.catalog_cache_key(
+            category, response_data, ruleset, budget, reserve
+        )
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+        if not self.should_offload(response_data):
+            self.inline += 1
+            result = parser_service.parse_category(
+                category, response_data, data, ruleset, budget, reserve
+            )
+        else:
+            result = await self._offload(
+                category, response_data, data, ruleset, budget, reserve
+            )
+        cache.put(key, result)
+        return result
+
+    async def _offload(
+        self,
+        category: str,
+        response_data: str | bytes,
+        data: dict[str, Any] | None,
+        ruleset: ParserRuleSet,
+        budget: int,
+        reserve: tuple[str, ...],
+    ) -> ProcessResult:
+        loop = asyncio.get_running_loop()
+        if self.mode == ParserExecutorMode.PROCESS:
+            # dict hasil decode tidak dikirim: pickle dict > decode ulang bytes
+            body = (
+                response_data.encode()
+                if isinstance(response_data, str)
+                else response_data
+            )
+            call = (
+                _parse_in_process,
+                category,
+                body,
+                ruleset.overrides,
+                ruleset.version,
+                budget,
+                reserve,
+            )
+        else:
+            call = (
+                _parse_in_thread,
+                category,
+                response_data,
+                data,
+                ruleset,
+                budget,
+                reserve,
+            )
+
+        self.offloaded += 1
+        self.pending += 1
+        submitted = time.perf_counter()
+        try:
+            result, parse_time = await loop.run_in_executor(self._get_pool(), *call)
+        finally:
+            self.pending -= 1
+        total = time.perf_counter() - submitted
+        self.queue_time.record(max(total - parse_time, 0.0))
+        self.parse_time.record(parse_time)
+        return result
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+            logger.info("Parser worker pool stopped", mode=self.mode.value)
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode.value,
+            "max_workers": self.max_workers,
+            "offload_threshold": self.offload_threshold,
+            "streaming": self.streaming,
+            "streamed": self.streamed,
+            "inline": self.inline,
+            "offloaded": self.offloaded,
+            "pending": self.pending,
+            "queue_time": self.queue_time.snapshot(),
+            "parse_time": self.parse_time.snapshot(),
+        }
@@ -3,63 +3,47 @@
 Routes categories to the correct processor type:
 - RECHARGE: For mobile number categories (DATA, VOICE_SMS, etc.)
 - ACTIVATION: For VCR/VF categories
-"""
 
-from typing import ClassVar
+Category mapping lives in the processor classes themselves
+(`@register_processor`), the factory only looks up pre-built instances.
+"""
 
-from src.service.parser.digipos.actvcr_parser import ActivationProcessor
+# import processor modules so their categories get registered
+from src.service.parser.digipos import actvcr_parser, recharge_parser  # noqa: F401
 from src.service.parser.digipos.base_parser import BaseProcessor
-from src.service.parser.digipos.recharge_parser import RechargeProcessor
+from src.service.parser.digipos.registry_parser import PROCESSORS
+from src.service.parser.digipos.rules_parser import ParserRuleSet
 
 
 class ProcessorFactory:
-    """Factory to create appropriate processor for each category."""
-
-    # Define category mappings
-    RECHARGE_CATEGORIES: ClassVar[set[str]] = {
-        "DATA",
-        "VOICE_SMS",
-        "DIGITAL_OTHER",
-        "DIGITAL_MUSIC",
-        "DIGITAL_GAME",
-        "ROAMING",
-        "BYU",
-        "HVC_DATA",
-        "HVC_VOICE_SMS",
-    }
-
-    ACTIVATION_CATEGORIES: ClassVar[set[str]] = {
-        "VF",
-    }
+    """Lookup the shared processor instance for each category."""
 
     @classmethod
     def create_processor(cls, category: str) -> BaseProcessor:
-        """Create processor for given category."""
-        category_upper = category.upper()
-
-        if category_upper in cls.RECHARGE_CATEGORIES:
-            return RechargeProcessor(category_upper)
-        elif category_upper in cls.ACTIVATION_CATEGORIES:
-            return ActivationProcessor(category_upper)
-        else:
+        """Get the pre-built processor for given category."""
+        processor = PROCESSORS.get(category) or PROCESSORS.get(category.upper())
+        if processor is None:
             raise ValueError(
                 f"Unsupported category: {category}. "
-                f"Supported: {cls.RECHARGE_CATEGORIES | cls.ACTIVATION_CATEGORIES}"
+                f"Supported: {cls.get_supported_categories()}"
             )
+        return processor
 
     @classmethod
     def get_supported_categories(cls) -> set[str]:
         """Get all supported categories."""
-        return cls.RECHARGE_CATEGORIES | cls.ACTIVATION_CATEGORIES
+        return set(PROCESSORS)
 
     @classmethod
     def get_processor_type(cls, category: str) -> str:
         """Get processor type for a category."""
-        category_upper = category.upper()
-
-        if category_upper in cls.RECHARGE_CATEGORIES:
-            return "RECHARGE"
-        elif category_upper in cls.ACTIVATION_CATEGORIES:
-            return "ACTIVATION"
-        else:
+        processor = PROCESSORS.get(category.upper())
+        if processor is None:
             raise ValueError(f"Unsupported category: {category}")
+        return processor.processor_type
+
+    @classmethod
+    def compile_rules(cls, ruleset: ParserRuleSet) -> None:
+        """Pre-compile rules for every registered processor (before swap)."""
+        for processor in PROCESSORS.values():
+            processor.resolve_rules(ruleset)
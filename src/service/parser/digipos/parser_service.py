@@ -3,12 +3,28 @@
 Clean API for FastAPI integration.
 """
 
+from typing import Any
+
 from src.mlogg.utils import timeit
+from src.service.parser.digipos.base_parser import (
+    MAX_CHAR_LIMIT,
+    ProcessorStream,
+    ProcessResult,
+)
+from src.service.parser.digipos.cache_parser import (
+    CatalogKey,
+    ParsedCatalogCache,
+    body_digest,
+)
 from src.service.parser.digipos.factory_parser import ProcessorFactory
+from src.service.parser.digipos.rules_parser import ParserRuleSet, get_active_ruleset
+
+# Catalog berulang (body identik) tidak perlu di-parse ulang
+catalog_cache = ParsedCatalogCache()
 
 
 @timeit
-def process_category_response(category: str, response_data: str) -> str:
+def process_category_response(category: str, response_data: str | bytes) -> str:
     """Main entry point for processing category responses.
 
     Args:
@@ -21,8 +37,97 @@ def process_category_response(category: str, response_data: str) -> str:
     Raises:
         ValueError: If category is not supported
     """
+    return process_category_result(category, response_data).output
+
+
+def process_category_result(
+    category: str,
+    response_data: str | bytes,
+    data: dict[str, Any] | None = None,
+) -> ProcessResult:
+    """Process category response and report compaction details.
+
+    Args:
+        category: Category type (DATA, VOICE_SMS, VF, etc.)
+        response_data: Raw JSON response body (used for the cache key)
+        data: Already decoded body, so it is not decoded twice
+
+    Returns:
+        ProcessResult with the output (guaranteed within MAX_CHAR_LIMIT) and
+        the compaction level used
+
+    Raises:
+        ValueError: If category is not supported
+    """
+    # snapshot ruleset sekali: reload rules di tengah request tidak berpengaruh
+    ruleset = get_active_ruleset()
+    key = catalog_cache_key(category, response_data, ruleset)
+    cached = catalog_cache.get(key)
+    if cached is not None:
+        return cached
+
+    result = parse_category(category, response_data, data, ruleset)
+    catalog_cache.put(key, result)
+    return result
+
+
+def parse_category(
+    category: str,
+    response_data: str | bytes,
+    data: dict[str, Any] | None = None,
+    ruleset: ParserRuleSet | None = None,
+    budget: int = MAX_CHAR_LIMIT,
+    reserve: tuple[str, ...] = (),
+) -> ProcessResult:
+    """Run the processor pipeline without the catalog cache."""
     processor = ProcessorFactory.create_processor(category)
-    return processor.process_response(response_data)
+    return processor.process_with_report(
+        response_data,
+        budget=budget,
+        data=data,
+        rules=processor.resolve_rules(ruleset),
+        reserve=reserve,
+    )
+
+
+def open_category_stream(
+    category: str,
+    ruleset: ParserRuleSet | None = None,
+    reserve: tuple[str, ...] = (),
+) -> ProcessorStream:
+    """Streaming parser for a category, fed with the body chunk by chunk.
+
+    Streamed bodies bypass the catalog cache: the digest is only known
+    after the whole body has already been parsed.
+
+    Raises:
+        ValueError: If category is not supported
+    """
+    processor = ProcessorFactory.create_processor(category)
+    return processor.open_stream(
+        rules=processor.resolve_rules(ruleset), reserve=reserve
+    )
+
+
+def catalog_cache_key(
+    category: str,
+    response_data: str | bytes,
+    ruleset: ParserRuleSet,
+    budget: int = MAX_CHAR_LIMIT,
+    reserve: tuple[str, ...] = (),
+) -> CatalogKey:
+    """Cache key: (category, ruleset version, budget, reserve, body digest)."""
+    return (category, ruleset.version, budget, reserve, body_digest(response_data))
+
+
+def get_cache_stats() -> dict:
+    """Get parsed-catalog cache hit/miss stats."""
+    return catalog_cache.stats()
+
+
+def clear_cache() -> None:
+    """Drop all cached parsed catalogs."""
+    catalog_cache.clear()
 
 
 def get_supported_categories() -> set[str]:
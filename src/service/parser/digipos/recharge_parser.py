@@ -4,12 +4,23 @@ Handles: DATA, VOICE_SMS, DIGITAL_OTHER, DIGITAL_MUSIC, DIGITAL_GAME,
          ROAMING, BYU, HVC_DATA, HVC_VOICE_SMS
 """
 
-import re
 from typing import Any
 
 from src.service.parser.digipos.base_parser import BaseProcessor
-
-
+from src.service.parser.digipos.registry_parser import register_processor
+
+
+@register_processor(
+    "DATA",
+    "VOICE_SMS",
+    "DIGITAL_OTHER",
+    "DIGITAL_MUSIC",
+    "DIGITAL_GAME",
+    "ROAMING",
+    "BYU",
+    "HVC_DATA",
+    "HVC_VOICE_SMS",
+)
 class RechargeProcessor(BaseProcessor):
     """Processor for recharge-type categories (mobile numbers)."""
 
@@ -37,28 +48,9 @@ class RechargeProcessor(BaseProcessor):
         # Step 1: Clean metadata using V1's elegant "/" delimiter parsing
         optimized = self.clean_quota_metadata(quota)
 
-        # Step 2: Apply universal text optimizations
-
-        # DAYS OPTIMIZATION
-        optimized = re.sub(r"\b(\d+)\s+Days\b", r"\1D", optimized, flags=re.IGNORECASE)
-
-        # GB/MB OPTIMIZATION
-        optimized = re.sub(
-            r"\b(\d+(?:\.\d+)?)\s+GB\b", r"\1GB", optimized, flags=re.IGNORECASE
-        )
-        optimized = re.sub(r"\b(\d+)\s+MB\b", r"\1MB", optimized, flags=re.IGNORECASE)
-
-        # COMMON WORD REPLACEMENTS
-        optimized = re.sub(r"\bInternet\b", "Net", optimized, flags=re.IGNORECASE)
-        optimized = re.sub(r"\bNasional\b", "Nas", optimized, flags=re.IGNORECASE)
-
-        # CLEANUP EXTRA SPACES AND COMMAS
-        optimized = re.sub(r"\s+", " ", optimized)  # Multiple spaces → single space
-        optimized = re.sub(r",\s*,", ",", optimized)  # Double commas → single comma
-        optimized = re.sub(r"^\s*,\s*", "", optimized)  # Leading comma
-        optimized = re.sub(r"\s*,\s*$", "", optimized)  # Trailing comma
-
-        return optimized.strip()
+        # Step 2: Apply universal compiled text optimizations
+        # (Days/GB/MB + word replacements in one pass, then cleanup)
+        return self.quota_rules.cleanup(self.quota_rules.substitute(optimized))
 
     def clean_quota_metadata(self, quota: str) -> str:
         """Clean metadata from quota field using V1's proven "/" delimiter parsing.
@@ -67,20 +59,7 @@ class RechargeProcessor(BaseProcessor):
         Input: "DATA National/Internet 30 Days 12 GB Nasional, Local Data/Kuota Lokal Internet 30 Days 43 GB"
         Output: "Internet 30 Days 12 GB Nasional,Kuota Lokal Internet 30 Days 43 GB"
         """
-        # Split by comma to get each quota item
-        items = quota.split(",")
-        cleaned_items = []
-
-        for item in items:
-            item = item.strip()
-            if "/" in item:
-                # Take the part after '/' as the description
-                description = item.split("/", 1)[1].strip()
-                cleaned_items.append(description)
-            elif item:  # If no '/', keep original item (if not empty)
-                cleaned_items.append(item)
-
-        return ",".join(cleaned_items)
+        return self.quota_rules.clean_metadata(quota)
 
     def format_product_output(self, product: dict[str, Any]) -> str:
         """Format product output for recharge categories.
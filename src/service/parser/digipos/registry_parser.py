@@ -0,0 +1,35 @@
+"""Registry processor per category.
+
+Processor class mendaftarkan diri lewat decorator `@register_processor(...)`.
+Instance dibuat sekali saat class didefinisikan (startup) dan dipakai ulang
+untuk semua request: processor stateless, jadi aman di-share.
+"""
+
+from collections.abc import Callable
+
+from src.service.parser.digipos.base_parser import BaseProcessor
+
+PROCESSORS: dict[str, BaseProcessor] = {}
+
+
+def register_processor(
+    *categories: str,
+) -> Callable[[type[BaseProcessor]], type[BaseProcessor]]:
+    """Daftarkan processor class untuk satu atau lebih category.
+
+    Raises:
+        ValueError: Category sudah didaftarkan oleh processor class lain
+    """
+
+    def decorator(processor_cls: type[BaseProcessor]) -> type[BaseProcessor]:
+        for category in categories:
+            key = category.upper()
+            existing = PROCESSORS.get(key)
+            if existing is not None and type(existing) is not processor_cls:
+                raise ValueError(
+                    f"Category {key} already registered to {type(existing).__name__}"
+                )
+            PROCESSORS[key] = processor_cls(key)
+        return processor_cls
+
+    return decorator
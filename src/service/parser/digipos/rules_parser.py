@@ -0,0 +1,305 @@
+"""Compiled rule engine untuk optimasi quota dan filter exclusion.
+
+Semua regex di-compile sekali (per processor class), bukan per produk:
+- Unit shortening (Days/GB/MB) dan word replacement (Internet->Net, dst)
+  digabung jadi satu alternation + tabel replacement (single pass)
+- Pola exclusion product name digabung jadi satu prefix matcher
+- Pola exclusion quota metadata digabung jadi satu substring matcher
+
+Rules bisa di-override dari `parser_rules.yaml` (per processor type atau per
+category). Override di-compile jadi `ParserRuleSet` sekali per reload lalu
+di-swap atomic; request yang sedang jalan tetap memakai ruleset lama.
+"""
+
+import itertools
+import re
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Any
+
+DEFAULT_UNIT_SUFFIXES: dict[str, str] = {
+    "days": "D",
+    "gb": "GB",
+    "mb": "MB",
+}
+
+DEFAULT_WORD_REPLACEMENTS: dict[str, str] = {
+    "internet": "Net",
+    "nasional": "Nas",
+}
+
+_MULTI_SPACE = re.compile(r"\s+")
+_DOUBLE_COMMA = re.compile(r",\s*,")
+_LEADING_COMMA = re.compile(r"^\s*,\s*")
+_TRAILING_COMMA = re.compile(r"\s*,\s*$")
+
+
+def _alternation(words: Iterable[str]) -> str:
+    # kata terpanjang dulu supaya alternation tidak berhenti di prefix
+    return "|".join(re.escape(w) for w in sorted(words, key=len, reverse=True))
+
+
+class QuotaRuleEngine:
+    """Kumpulan rule optimasi quota yang sudah di-compile."""
+
+    def __init__(
+        self,
+        unit_suffixes: Mapping[str, str] | None = None,
+        word_replacements: Mapping[str, str] | None = None,
+    ):
+        units = unit_suffixes if unit_suffixes is not None else DEFAULT_UNIT_SUFFIXES
+        words = (
+            word_replacements
+            if word_replacements is not None
+            else DEFAULT_WORD_REPLACEMENTS
+        )
+        self.unit_suffixes = {k.lower(): v for k, v in units.items()}
+        self.word_replacements = {k.lower(): v for k, v in words.items()}
+
+        unit_re = (
+            rf"\b(?P<num>\d+(?:\.\d+)?)\s+(?P<unit>{_alternation(self.unit_suffixes)})\b"
+            if self.unit_suffixes
+            else None
+        )
+        word_re = (
+            rf"\b(?P<word>{_alternation(self.word_replacements)})\b"
+            if self.word_replacements
+            else None
+        )
+        self._unit_pattern = re.compile(unit_re, re.IGNORECASE) if unit_re else None
+        self._word_pattern = re.compile(word_re, re.IGNORECASE) if word_re else None
+        fused = "|".join(p for p in (unit_re, word_re) if p)
+        self._fused_pattern = re.compile(fused, re.IGNORECASE) if fused else None
+
+    def _replace_unit(self, match: re.Match) -> str:
+        return match.group("num") + self.unit_suffixes[match.group("unit").lower()]
+
+    def _replace_word(self, match: re.Match) -> str:
+        return self.word_replacements[match.group("word").lower()]
+
+    def _replace_fused(self, match: re.Match) -> str:
+        if match.lastgroup == "word":
+            return self._replace_word(match)
+        return self._replace_unit(match)
+
+    @staticmethod
+    def clean_metadata(quota: str) -> str:
+        """Ambil deskripsi setelah '/' untuk tiap item quota (dipisah koma)."""
+        cleaned_items = []
+        for item in quota.split(","):
+            item = item.strip()
+            if "/" in item:
+                cleaned_items.append(item.split("/", 1)[1].strip())
+            elif item:
+                cleaned_items.append(item)
+        return ",".join(cleaned_items)
+
+    def shorten_units(self, text: str) -> str:
+        """'30 Days' -> '30D', '12 GB' -> '12GB'."""
+        if self._unit_pattern is None:
+            return text
+        return self._unit_pattern.sub(self._replace_unit, text)
+
+    def abbreviate(self, text: str) -> str:
+        """Ganti kata panjang dengan singkatan (Internet -> Net, dst)."""
+        if self._word_pattern is None:
+            return text
+        return self._word_pattern.sub(self._replace_word, text)
+
+    @staticmethod
+    def cleanup(text: str) -> str:
+        """Rapikan spasi ganda dan koma berlebih."""
+        text = _MULTI_SPACE.sub(" ", text)
+        text = _DOUBLE_COMMA.sub(",", text)
+        text = _LEADING_COMMA.sub("", text)
+        text = _TRAILING_COMMA.sub("", text)
+        return text.strip()
+
+    def substitute(self, text: str) -> str:
+        """Unit shortening + word replacement dalam satu pass regex."""
+        if self._fused_pattern is None:
+            return text
+        return self._fused_pattern.sub(self._replace_fused, text)
+
+    def optimize(self, quota: str) -> str:
+        """Pipeline lengkap: metadata strip -> unit + word (single pass) -> cleanup."""
+        if not quota:
+            return quota
+        return self.cleanup(self.substitute(self.clean_metadata(quota)))
+
+
+DEFAULT_QUOTA_RULES = QuotaRuleEngine()
+
+
+@lru_cache(maxsize=256)
+def compile_prefix_matcher(
+    patterns: tuple[str, ...],
+) -> Callable[[str], re.Match | None] | None:
+    """Satu regex case-insensitive untuk semua prefix exclusion product name."""
+    active = [p for p in patterns if p.strip()]
+    if not active:
+        return None
+    return re.compile(_alternation(active), re.IGNORECASE).match
+
+
+@lru_cache(maxsize=256)
+def compile_substring_matcher(
+    patterns: tuple[str, ...],
+) -> Callable[[str], re.Match | None] | None:
+    """Satu regex untuk semua pola substring exclusion quota metadata."""
+    active = [p for p in patterns if p.strip()]
+    if not active:
+        return None
+    return re.compile(_alternation(active)).search
+
+
+ExclusionPredicate = Callable[[dict[str, Any]], bool]
+
+
+def build_exclusion(
+    subcategories: Iterable[str],
+    productnames: Iterable[str],
+    quota_metadata: Iterable[str],
+) -> ExclusionPredicate | None:
+    """Gabungkan semua pola exclusion jadi satu predicate per produk.
+
+    Returns None jika tidak ada exclusion aktif (skip cek per produk).
+    """
+    active_subcategories = frozenset(s for s in subcategories if s)
+    excluded_subcategories = active_subcategories or None
+    name_matcher = compile_prefix_matcher(tuple(productnames))
+    quota_matcher = compile_substring_matcher(tuple(quota_metadata))
+    if (
+        excluded_subcategories is None
+        and name_matcher is None
+        and quota_matcher is None
+    ):
+        return None
+
+    def is_excluded(product: dict[str, Any]) -> bool:
+        if (
+            excluded_subcategories is not None
+            and product.get("productSubCategory", "") in excluded_subcategories
+        ):
+            return True
+        if name_matcher is not None and name_matcher(product.get("productName", "")):
+            return True
+        return quota_matcher is not None and bool(
+            quota_matcher(product.get("quota", ""))
+        )
+
+    return is_excluded
+
+
+@dataclass(frozen=True)
+class RuleSpec:
+    """Rules mentah (belum di-compile) untuk satu processor/category."""
+
+    exclude_subcategories: tuple[str, ...] = ()
+    exclude_productnames: tuple[str, ...] = ()
+    exclude_quota_metadata: tuple[str, ...] = ()
+    unit_suffixes: tuple[tuple[str, str], ...] = tuple(DEFAULT_UNIT_SUFFIXES.items())
+    word_replacements: tuple[tuple[str, str], ...] = tuple(
+        DEFAULT_WORD_REPLACEMENTS.items()
+    )
+
+    def merged(self, override: Any) -> "RuleSpec":
+        """Timpa field yang di-set (bukan None) oleh override."""
+        changes: dict[str, Any] = {}
+        for field in (
+            "exclude_subcategories",
+            "exclude_productnames",
+            "exclude_quota_metadata",
+        ):
+            value = getattr(override, field, None)
+            if value is not None:
+                changes[field] = tuple(value)
+        for field in ("unit_suffixes", "word_replacements"):
+            value = getattr(override, field, None)
+            if value is not None:
+                changes[field] = tuple(value.items())
+        return replace(self, **changes) if changes else self
+
+
+@dataclass(frozen=True)
+class ProcessorRules:
+    """Rules yang sudah di-compile, siap dipakai satu request."""
+
+    quota_rules: QuotaRuleEngine
+    exclusion: ExclusionPredicate | None
+
+
+@lru_cache(maxsize=64)
+def compile_quota_rules(
+    unit_suffixes: tuple[tuple[str, str], ...],
+    word_replacements: tuple[tuple[str, str], ...],
+) -> QuotaRuleEngine:
+    """QuotaRuleEngine di-share untuk kombinasi unit/word yang sama."""
+    if (
+        dict(unit_suffixes) == DEFAULT_UNIT_SUFFIXES
+        and dict(word_replacements) == DEFAULT_WORD_REPLACEMENTS
+    ):
+        return DEFAULT_QUOTA_RULES
+    return QuotaRuleEngine(dict(unit_suffixes), dict(word_replacements))
+
+
+def compile_rules(spec: RuleSpec) -> ProcessorRules:
+    """Compile `RuleSpec` jadi quota engine + exclusion predicate."""
+    return ProcessorRules(
+        quota_rules=compile_quota_rules(spec.unit_suffixes, spec.word_replacements),
+        exclusion=build_exclusion(
+            spec.exclude_subcategories,
+            spec.exclude_productnames,
+            spec.exclude_quota_metadata,
+        ),
+    )
+
+
+_RULESET_VERSIONS = itertools.count()
+
+
+class ParserRuleSet:
+    """Snapshot immutable dari override rules, dengan versi unik per reload.
+
+    Key override: processor type (RECHARGE, ACTIVATION) atau category (DATA,
+    VF, ...). Urutan merge: default processor -> processor type -> category.
+    """
+
+    def __init__(
+        self, overrides: Mapping[str, Any] | None = None, version: int | None = None
+    ):
+        self.overrides = {k.upper(): v for k, v in (overrides or {}).items()}
+        # version eksplisit: salinan ruleset di worker process
+        self.version = next(_RULESET_VERSIONS) if version is None else version
+        self._compiled: dict[tuple[str, RuleSpec], ProcessorRules] = {}
+
+    def resolve(
+        self, category: str, processor_type: str, defaults: RuleSpec
+    ) -> ProcessorRules:
+        """Compile rules untuk category (di-memo per ruleset)."""
+        key = (category, defaults)
+        rules = self._compiled.get(key)
+        if rules is None:
+            spec = defaults
+            for scope in (processor_type, category):
+                override = self.overrides.get(scope.upper())
+                if override is not None:
+                    spec = spec.merged(override)
+            rules = compile_rules(spec)
+            self._compiled[key] = rules
+        return rules
+
+
+_active_ruleset = ParserRuleSet()
+
+
+def get_active_ruleset() -> ParserRuleSet:
+    """Ruleset yang sedang aktif (snapshot, jangan di-mutate)."""
+    return _active_ruleset
+
+
+def set_active_ruleset(ruleset: ParserRuleSet) -> None:
+    """Swap ruleset aktif (atomic: satu assignment reference)."""
+    global _active_ruleset
+    _active_ruleset = ruleset
@@ -1,10 +1,55 @@
+"""Query builder request Digipos.
+
+Mapping param produk tidak berubah antar reload, jadi per (productid,
+moduleid) dikompilasi sekali menjadi template: nilai literal dan
+`modules.*` sudah di-resolve, tinggal slot `request.*` yang diisi per
+request. Template terikat ke objek product/module sumbernya, jadi objek
+baru hasil reload otomatis memicu compile ulang; `invalidate()` (saat
+digipos.yaml / modules.yaml reload) membuang template lama, semua atau hanya
+product/module yang berubah menurut diff reload.
+"""
+
+import threading
 import uuid
+from collections.abc import Collection
+from dataclasses import dataclass, field
+from typing import Any
 
 from src.domain.digipos.rep_digipos import DigiposProductRepository
+from src.domain.digipos.sch_digipos import DGProductInDB
 from src.domain.module.rep_module import ModuleRepository
+from src.domain.module.sch_module import ModuleInDB
 from src.domain.transaction.sch_transaction import DigiposTrxModel
 from src.mlogg import logger
 
+# placeholder posisi slot request di params (urutan key tetap sama)
+_SLOT = object()
+
+
+@dataclass(frozen=True)
+class QueryTemplate:
+    method: str | None
+    url: str
+    params: dict[str, Any]  # nilai statis + _SLOT untuk slot request
+    slots: tuple[tuple[str, str], ...]  # (param key, atribut request)
+    # objek sumber, untuk validasi cache (identity)
+    product: DGProductInDB | None = field(default=None, compare=False, repr=False)
+    module: ModuleInDB | None = field(default=None, compare=False, repr=False)
+
+    def render(self, trx: DigiposTrxModel) -> dict:
+        params = self.params.copy()
+        for key, attr in self.slots:
+            # generate trxid if requested and None
+            if attr == "trxid" and getattr(trx, "trxid", None) is None:
+                value = str(uuid.uuid4())
+            else:
+                value = getattr(trx, attr)
+            if value is None:
+                del params[key]
+            else:
+                params[key] = value
+        return {"method": self.method, "url": self.url, "params": params}
+
 
 class DigiposQueryBuilder:
     def __init__(
@@ -12,52 +57,135 @@ class DigiposQueryBuilder:
     ):
         self.product_repo = product_repo
         self.module_repo = module_repo
+        self._templates: dict[tuple[str, str], QueryTemplate] = {}
+        self.invalidations = 0
+        self._lock = threading.Lock()
 
-    def _map_param(self, value, module, request):
-        """Map value based on prefix or return literal."""
-        if isinstance(value, str):
-            if value.startswith("modules."):
-                return getattr(module, value.split(".", 1)[1])
-            elif value.startswith("request."):
-                attr = value.split(".", 1)[1]
-                # generate trxid if requested and None
-                if attr == "trxid" and getattr(request, "trxid", None) is None:
-                    return str(uuid.uuid4())
-                return getattr(request, attr)
-            else:
-                return value
-        else:
-            return value
+    def _map_param(self, value: Any, module: ModuleInDB | None) -> Any:
+        """Map `modules.*` value or return literal (`request.*` jadi slot)."""
+        if isinstance(value, str) and value.startswith("modules."):
+            return getattr(module, value.split(".", 1)[1])
+        return value
 
-    def build(self, trx: DigiposTrxModel) -> dict:
-        product = self.product_repo.get_product_by_id(trx.product)
-        module = self.module_repo.get_module_by_id(trx.moduleid)
-        params = {}
-
-        logger.info(
-            f"Building query for trx_id={getattr(trx, 'trxid', None)}, "
-            f"product_id={getattr(trx, 'product', None)}, "
-            f"module_id={getattr(trx, 'moduleid', None)}"
-        )
+    def compile(
+        self, product: DGProductInDB, module: ModuleInDB | None
+    ) -> QueryTemplate:
+        """Compile mapping param produk untuk satu module."""
+        params: dict[str, Any] = {}
+        slots: dict[str, str] = {}
 
-        def process_params(param_dict):
+        def process_params(param_dict: dict[str, Any]) -> None:
             for k, v in param_dict.items():
-                mapped = self._map_param(v, module, trx)
+                if isinstance(v, str) and v.startswith("request."):
+                    params[k] = _SLOT
+                    slots[k] = v.split(".", 1)[1]
+                    continue
+                mapped = self._map_param(v, module)
                 if mapped is not None:
                     params[k] = mapped
+                    slots.pop(k, None)
+
+        if product.required_params:
+            # convert required_params (DGReqParams) ke dict
+            process_params(product.required_params.model_dump())
+        if product.optional_params:
+            process_params(product.optional_params)
+        # Always add json=1 to params
+        params["json"] = 1
+
+        url = f"{module.base_url}{product.api_path}" if module else ""
+        return QueryTemplate(
+            product.method, url, params, tuple(slots.items()), product, module
+        )
+
+    def template_for(self, product: DGProductInDB, module: ModuleInDB) -> QueryTemplate:
+        """Template (cached) dari product + module yang sudah di-resolve.
+
+        Template valid selama objek sumbernya sama (identity): setelah
+        reload repository membuat objek baru, template dikompilasi ulang.
+        """
+        key = (product.productid, module.moduleid)
+        template = self._templates.get(key)
+        if (
+            template is not None
+            and template.product is product
+            and template.module is module
+        ):
+            return template
+
+        template = self.compile(product, module)
+        with self._lock:
+            self._templates[key] = template
+        logger.debug(
+            "Query template compiled",
+            productid=product.productid,
+            moduleid=module.moduleid,
+        )
+        return template
+
+    def get_template(self, productid: str, moduleid: str) -> QueryTemplate | None:
+        """Template untuk product + module by id, None jika product tidak ada."""
+        product = self.product_repo.get_product_by_id(productid)
+        if product is None:
+            return None
+        module = self.module_repo.get_module_by_id(moduleid)
+        if module is None:
+            return self.compile(product, module)
+        return self.template_for(product, module)
+
+    def invalidate(
+        self,
+        productids: Collection[str] | None = None,
+        moduleids: Collection[str] | None = None,
+    ) -> int:
+        """Buang template (dipanggil saat digipos.yaml/modules.yaml reload).
 
-        if product:
-            if hasattr(product, "required_params") and product.required_params:
-                # convert required_params (DGReqParams) ke dict
-                process_params(product.required_params.model_dump())
-            if hasattr(product, "optional_params") and product.optional_params:
-                process_params(product.optional_params)
-            # Always add json=1 to params
-            params["json"] = 1
+        Tanpa argumen semua template dibuang; dengan `productids`/`moduleids`
+        hanya template yang product atau module-nya berubah.
+        """
+        with self._lock:
+            self.invalidations += 1
+            if productids is None and moduleids is None:
+                dropped = len(self._templates)
+                self._templates.clear()
+            else:
+                productids, moduleids = set(productids or ()), set(moduleids or ())
+                stale = [
+                    key
+                    for key in self._templates
+                    if key[0] in productids or key[1] in moduleids
+                ]
+                for key in stale:
+                    del self._templates[key]
+                dropped = len(stale)
+        logger.debug("Query templates invalidated", dropped=dropped)
+        return dropped
 
-        url = f"{module.base_url}{product.api_path}" if module and product else ""
-        method = getattr(product, "method", None) if product else None
+    def build(self, trx: DigiposTrxModel) -> dict:
+        template = self.get_template(trx.product, trx.moduleid)
+        if template is None:
+            result = {"method": None, "url": "", "params": {}}
+        else:
+            result = template.render(trx)
+        self._log_built(trx, result)
+        return result
 
-        result = {"method": method, "url": url, "params": params}
-        logger.info(f"Built query: {result}")
+    def build_resolved(
+        self, trx: DigiposTrxModel, product: DGProductInDB, module: ModuleInDB
+    ) -> dict:
+        """Build query dari product + module hasil otorisasi (tanpa lookup)."""
+        result = self.template_for(product, module).render(trx)
+        self._log_built(trx, result)
         return result
+
+    def _log_built(self, trx: DigiposTrxModel, result: dict) -> None:
+        logger.debug(
+            "Built query",
+            product=trx.product,
+            moduleid=trx.moduleid,
+            method=result["method"],
+            url=result["url"],
+        )
+
+    def stats(self) -> dict:
+        return {"templates": len(self._templates), "invalidations": self.invalidations}
@@ -0,0 +1,26 @@
+from src.service.upstream.srv_breaker import (
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    CircuitState,
+)
+from src.service.upstream.srv_forwarder import UpstreamForwarder
+from src.service.upstream.srv_health import ModuleHealthTracker
+from src.service.upstream.srv_httpclient import UpstreamClientRegistry
+from src.service.upstream.srv_limiter import (
+    ConcurrencyLimiter,
+    ConcurrencyLimiterRegistry,
+)
+from src.service.upstream.srv_retry import RetryPolicy, UpstreamResult
+
+__all__ = [
+    "CircuitBreaker",
+    "CircuitBreakerRegistry",
+    "CircuitState",
+    "ConcurrencyLimiter",
+    "ConcurrencyLimiterRegistry",
+    "ModuleHealthTracker",
+    "RetryPolicy",
+    "UpstreamClientRegistry",
+    "UpstreamForwarder",
+    "UpstreamResult",
+]
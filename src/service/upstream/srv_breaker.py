@@ -0,0 +1,173 @@
+"""Circuit breaker per module upstream.
+
+State:
+- closed    : request normal, hitung kegagalan beruntun
+- open      : fail fast dengan ServiceError sampai `recovery_timeout` lewat
+- half_open : izinkan `half_open_max_calls` request percobaan;
+              sukses -> closed, gagal -> open lagi
+Threshold diambil dari konfigurasi `ModuleInDB` (breaker_*).
+"""
+
+import threading
+import time
+from enum import StrEnum
+
+from src.custom.cst_exceptions import ServiceError
+from src.domain.module.sch_module import ModuleInDB
+from src.mlogg import logger
+
+
+class CircuitState(StrEnum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Circuit breaker untuk satu moduleid."""
+
+    def __init__(
+        self,
+        moduleid: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+    ):
+        self.moduleid = moduleid
+        self.failure_threshold = max(failure_threshold, 1)
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = max(half_open_max_calls, 1)
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._total_failures = 0
+        self._total_rejected = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """State saat ini (open otomatis jadi half_open setelah recovery)."""
+        if (
+            self._state == CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self.recovery_timeout
+        ):
+            self._transition(CircuitState.HALF_OPEN)
+        return self._state
+
+    def _transition(self, state: CircuitState) -> None:
+        if state == self._state:
+            return
+        logger.warning(
+            "Circuit breaker state changed",
+            moduleid=self.moduleid,
+            old=str(self._state),
+            new=str(state),
+        )
+        self._state = state
+        if state == CircuitState.OPEN:
+            self._opened_at = time.monotonic()
+        if state == CircuitState.HALF_OPEN:
+            self._half_open_calls = 0
+        if state == CircuitState.CLOSED:
+            self._failures = 0
+
+    def before_call(self) -> None:
+        """Cek apakah request boleh diteruskan, raise ServiceError jika tidak."""
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return
+        if (
+            state == CircuitState.HALF_OPEN
+            and self._half_open_calls < self.half_open_max_calls
+        ):
+            self._half_open_calls += 1
+            return
+        self._total_rejected += 1
+        retry_after = max(
+            self.recovery_timeout - (time.monotonic() - self._opened_at), 0.0
+        )
+        raise ServiceError(
+            "Circuit open, upstream module unavailable",
+            context={
+                "moduleid": self.moduleid,
+                "state": str(state),
+                "retry_after": round(retry_after, 2),
+            },
+        )
+
+    def record_success(self) -> None:
+        self._release_half_open()
+        if self._state == CircuitState.HALF_OPEN:
+            self._transition(CircuitState.CLOSED)
+        self._failures = 0
+
+    def record_failure(self) -> None:
+        self._release_half_open()
+        self._total_failures += 1
+        if self._state == CircuitState.HALF_OPEN:
+            self._transition(CircuitState.OPEN)
+            return
+        self._failures += 1
+        if self._failures >= self.failure_threshold:
+            self._transition(CircuitState.OPEN)
+
+    def release(self) -> None:
+        """Lepas slot half-open tanpa mencatat hasil (mis. request dibatalkan)."""
+        self._release_half_open()
+
+    def _release_half_open(self) -> None:
+        if self._state == CircuitState.HALF_OPEN and self._half_open_calls > 0:
+            self._half_open_calls -= 1
+
+    def snapshot(self) -> dict:
+        state = self.state
+        return {
+            "state": str(state),
+            "consecutive_failures": self._failures,
+            "failure_threshold": self.failure_threshold,
+            "recovery_timeout": self.recovery_timeout,
+            "half_open_calls": self._half_open_calls,
+            "total_failures": self._total_failures,
+            "total_rejected": self._total_rejected,
+        }
+
+
+def _breaker_config(module: ModuleInDB) -> tuple[int, float, int]:
+    return (
+        module.breaker_failure_threshold,
+        module.breaker_recovery_timeout,
+        module.breaker_half_open_max_calls,
+    )
+
+
+class CircuitBreakerRegistry:
+    """Registry circuit breaker per moduleid."""
+
+    def __init__(self) -> None:
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, module: ModuleInDB) -> CircuitBreaker:
+        """Ambil breaker module; threshold disinkronkan dengan config terbaru."""
+        breaker = self._breakers.get(module.moduleid)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(
+                    module.moduleid,
+                    CircuitBreaker(module.moduleid, *_breaker_config(module)),
+                )
+        threshold, recovery, half_open = _breaker_config(module)
+        breaker.failure_threshold = max(threshold, 1)
+        breaker.recovery_timeout = recovery
+        breaker.half_open_max_calls = max(half_open, 1)
+        return breaker
+
+    def is_open(self, moduleid: str) -> bool:
+        """True jika breaker module sedang open (belum boleh dicoba)."""
+        breaker = self._breakers.get(moduleid)
+        return breaker is not None and breaker.state == CircuitState.OPEN
+
+    def stats(self) -> dict[str, dict]:
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {mid: b.snapshot() for mid, b in breakers.items()}
@@ -0,0 +1,173 @@
+"""Upstream forwarder.
+
+Satu pintu untuk semua request ke upstream module:
+circuit breaker -> concurrency limiter (antrian) -> client pool (per module)
+-> retry/backoff dalam deadline `module.timeout`.
+
+Routing mode `failover`: module kandidat diurutkan berdasarkan health
+(EWMA latency, error rate, in-flight), lalu dicoba berurutan selama
+kegagalan aman untuk diulang di module lain. Module lain = akun lain:
+request yang mungkin sudah dieksekusi upstream hanya dipindah untuk
+product `idempotent`, supaya pembelian tidak terkirim dua kali.
+"""
+
+import asyncio
+import time
+from collections.abc import Callable
+
+from src.custom.cst_exceptions import ServiceError, UpstreamError
+from src.domain.module.sch_module import ModuleInDB
+from src.mlogg import logger
+from src.service.upstream.srv_breaker import CircuitBreakerRegistry
+from src.service.upstream.srv_health import ModuleHealthTracker
+from src.service.upstream.srv_httpclient import UpstreamClientRegistry
+from src.service.upstream.srv_limiter import ConcurrencyLimiterRegistry
+from src.service.upstream.srv_retry import (
+    NOT_SENT_ERRORS,
+    BodyConsumer,
+    UpstreamResult,
+    send_with_retry,
+)
+
+
+def is_failover_safe(error: Exception, idempotent: bool = False) -> bool:
+    """Cek apakah kegagalan boleh dicoba ulang di module lain.
+
+    - ServiceError (breaker open / antrian penuh): request belum terkirim
+    - Request tidak pernah sampai ke upstream (connect / pool error)
+    - Selain itu hanya product `idempotent` (opt-in, apa pun method-nya)
+    """
+    if isinstance(error, ServiceError) or idempotent:
+        return True
+    return isinstance(error.__cause__, NOT_SENT_ERRORS)
+
+
+class UpstreamForwarder:
+    """Forward request ke upstream module: breaker, limiter, pooled client, retry."""
+
+    def __init__(
+        self,
+        clients: UpstreamClientRegistry,
+        breakers: CircuitBreakerRegistry | None = None,
+        limiters: ConcurrencyLimiterRegistry | None = None,
+        health: ModuleHealthTracker | None = None,
+    ):
+        self.clients = clients
+        self.breakers = breakers or CircuitBreakerRegistry()
+        self.limiters = limiters or ConcurrencyLimiterRegistry()
+        self.health = health or ModuleHealthTracker()
+
+    async def forward(
+        self,
+        module: ModuleInDB,
+        method: str,
+        url: str,
+        params: dict,
+        consumer: BodyConsumer | None = None,
+        idempotent: bool = False,
+    ) -> UpstreamResult:
+        """Kirim request ke upstream module dan kembalikan hasil + info retry.
+
+        `consumer` menerima body response sukses per chunk (streaming).
+        `idempotent`: request yang sudah terkirim boleh di-retry (lihat srv_retry).
+
+        Raises:
+            ServiceError: Circuit breaker open atau antrian module penuh/timeout
+            UpstreamError: Upstream gagal setelah semua retry
+            UpstreamTimeoutError: Deadline `module.timeout` terlewati
+            UpstreamResponseTooLargeError: Body melewati `module.max_body_size`
+        """
+        breaker = self.breakers.get(module)
+        if self.breakers.is_open(module.moduleid):
+            # fail fast tanpa ikut antri
+            breaker.before_call()
+
+        async with self.limiters.get(module).slot() as queue_wait:
+            breaker.before_call()
+            self.health.start(module.moduleid)
+            start = time.monotonic()
+            success = False
+            try:
+                client = await self.clients.acquire(module)
+                result = await send_with_retry(
+                    client, module, method, url, params, consumer, idempotent
+                )
+                success = result.response.status_code < 500
+            except UpstreamError:
+                breaker.record_failure()
+                raise
+            except (asyncio.CancelledError, Exception):
+                breaker.release()
+                raise
+            finally:
+                self.health.finish(module.moduleid, time.monotonic() - start, success)
+
+        if success:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+        result.queue_wait = queue_wait
+        result.moduleid = module.moduleid
+        return result
+
+    def rank_modules(self, modules: list[ModuleInDB]) -> list[ModuleInDB]:
+        """Urutkan kandidat: breaker open paling belakang, sisanya by health."""
+        ranked = self.health.rank(modules)
+        return [m for m in ranked if not self.breakers.is_open(m.moduleid)] + [
+            m for m in ranked if self.breakers.is_open(m.moduleid)
+        ]
+
+    async def forward_with_failover(
+        self,
+        modules: list[ModuleInDB],
+        build_query: Callable[[ModuleInDB], dict],
+        consumer: BodyConsumer | None = None,
+        idempotent: bool = False,
+    ) -> tuple[ModuleInDB, dict, UpstreamResult]:
+        """Forward ke module tersehat, failover ke kandidat berikutnya jika gagal.
+
+        Args:
+            modules: Kandidat module (urutan awal dipakai sebagai tie-breaker)
+            build_query: Fungsi pembuat query (`method`, `url`, `params`) per module
+            consumer: Penerima body streaming (di-reset tiap module dicoba)
+            idempotent: Request yang sudah terkirim (timeout baca / 5xx) boleh
+                diulang di module lain; default hanya kegagalan sebelum terkirim
+
+        Returns:
+            Tuple (module terpilih, query yang dikirim, hasil upstream)
+        """
+        if not modules:
+            raise ServiceError("Tidak ada module kandidat untuk failover")
+
+        ranked = self.rank_modules(modules)
+        for index, module in enumerate(ranked):
+            query = build_query(module)
+            method = str(query["method"]).upper()
+            is_last = index == len(ranked) - 1
+            try:
+                result = await self.forward(
+                    module, method, query["url"], query["params"], consumer, idempotent
+                )
+            except (ServiceError, UpstreamError) as e:
+                if is_last or not is_failover_safe(e, idempotent):
+                    raise
+                logger.warning(
+                    "Upstream module failed, failing over",
+                    moduleid=module.moduleid,
+                    error=e.message,
+                )
+                continue
+
+            if not is_last and idempotent and result.response.status_code >= 500:
+                logger.warning(
+                    "Upstream module returned error status, failing over",
+                    moduleid=module.moduleid,
+                    status=result.response.status_code,
+                )
+                await result.response.aclose()
+                continue
+
+            result.failovers = index
+            return module, query, result
+
+        raise ServiceError("Semua module kandidat gagal")  # pragma: no cover
@@ -0,0 +1,81 @@
+"""Live health tracking per module upstream.
+
+Dipakai routing mode `failover` untuk memilih module tercepat/tersehat dari
+`DGProductInDB.list_modules`:
+- EWMA latency (ms) semua request
+- EWMA error rate (0..1)
+- Jumlah request in-flight (least-loaded)
+"""
+
+import threading
+from dataclasses import dataclass
+
+from src.domain.module.sch_module import ModuleInDB
+
+EWMA_ALPHA = 0.2
+# error dihitung setara request selambat ini (ms) saat ranking
+ERROR_PENALTY_MS = 5000.0
+
+
+@dataclass
+class ModuleHealth:
+    latency_ms: float = 0.0
+    error_rate: float = 0.0
+    inflight: int = 0
+    samples: int = 0
+
+    def score(self) -> float:
+        """Skor routing, makin kecil makin baik."""
+        penalty = ERROR_PENALTY_MS * self.error_rate
+        return (self.latency_ms + penalty + 1.0) * (1 + self.inflight)
+
+
+class ModuleHealthTracker:
+    """Kumpulan `ModuleHealth` per moduleid."""
+
+    def __init__(self, alpha: float = EWMA_ALPHA):
+        self.alpha = alpha
+        self._health: dict[str, ModuleHealth] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, moduleid: str) -> ModuleHealth:
+        health = self._health.get(moduleid)
+        if health is None:
+            with self._lock:
+                health = self._health.setdefault(moduleid, ModuleHealth())
+        return health
+
+    def start(self, moduleid: str) -> None:
+        self._get(moduleid).inflight += 1
+
+    def finish(self, moduleid: str, latency: float, success: bool) -> None:
+        """Catat hasil request (latency dalam detik)."""
+        health = self._get(moduleid)
+        health.inflight = max(health.inflight - 1, 0)
+        error = 0.0 if success else 1.0
+        latency_ms = latency * 1000
+        if health.samples == 0:
+            health.error_rate = error
+            health.latency_ms = latency_ms
+        else:
+            health.error_rate += self.alpha * (error - health.error_rate)
+            health.latency_ms += self.alpha * (latency_ms - health.latency_ms)
+        health.samples += 1
+
+    def rank(self, modules: list[ModuleInDB]) -> list[ModuleInDB]:
+        """Urutkan module dari skor terbaik (stabil untuk skor sama)."""
+        return sorted(modules, key=lambda m: self._get(m.moduleid).score())
+
+    def stats(self) -> dict[str, dict]:
+        with self._lock:
+            health = dict(self._health)
+        return {
+            mid: {
+                "latency_ms": round(h.latency_ms, 2),
+                "error_rate": round(h.error_rate, 4),
+                "inflight": h.inflight,
+                "samples": h.samples,
+                "score": round(h.score(), 2),
+            }
+            for mid, h in health.items()
+        }
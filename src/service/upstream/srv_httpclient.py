@@ -0,0 +1,152 @@
+"""Upstream HTTP client registry.
+
+Satu `httpx.AsyncClient` (keep-alive connection pool) per module:
+- Pool size dan timeout diambil dari konfigurasi `ModuleInDB`
+- Client dibuat lazy saat pertama kali dipakai
+- `rebuild()` dipanggil saat modules.yaml reload, client lama di-retire
+- Client yang di-retire ditutup dari event loop (bukan dari thread watcher)
+  setelah grace period `timeout` module, supaya request in-flight selesai dulu
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+
+import httpx
+
+from src.domain.module.sch_module import ModuleInDB
+from src.mlogg import logger
+
+
+def _module_signature(module: ModuleInDB) -> tuple:
+    """Field module yang mempengaruhi konfigurasi client."""
+    return (
+        module.base_url,
+        module.timeout,
+        module.max_connections,
+        module.max_keepalive_connections,
+        module.keepalive_expiry,
+    )
+
+
+@dataclass(frozen=True)
+class _PooledClient:
+    signature: tuple
+    client: httpx.AsyncClient
+
+
+class UpstreamClientRegistry:
+    """Registry `httpx.AsyncClient` per moduleid."""
+
+    def __init__(self) -> None:
+        self._clients: dict[str, _PooledClient] = {}
+        # (deadline monotonic, client) -> ditutup setelah deadline lewat
+        self._retired: list[tuple[float, httpx.AsyncClient]] = []
+        self._lock = threading.Lock()
+
+    def _create_client(self, module: ModuleInDB) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=module.max_connections,
+            max_keepalive_connections=module.max_keepalive_connections,
+            keepalive_expiry=module.keepalive_expiry,
+        )
+        logger.info(
+            "Creating upstream client",
+            moduleid=module.moduleid,
+            max_connections=module.max_connections,
+            timeout=module.timeout,
+        )
+        return httpx.AsyncClient(timeout=module.timeout, limits=limits)
+
+    def _retire(self, pooled: _PooledClient) -> None:
+        """Pindahkan client ke daftar retired (caller memegang lock)."""
+        grace = float(pooled.signature[1])
+        self._retired.append((time.monotonic() + grace, pooled.client))
+
+    def get_client(self, module: ModuleInDB) -> httpx.AsyncClient:
+        """Ambil client untuk module, buat baru jika belum ada / config berubah."""
+        signature = _module_signature(module)
+        pooled = self._clients.get(module.moduleid)
+        if pooled is not None and pooled.signature == signature:
+            return pooled.client
+
+        with self._lock:
+            pooled = self._clients.get(module.moduleid)
+            if pooled is not None and pooled.signature == signature:
+                return pooled.client
+            if pooled is not None:
+                self._retire(pooled)
+            client = self._create_client(module)
+            self._clients[module.moduleid] = _PooledClient(signature, client)
+            return client
+
+    def rebuild(self, modules: list[ModuleInDB]) -> None:
+        """Sinkronkan registry dengan data module terbaru (dipanggil saat reload).
+
+        Client untuk module yang dihapus, non-aktif, atau berubah konfigurasi
+        dipindah ke daftar retired; client baru dibuat lazy saat request berikutnya.
+        """
+        current = {m.moduleid: _module_signature(m) for m in modules if m.is_active}
+        with self._lock:
+            for moduleid in list(self._clients):
+                pooled = self._clients[moduleid]
+                if current.get(moduleid) != pooled.signature:
+                    self._retire(pooled)
+                    del self._clients[moduleid]
+        logger.info(
+            "Upstream client registry rebuilt",
+            active=len(self._clients),
+            retired=len(self._retired),
+        )
+
+    async def acquire(self, module: ModuleInDB) -> httpx.AsyncClient:
+        """Versi async `get_client`, sekalian membersihkan client retired."""
+        if self._retired:
+            await self.aclose_retired()
+        return self.get_client(module)
+
+    async def aclose_retired(self, force: bool = False) -> None:
+        """Tutup client retired yang grace period-nya lewat (harus dari event loop)."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [c for d, c in self._retired if force or d <= now]
+            self._retired = [
+                (d, c) for d, c in self._retired if not (force or d <= now)
+            ]
+        for client in expired:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.error("Failed to close retired upstream client", error=str(e))
+
+    async def aclose(self) -> None:
+        """Tutup semua client (dipanggil saat shutdown)."""
+        with self._lock:
+            for pooled in self._clients.values():
+                self._retire(pooled)
+            self._clients.clear()
+        await self.aclose_retired(force=True)
+        logger.info("Upstream client registry closed")
+
+    @staticmethod
+    def _pool_stats(client: httpx.AsyncClient) -> dict:
+        """Statistik connection pool httpcore (open, idle, active, waiting)."""
+        pool = getattr(getattr(client, "_transport", None), "_pool", None)
+        connections = list(getattr(pool, "connections", []))
+        requests = list(getattr(pool, "_requests", []))
+        idle = sum(1 for c in connections if c.is_idle())
+        waiting = sum(1 for r in requests if r.is_queued())
+        return {
+            "open": len(connections),
+            "idle": idle,
+            "active": len(connections) - idle,
+            "waiting": waiting,
+        }
+
+    def stats(self) -> dict[str, dict]:
+        """Statistik pool per moduleid."""
+        with self._lock:
+            clients = dict(self._clients)
+            retired = len(self._retired)
+        result = {mid: self._pool_stats(p.client) for mid, p in clients.items()}
+        return {"modules": result, "retired": retired}
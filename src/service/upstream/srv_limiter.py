@@ -0,0 +1,171 @@
+"""Concurrency limiter + admission queue per module upstream.
+
+- Maksimal `max_concurrency` request paralel ke satu module
+- Request berikutnya antri maksimal `max_queue`, menunggu `queue_timeout` detik
+- Antrian penuh / timeout -> ServiceError (503)
+Limit diambil dari konfigurasi `ModuleInDB` (modules.yaml).
+"""
+
+import asyncio
+import threading
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from src.custom.cst_exceptions import ServiceError
+from src.domain.module.sch_module import ModuleInDB
+from src.mlogg import logger
+
+
+class ConcurrencyLimiter:
+    """Semaphore dengan antrian terbatas untuk satu moduleid."""
+
+    def __init__(
+        self,
+        moduleid: str,
+        max_concurrency: int = 10,
+        max_queue: int = 50,
+        queue_timeout: float = 5.0,
+    ):
+        self.moduleid = moduleid
+        self.max_concurrency = max(max_concurrency, 1)
+        self.max_queue = max(max_queue, 0)
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._active = 0
+        self._waiting = 0
+        self._max_waiting = 0
+        self._admitted = 0
+        self._queued = 0
+        self._rejected = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    @property
+    def config(self) -> tuple[int, int, float]:
+        return (self.max_concurrency, self.max_queue, self.queue_timeout)
+
+    def _reject(self, message: str) -> ServiceError:
+        return ServiceError(
+            message,
+            context={
+                "moduleid": self.moduleid,
+                "active": self._active,
+                "waiting": self._waiting,
+                "max_concurrency": self.max_concurrency,
+                "max_queue": self.max_queue,
+            },
+        )
+
+    async def acquire(self) -> float:
+        """Ambil slot; kembalikan lama menunggu di antrian (detik).
+
+        Raises:
+            ServiceError: Antrian penuh atau menunggu melebihi `queue_timeout`
+        """
+        if not self._semaphore.locked() and self._waiting == 0:
+            await self._semaphore.acquire()
+            self._active += 1
+            self._admitted += 1
+            return 0.0
+
+        if self._waiting >= self.max_queue:
+            self._rejected += 1
+            logger.warning(
+                "Upstream queue full, rejecting request", moduleid=self.moduleid
+            )
+            raise self._reject("Upstream module busy, queue full")
+
+        self._waiting += 1
+        self._queued += 1
+        self._max_waiting = max(self._max_waiting, self._waiting)
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except TimeoutError:
+            self._timeouts += 1
+            logger.warning(
+                "Upstream queue wait timed out",
+                moduleid=self.moduleid,
+                queue_timeout=self.queue_timeout,
+            )
+            raise self._reject("Upstream module busy, queue timeout") from None
+        finally:
+            self._waiting -= 1
+            waited = time.monotonic() - start
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+
+        self._active += 1
+        self._admitted += 1
+        return waited
+
+    def release(self) -> None:
+        self._active -= 1
+        self._semaphore.release()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[float]:
+        """Context manager slot upstream, yield lama menunggu antrian (detik)."""
+        waited = await self.acquire()
+        try:
+            yield waited
+        finally:
+            self.release()
+
+    def snapshot(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "queue_timeout": self.queue_timeout,
+            "active": self._active,
+            "queue_depth": self._waiting,
+            "max_queue_depth": self._max_waiting,
+            "admitted": self._admitted,
+            "queued": self._queued,
+            "rejected": self._rejected,
+            "timeouts": self._timeouts,
+            "wait_avg_ms": round(self._wait_total / self._queued * 1000, 2)
+            if self._queued
+            else 0.0,
+            "wait_max_ms": round(self._wait_max * 1000, 2),
+        }
+
+
+def _limiter_config(module: ModuleInDB) -> tuple[int, int, float]:
+    return (
+        max(module.max_concurrency, 1),
+        max(module.max_queue, 0),
+        module.queue_timeout,
+    )
+
+
+class ConcurrencyLimiterRegistry:
+    """Registry concurrency limiter per moduleid."""
+
+    def __init__(self) -> None:
+        self._limiters: dict[str, ConcurrencyLimiter] = {}
+        self._lock = threading.Lock()
+
+    def get(self, module: ModuleInDB) -> ConcurrencyLimiter:
+        """Ambil limiter module; dibuat ulang jika limit di modules.yaml berubah.
+
+        Request yang sedang memegang slot limiter lama tetap release ke limiter
+        lama, jadi penggantian aman tanpa menunggu drain.
+        """
+        config = _limiter_config(module)
+        limiter = self._limiters.get(module.moduleid)
+        if limiter is not None and limiter.config == config:
+            return limiter
+        with self._lock:
+            limiter = self._limiters.get(module.moduleid)
+            if limiter is None or limiter.config != config:
+                limiter = ConcurrencyLimiter(module.moduleid, *config)
+                self._limiters[module.moduleid] = limiter
+            return limiter
+
+    def stats(self) -> dict[str, dict]:
+        with self._lock:
+            limiters = dict(self._limiters)
+        return {mid: lim.snapshot() for mid, lim in limiters.items()}
@@ -0,0 +1,263 @@
+"""Retry/backoff engine untuk forwarding ke upstream.
+
+Aturan retry:
+- Error sebelum request sampai ke upstream (connect / pool timeout) -> retry
+  untuk semua method
+- Error setelah request terkirim (read timeout, 502/503/504) -> retry hanya
+  untuk product yang ditandai `idempotent` (mis. cek catalog). Default tidak:
+  transaksi pembelian yang mungkin sudah dieksekusi upstream tidak dikirim
+  ulang, apa pun HTTP method-nya
+- Backoff: full jitter, base `module.second_wait` dikali 2^(attempt-1)
+- Deadline per request = `module.timeout` untuk seluruh attempt (kirim +
+  baca body + backoff); timeout httpx sendiri hanya per operasi
+
+Body response dibaca streaming dengan batas `module.max_body_size`; body
+yang melewati batas dibatalkan tanpa dibaca sampai habis.
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import Protocol
+
+import httpx
+
+from src.custom.cst_exceptions import (
+    UpstreamError,
+    UpstreamResponseTooLargeError,
+    UpstreamTimeoutError,
+)
+from src.domain.module.sch_module import ModuleInDB
+from src.mlogg import logger
+
+# Error yang terjadi sebelum request terkirim ke upstream
+NOT_SENT_ERRORS: tuple[type[Exception], ...] = (
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.PoolTimeout,
+)
+# Error transport setelah request (mungkin) sudah sampai ke upstream
+SENT_ERRORS: tuple[type[Exception], ...] = (
+    httpx.ReadTimeout,
+    httpx.WriteTimeout,
+    httpx.ReadError,
+    httpx.WriteError,
+    httpx.RemoteProtocolError,
+)
+RETRYABLE_STATUS = frozenset({502, 503, 504})
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_retries: int
+    base_wait: float
+    deadline: float
+
+    @classmethod
+    def from_module(cls, module: ModuleInDB) -> "RetryPolicy":
+        return cls(
+            max_retries=max(module.max_retries, 0),
+            base_wait=max(float(module.second_wait), 0.0),
+            deadline=float(module.timeout),
+        )
+
+    def backoff(self, attempt: int) -> float:
+        """Full jitter backoff untuk attempt ke-n (mulai dari 1)."""
+        if self.base_wait <= 0:
+            return 0.0
+        return random.uniform(0, self.base_wait * (2 ** (attempt - 1)))
+
+
+class BodyConsumer(Protocol):
+    """Penerima body response sukses per chunk (mis. parser streaming)."""
+
+    def feed(self, chunk: bytes) -> None: ...
+
+    def reset(self) -> None: ...
+
+
+@dataclass
+class UpstreamResult:
+    response: httpx.Response  # sudah ditutup, body ada di `body`
+    body: bytes = b""  # kosong jika body dialirkan ke consumer
+    attempts: int = 1
+    retry_wait: float = 0.0  # total detik menunggu backoff
+    elapsed: float = 0.0  # total detik termasuk retry
+    queue_wait: float = 0.0  # detik menunggu di antrian limiter
+    moduleid: str = ""  # module yang melayani request
+    failovers: int = 0  # jumlah module yang dilewati (routing failover)
+
+    @property
+    def retries(self) -> int:
+        return self.attempts - 1
+
+
+def is_retryable_error(error: Exception, idempotent: bool = False) -> bool:
+    """Cek apakah exception transport boleh di-retry."""
+    if isinstance(error, NOT_SENT_ERRORS):
+        return True
+    return idempotent and isinstance(error, SENT_ERRORS)
+
+
+def is_retryable_status(status_code: int, idempotent: bool = False) -> bool:
+    """Cek apakah status response boleh di-retry (request sudah diterima)."""
+    return idempotent and status_code in RETRYABLE_STATUS
+
+
+def body_too_large(module: ModuleInDB, size: int) -> UpstreamResponseTooLargeError:
+    """Error untuk body yang melewati `module.max_body_size`."""
+    return UpstreamResponseTooLargeError(
+        f"Upstream response exceeds {module.max_body_size} bytes",
+        context={
+            "moduleid": module.moduleid,
+            "max_body_size": module.max_body_size,
+            "size": size,
+        },
+    )
+
+
+def feed_consumer(
+    consumer: BodyConsumer, chunk: bytes, module: ModuleInDB, status: int
+) -> None:
+    """Alirkan chunk ke consumer; ValueError (body rusak) jadi UpstreamError."""
+    try:
+        consumer.feed(chunk)
+    except ValueError as e:
+        raise UpstreamError(
+            "Upstream returned a non-JSON response",
+            context={"moduleid": module.moduleid, "status": status},
+            cause=e,
+        ) from e
+
+
+async def read_body(
+    response: httpx.Response,
+    module: ModuleInDB,
+    consumer: BodyConsumer | None = None,
+) -> bytes:
+    """Baca body streaming dengan batas `module.max_body_size`.
+
+    Jika `consumer` diberikan, chunk dialirkan ke consumer dan tidak
+    disimpan (return b"").
+
+    Raises:
+        UpstreamResponseTooLargeError: Body melewati `module.max_body_size`
+        UpstreamError: Consumer menolak body (mis. bukan JSON / UTF-8 valid)
+    """
+    limit = module.max_body_size
+    try:
+        declared = response.headers.get("content-length", "")
+        if limit > 0 and declared.isdigit() and int(declared) > limit:
+            raise body_too_large(module, int(declared))
+
+        chunks: list[bytes] = []
+        size = 0
+        if consumer is not None:
+            consumer.reset()
+        async for chunk in response.aiter_bytes():
+            size += len(chunk)
+            if limit > 0 and size > limit:
+                raise body_too_large(module, size)
+            if consumer is not None:
+                feed_consumer(consumer, chunk, module, response.status_code)
+            else:
+                chunks.append(chunk)
+        return b"".join(chunks)
+    finally:
+        await response.aclose()
+
+
+async def send_with_retry(
+    client: httpx.AsyncClient,
+    module: ModuleInDB,
+    method: str,
+    url: str,
+    params: dict,
+    consumer: BodyConsumer | None = None,
+    idempotent: bool = False,
+) -> UpstreamResult:
+    """Kirim request ke upstream dengan retry + backoff dalam batas deadline.
+
+    Body response sukses (status < 400) dialirkan ke `consumer` jika ada;
+    partial state consumer di-reset setiap kali body dibaca ulang.
+    `idempotent`: request yang sudah terkirim boleh dikirim ulang.
+
+    Raises:
+        UpstreamTimeoutError: Deadline `module.timeout` terlewati
+        UpstreamError: Upstream gagal setelah semua retry
+    """
+    method = method.upper()
+    policy = RetryPolicy.from_module(module)
+    start = time.monotonic()
+    deadline = start + policy.deadline
+    retry_wait = 0.0
+    attempt = 0
+    request_kwargs = {"params": params} if method == "GET" else {"json": params}
+
+    while True:
+        attempt += 1
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise UpstreamTimeoutError(
+                "Upstream deadline exceeded",
+                context={"moduleid": module.moduleid, "attempts": attempt - 1},
+            )
+        try:
+            # timeout httpx per operasi (tiap read); batas total attempt di sini
+            async with asyncio.timeout(remaining):
+                request = client.build_request(
+                    method, url, timeout=remaining, **request_kwargs
+                )
+                response = await client.send(request, stream=True)
+                if attempt <= policy.max_retries and is_retryable_status(
+                    response.status_code, idempotent
+                ):
+                    await response.aclose()
+                    reason = f"status {response.status_code}"
+                else:
+                    body = await read_body(
+                        response,
+                        module,
+                        consumer if response.status_code < 400 else None,
+                    )
+                    return UpstreamResult(
+                        response=response,
+                        body=body,
+                        attempts=attempt,
+                        retry_wait=retry_wait,
+                        elapsed=time.monotonic() - start,
+                    )
+        except TimeoutError as e:
+            raise UpstreamTimeoutError(
+                "Upstream deadline exceeded",
+                context={"moduleid": module.moduleid, "attempts": attempt},
+                cause=e,
+            ) from e
+        except httpx.HTTPError as e:
+            if attempt > policy.max_retries or not is_retryable_error(e, idempotent):
+                context = {"moduleid": module.moduleid, "attempts": attempt}
+                if isinstance(e, httpx.TimeoutException):
+                    raise UpstreamTimeoutError(context=context, cause=e) from e
+                raise UpstreamError(
+                    f"Upstream request failed: {e.__class__.__name__}",
+                    context=context,
+                    cause=e,
+                ) from e
+            reason = e.__class__.__name__
+
+        wait = min(policy.backoff(attempt), deadline - time.monotonic())
+        if wait < 0:
+            raise UpstreamTimeoutError(
+                "Upstream deadline exceeded",
+                context={"moduleid": module.moduleid, "attempts": attempt},
+            )
+        logger.warning(
+            "Retrying upstream request",
+            moduleid=module.moduleid,
+            attempt=attempt,
+            reason=reason,
+            wait=round(wait, 3),
+        )
+        await asyncio.sleep(wait)
+        retry_wait += wait
@@ -0,0 +1,77 @@
+import pytest
+from src.custom.cst_exceptions import MemberInvalidSignatureError
+from src.domain.member.sch_member import MemberInDB
+from src.domain.transaction.sch_transaction import TrxBaseModel
+from src.service.auth.srv_memberauth import MemberAuthService
+from src.service.auth.srv_signature import OtomaxSignatureService
+
+
+class FakeMembers:
+    def __init__(self, member):
+        self.member = member
+
+    def get_member_by_id(self, memberid):
+        return self.member if memberid == self.member.memberid else None
+
+
+def make_member(pin="123456", password="password123"):
+    return MemberInDB(
+        memberid="M12345",
+        name="John Doe",
+        pin=pin,
+        password=password,
+        is_active=True,
+        ipaddress="192.168.1.1",
+        report_url="http://example.com/report",
+        allow_nosign=False,
+    )
+
+
+def signed_request(pin="123456", password="password123", **overrides):
+    data = {"memberid": "M12345", "product": "DATA01", "dest": "0812", "refid": "R1"}
+    data.update(overrides)
+    sign = OtomaxSignatureService.generate_transaction_signature(
+        data["memberid"], data["product"], data["dest"], data["refid"], pin, password
+    )
+    return TrxBaseModel(**data, sign=sign)
+
+
+@pytest.fixture
+def spy_generate(mocker):
+    return mocker.spy(OtomaxSignatureService, "generate_transaction_signature")
+
+
+def test_valid_signature_computed_once_per_request(spy_generate):
+    service = MemberAuthService(FakeMembers(make_member()))
+    request = signed_request()
+    spy_generate.reset_mock()
+    service.authenticate_and_verify(request)
+    service.authenticate_and_verify(request)
+    assert spy_generate.call_count == 2
+
+
+def test_invalid_signature_computed_once_per_request(spy_generate):
+    service = MemberAuthService(FakeMembers(make_member()))
+    request = signed_request().model_copy(update={"sign": "bogus"})
+    spy_generate.reset_mock()
+    with pytest.raises(MemberInvalidSignatureError):
+        service.authenticate_and_verify(request)
+    assert spy_generate.call_count == 1
+
+
+def test_non_ascii_signature_rejected_without_type_error():
+    service = MemberAuthService(FakeMembers(make_member()))
+    request = signed_request().model_copy(update={"sign": "tandatangan-é"})
+    with pytest.raises(MemberInvalidSignatureError):
+        service.authenticate_and_verify(request)
+
+
+def test_credential_change_rejects_old_signature():
+    members = FakeMembers(make_member())
+    service = MemberAuthService(members)
+    request = signed_request()
+    service.authenticate_and_verify(request)
+
+    members.member = make_member(pin="654321")
+    with pytest.raises(MemberInvalidSignatureError):
+        service.authenticate_and_verify(request)
@@ -0,0 +1,93 @@
+import pytest
+from src.custom.cst_exceptions import (
+    MemberInvalidSignatureError,
+    ModuleNotFoundError,
+    ProductNotFoundError,
+)
+from src.domain.digipos.rep_digipos import DigiposProductRepository
+from src.domain.member.rep_member import MemberRepository
+from src.domain.module.rep_module import ModuleRepository
+from src.domain.transaction.sch_transaction import DigiposTrxModel
+from src.service.auth import (
+    MemberAuthService,
+    ModuleAuthService,
+    TransactionAuthService,
+)
+from src.service.auth.srv_dgproductauth import DigiposProductAuthService
+from src.service.srv_querybuilder import DigiposQueryBuilder
+from tests.loadtest.fixtures import write_fixtures
+from tests.loadtest.runner import build_params
+
+
+@pytest.fixture
+def env(tmp_path):
+    fixtures = write_fixtures(
+        tmp_path, "http://127.0.0.1:9001", members=2, modules=3, categories=["DATA"]
+    )
+    members = MemberRepository(tmp_path / "members.yaml")
+    modules = ModuleRepository(tmp_path / "modules.yaml")
+    products = DigiposProductRepository(tmp_path / "digipos.yaml")
+    service = TransactionAuthService(
+        MemberAuthService(members),
+        DigiposProductAuthService(products),
+        ModuleAuthService(modules),
+    )
+    return fixtures, service, DigiposQueryBuilder(products, modules)
+
+
+def test_authorize_resolves_member_product_and_modules(env):
+    fixtures, service, _ = env
+    trx = DigiposTrxModel(**build_params(fixtures, 1))
+    ctx = service.authorize_digipos(trx)
+    assert ctx.member.memberid == trx.memberid
+    assert ctx.product.productid == trx.product
+    assert ctx.module.moduleid == trx.moduleid
+    # produk failover: module yang diminta dulu, lalu kandidat lain
+    assert ctx.candidates[0] is ctx.module
+    assert {m.moduleid for m in ctx.candidates} == set(fixtures.moduleids)
+
+
+def test_authorize_fixed_routing_has_no_candidates(env):
+    fixtures, service, _ = env
+    product = service.product_auth.product_manager.get_product_by_id("LTDATA")
+    product.routing_mode = "fixed"
+    ctx = service.authorize_digipos(DigiposTrxModel(**build_params(fixtures, 1)))
+    assert ctx.candidates == []
+
+
+@pytest.mark.parametrize(
+    ("override", "error"),
+    [
+        ({"sign": "wrong"}, MemberInvalidSignatureError),
+        ({"moduleid": "NOPE"}, ModuleNotFoundError),
+    ],
+)
+def test_authorize_rejects_invalid_request(env, override, error):
+    fixtures, service, _ = env
+    params = build_params(fixtures, 0) | override
+    with pytest.raises(error):
+        service.authorize_digipos(DigiposTrxModel(**params))
+
+
+def test_authorize_unknown_product(env):
+    fixtures, service, _ = env
+    member = fixtures.members[0]
+    params = build_params(fixtures, 0) | {
+        "product": "NOPE",
+        "sign": fixtures.sign(member, "NOPE", "0812", "R1"),
+        "dest": "0812",
+        "refid": "R1",
+    }
+    with pytest.raises(ProductNotFoundError):
+        service.authorize_digipos(DigiposTrxModel(**params))
+
+
+def test_build_resolved_matches_repository_build(env):
+    fixtures, service, query_builder = env
+    trx = DigiposTrxModel(**build_params(fixtures, 2))
+    ctx = service.authorize_digipos(trx)
+    resolved = query_builder.build_resolved(trx, ctx.product, ctx.module)
+    looked_up = query_builder.build(trx)
+    resolved["params"].pop("trxid")
+    looked_up["params"].pop("trxid")
+    assert resolved == looked_up
@@ -0,0 +1,124 @@
+"""Harness benchmark parser: hasil ke JSON + bandingkan dengan baseline.
+
+- Test benchmark ditandai `performance` dan tidak ikut run default;
+  jalankan dengan `pytest -m performance`
+- Hasil run disimpan ke `.reports/benchmarks/parser.json`
+- Baseline di-commit di `tests/benchmarks/baseline.json`
+- Waktu dinormalisasi dengan workload kalibrasi supaya baseline bisa
+  dipakai lintas mesin (CI vs laptop)
+- `BENCH_THRESHOLD` (default 0.5): toleransi regresi relatif, ditambah
+  slack absolut kecil supaya catalog kecil (< 1ms) tidak flaky
+- `BENCH_UPDATE_BASELINE=1`: tulis ulang baseline dari hasil run ini
+"""
+
+import json
+import os
+import re
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+BENCH_DIR = Path(__file__).parent
+BASELINE_PATH = BENCH_DIR / "baseline.json"
+RESULTS_PATH = BENCH_DIR.parent.parent / ".reports" / "benchmarks" / "parser.json"
+DEFAULT_THRESHOLD = 0.5
+# slack absolut (satuan normalized, ~1x workload kalibrasi / 20)
+MIN_SLACK = 0.05
+
+_CALIBRATION_TEXT = "DATA National/Internet 30 Days 12 GB Nasional, " * 20
+_CALIBRATION_RE = re.compile(r"\b(\d+)\s+(Days|GB)\b")
+
+
+def _calibration_workload() -> None:
+    payload = json.dumps([{"quota": _CALIBRATION_TEXT, "id": i} for i in range(200)])
+    for item in json.loads(payload):
+        _CALIBRATION_RE.sub(r"\1\2", item["quota"])
+
+
+def calibrate(rounds: int = 15) -> float:
+    """Waktu terbaik workload referensi (detik) di mesin ini."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        _calibration_workload()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+class BenchmarkRecorder:
+    def __init__(self, calibration: float):
+        self.calibration = calibration
+        self.results: dict[str, dict] = {}
+
+    def record(self, name: str, total_seconds: float, **metrics: object) -> dict:
+        entry = {
+            "total_ms": round(total_seconds * 1000, 3),
+            "normalized": round(total_seconds / self.calibration, 3),
+            **metrics,
+        }
+        self.results[name] = entry
+        return entry
+
+    def write(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "calibration_ms": round(self.calibration * 1000, 3),
+            "results": self.results,
+        }
+        path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n")
+
+
+def load_baseline() -> dict[str, dict]:
+    if not BASELINE_PATH.exists():
+        return {}
+    return json.loads(BASELINE_PATH.read_text())["results"]
+
+
+def bench_threshold() -> float:
+    return float(os.getenv("BENCH_THRESHOLD", DEFAULT_THRESHOLD))
+
+
+@pytest.fixture(scope="session")
+def bench_recorder():
+    recorder = BenchmarkRecorder(calibrate())
+    yield recorder
+    if not recorder.results:
+        return
+    recorder.write(RESULTS_PATH)
+    if os.getenv("BENCH_UPDATE_BASELINE") == "1":
+        recorder.write(BASELINE_PATH)
+
+
+@pytest.fixture(scope="session")
+def bench_baseline():
+    return load_baseline()
+
+
+@pytest.fixture
+def assert_no_regression(bench_baseline, bench_recorder):
+    """Bandingkan dengan baseline; ukur ulang sekali sebelum dianggap regresi.
+
+    `remeasure` mengembalikan waktu terbaik (detik) dari run tambahan.
+    """
+
+    def _check(name: str, entry: dict, remeasure: Callable[[], float]) -> None:
+        if os.getenv("BENCH_UPDATE_BASELINE") == "1":
+            return
+        baseline = bench_baseline.get(name)
+        if baseline is None:
+            pytest.skip(f"No baseline for {name}")
+        limit = baseline["normalized"] * (1 + bench_threshold()) + MIN_SLACK
+        if entry["normalized"] > limit:
+            # noise (GC, CPU lain sibuk): ukur ulang dengan lebih banyak round,
+            # dinormalisasi kalibrasi baru (beban mesin bisa berubah sejak awal)
+            elapsed = remeasure()
+            retry = elapsed / max(calibrate(), bench_recorder.calibration)
+            entry["normalized"] = round(min(entry["normalized"], retry), 3)
+        assert entry["normalized"] <= limit, (
+            f"{name} regressed: normalized {entry['normalized']} > "
+            f"baseline {baseline['normalized']} (+{bench_threshold():.0%})"
+        )
+
+    return _check
@@ -0,0 +1,88 @@
+"""Rekam fixture benchmark parser (payload Digipos anonim, gzip).
+
+Pakai capture asli (satu file JSON per category, nama = category):
+    python -m tests.benchmarks.record_fixtures --from /path/to/captures
+
+Tanpa `--from`: generate catalog sintetis deterministik per category.
+Tiap category disimpan dalam beberapa ukuran (SIZES) di `fixtures/`.
+"""
+
+import argparse
+import gzip
+import json
+import zlib
+from pathlib import Path
+
+from src.service.parser.digipos.factory_parser import ProcessorFactory
+from src.service.parser.digipos.registry_parser import PROCESSORS
+from tests.parser.conftest import make_catalog
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+SIZES = {"small": 20, "medium": 150, "large": 600}
+ANON_MSISDN = "081200000000"
+
+
+def fixture_path(category: str, size: str) -> Path:
+    return FIXTURES_DIR / f"{category.lower()}_{size}.json.gz"
+
+
+def anonymize(payload: dict, items_key: str) -> dict:
+    """Buang data pelanggan/akun, productId diganti nomor urut."""
+    payload = dict(payload)
+    if "to" in payload:
+        payload["to"] = ANON_MSISDN
+    if isinstance(payload.get("req"), dict):
+        payload["req"] = {"category": payload["req"].get("category", "")}
+    payload[items_key] = [
+        {**item, "productId": f"{90000000 + i}"}
+        for i, item in enumerate(payload.get(items_key, []))
+    ]
+    return payload
+
+
+def resize(payload: dict, items_key: str, size: int) -> dict:
+    """Potong / ulang list produk sampai `size` item."""
+    items = payload.get(items_key, [])
+    if items:
+        items = [items[i % len(items)] for i in range(size)]
+    return anonymize({**payload, items_key: items}, items_key)
+
+
+def synthetic(category: str, items_key: str) -> dict:
+    seed = zlib.crc32(category.encode())
+    return make_catalog(max(SIZES.values()), items_key, seed=seed)
+
+
+def record(source_dir: Path | None = None) -> list[Path]:
+    FIXTURES_DIR.mkdir(parents=True, exist_ok=True)
+    written = []
+    for category in sorted(ProcessorFactory.get_supported_categories()):
+        items_key = PROCESSORS[category].items_key
+        source = source_dir / f"{category}.json" if source_dir else None
+        if source is not None and source.exists():
+            payload = json.loads(source.read_text(encoding="utf-8"))
+        else:
+            payload = synthetic(category, items_key)
+        for size_name, size in SIZES.items():
+            path = fixture_path(category, size_name)
+            body = json.dumps(resize(payload, items_key, size), ensure_ascii=False)
+            # mtime=0 supaya file gzip reproducible
+            path.write_bytes(gzip.compress(body.encode(), mtime=0))
+            written.append(path)
+    return written
+
+
+def load_fixture(category: str, size: str) -> bytes:
+    return gzip.decompress(fixture_path(category, size).read_bytes())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--from", dest="source", type=Path, default=None)
+    args = parser.parse_args()
+    for path in record(args.source):
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import json
+
+import pytest
+from src.service.parser.digipos import codec_parser
+from tests.parser.conftest import best_of, make_catalog
+
+
+@pytest.mark.performance
+def test_bench_decode_backends_1000_products(bench_recorder):
+    raw = json.dumps(make_catalog(1000)).encode()
+
+    timings = {
+        name: best_of(lambda loads=loads: loads(raw))
+        for name, loads in codec_parser.BACKENDS.items()
+    }
+    baseline = timings["json"]
+    fastest = timings[codec_parser.JSON_BACKEND]
+    bench_recorder.record(
+        "decode/backends-1000",
+        fastest,
+        body_bytes=len(raw),
+        backend=codec_parser.JSON_BACKEND,
+        stages_ms={name: round(t * 1000, 3) for name, t in timings.items()},
+    )
+    assert fastest <= baseline * 1.5
+
+
+@pytest.mark.performance
+def test_bench_decode_once_vs_twice(bench_recorder):
+    raw = json.dumps(make_catalog(1000)).encode()
+
+    def twice():
+        json.loads(raw)
+        json.loads(raw)
+
+    before = best_of(twice)
+    after = best_of(lambda: codec_parser.decode_json(raw))
+    bench_recorder.record(
+        "decode/once-vs-twice-1000",
+        after,
+        backend=codec_parser.JSON_BACKEND,
+        stages_ms={
+            "twice_stdlib": round(before * 1000, 3),
+            "once": round(after * 1000, 3),
+        },
+    )
+    assert after < before
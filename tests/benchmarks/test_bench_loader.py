@@ -0,0 +1,51 @@
+import pytest
+import yaml
+from src.domain.member.sch_member import MemberInDB
+from src.mlogg import logger
+from src.service.dto import srv_dtoloader
+from src.service.dto.srv_dtoloader import GenericYamlLoader, cache_path_for
+from tests.loadtest.fixtures import write_fixtures
+from tests.parser.conftest import best_of
+
+MEMBERS = 2000
+ROUNDS = 3
+
+
+@pytest.fixture(scope="module")
+def members_file(tmp_path_factory):
+    data_path = tmp_path_factory.mktemp("loader")
+    write_fixtures(data_path, "http://127.0.0.1:9001", members=MEMBERS)
+    return data_path / "members.yaml"
+
+
+def load(path, cache: bool) -> int:
+    loader = GenericYamlLoader("members", "memberid", MemberInDB, logger, cache=cache)
+    return len(loader.load_incremental(path).items)
+
+
+@pytest.mark.performance
+def test_bench_cold_vs_warm_start(members_file, bench_recorder, monkeypatch):
+    def cold():
+        cache_path_for(members_file).unlink(missing_ok=True)
+        assert load(members_file, cache=True) == MEMBERS
+
+    with monkeypatch.context() as m:
+        m.setattr(srv_dtoloader, "SafeLoader", yaml.SafeLoader)
+        cold_pure = best_of(cold, ROUNDS)
+    cold_libyaml = best_of(cold, ROUNDS)
+    load(members_file, cache=True)
+    warm = best_of(lambda: load(members_file, cache=True), ROUNDS)
+
+    bench_recorder.record(
+        f"loader/members-{MEMBERS}",
+        warm,
+        loader=srv_dtoloader.SafeLoader.__name__,
+        stages_ms={
+            "cold_safeloader": round(cold_pure * 1000, 3),
+            "cold": round(cold_libyaml * 1000, 3),
+            "warm": round(warm * 1000, 3),
+        },
+    )
+    assert warm * 2 < cold_libyaml
+    if yaml.__with_libyaml__:
+        assert cold_libyaml < cold_pure
@@ -0,0 +1,84 @@
+import time
+import tracemalloc
+
+import pytest
+from src.service.parser.digipos import parser_service
+from src.service.parser.digipos.base_parser import MAX_CHAR_LIMIT
+from src.service.parser.digipos.cache_parser import ParsedCatalogCache
+from src.service.parser.digipos.codec_parser import decode_json
+from src.service.parser.digipos.factory_parser import ProcessorFactory
+from tests.benchmarks.record_fixtures import SIZES, load_fixture
+from tests.parser.conftest import best_of
+
+ROUNDS = 7
+CASES = [
+    (category, size)
+    for category in sorted(ProcessorFactory.get_supported_categories())
+    for size in SIZES
+]
+
+
+@pytest.fixture(autouse=True)
+def no_catalog_cache(monkeypatch):
+    # ukur pipeline penuh, bukan cache hit
+    monkeypatch.setattr(
+        parser_service, "catalog_cache", ParsedCatalogCache(max_entries=0)
+    )
+
+
+def peak_memory(func) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize(("category", "size"), CASES)
+def test_bench_process_category_response(
+    category, size, bench_recorder, assert_no_regression
+):
+    raw = load_fixture(category, size)
+    processor = ProcessorFactory.create_processor(category)
+    products = len(decode_json(raw).get(processor.items_key, []))
+
+    def run():
+        parser_service.process_category_response(category, raw)
+
+    total = best_of(run, ROUNDS)
+    decode = best_of(lambda: decode_json(raw), ROUNDS)
+    decoded = decode_json(raw)
+    # budget tak terbatas: filter + format tanpa compaction (data tidak diubah)
+    filter_format = best_of(
+        lambda: processor.process_with_report(raw, budget=10**9, data=decoded),
+        ROUNDS,
+    )
+    compaction = max(total - decode - filter_format, 0.0)
+    peak = peak_memory(run)
+
+    result = processor.process_with_report(raw)
+    assert len(result.output) <= MAX_CHAR_LIMIT
+
+    entry = bench_recorder.record(
+        f"{category}/{size}",
+        total,
+        products=products,
+        throughput_per_s=round(products / total) if total else 0,
+        stages_ms={
+            "decode": round(decode * 1000, 3),
+            "filter_format": round(filter_format * 1000, 3),
+            "compaction": round(compaction * 1000, 3),
+        },
+        compaction_level=result.level.name,
+        peak_kib=round(peak / 1024, 1),
+    )
+    assert_no_regression(f"{category}/{size}", entry, lambda: best_of(run, ROUNDS * 3))
+
+
+@pytest.mark.performance
+def test_bench_calibration_is_stable(bench_recorder):
+    start = time.perf_counter()
+    assert bench_recorder.calibration > 0
+    assert time.perf_counter() - start < 1
@@ -0,0 +1,49 @@
+import pytest
+from src.service.parser.digipos.recharge_parser import RechargeProcessor
+from src.service.parser.digipos.rules_parser import compile_prefix_matcher
+from tests.parser.conftest import (
+    best_of,
+    legacy_optimize_quota,
+    legacy_prefix_excluded,
+    make_catalog,
+)
+
+
+def record_speedup(recorder, name: str, legacy: float, compiled: float) -> None:
+    recorder.record(
+        name,
+        compiled,
+        stages_ms={
+            "legacy": round(legacy * 1000, 3),
+            "compiled": round(compiled * 1000, 3),
+        },
+        speedup=round(legacy / compiled, 2),
+    )
+
+
+@pytest.mark.performance
+def test_bench_optimize_quota_500_products(bench_recorder):
+    processor = RechargeProcessor("DATA")
+    quotas = [p["quota"] for p in make_catalog(500)["paket"]]
+
+    legacy = best_of(lambda: [legacy_optimize_quota(processor, q) for q in quotas])
+    compiled = best_of(lambda: [processor.optimize_quota(q) for q in quotas])
+
+    record_speedup(bench_recorder, "quota/optimize-500", legacy, compiled)
+    assert compiled < legacy
+
+
+@pytest.mark.performance
+def test_bench_prefix_exclusion_500_products(bench_recorder):
+    patterns = ["Music", "Roaming Umroh", "Kuota Ket", "Paket Nelpon"]
+    names = [p["productName"] for p in make_catalog(500)["paket"]]
+
+    def compiled_run():
+        matcher = compile_prefix_matcher(tuple(patterns))
+        return [bool(matcher(n)) for n in names]
+
+    legacy = best_of(lambda: [legacy_prefix_excluded(n, patterns) for n in names])
+    compiled = best_of(compiled_run)
+
+    record_speedup(bench_recorder, "quota/prefix-exclusion-500", legacy, compiled)
+    assert compiled < legacy
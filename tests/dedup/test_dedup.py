@@ -0,0 +1,126 @@
+import asyncio
+
+import pytest
+from src.custom.cst_exceptions import DuplicateTransactionError, UpstreamError
+from src.service.dedup import (
+    DedupOutcome,
+    DedupStore,
+    InMemoryDedupStore,
+    StoredResponse,
+    TransactionDeduplicator,
+)
+
+KEY = ("M1", "R1")
+FINGERPRINT = ("DATA01", "0812", "DGP01")
+
+
+def slow_upstream(calls, delay=0.05, error=None):
+    async def execute():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return StoredResponse(content=f"trxid=R1&call={len(calls)}")
+
+    return execute
+
+
+async def test_inflight_duplicate_waits_on_same_upstream_call():
+    dedup = TransactionDeduplicator()
+    calls = []
+    execute = slow_upstream(calls)
+    (first, o1), (second, o2) = await asyncio.gather(
+        dedup.run(KEY, FINGERPRINT, execute),
+        dedup.run(KEY, FINGERPRINT, execute),
+    )
+    assert calls == [1]
+    assert first.content == second.content
+    assert {o1, o2} == {DedupOutcome.NEW, DedupOutcome.COALESCED}
+
+
+async def test_completed_duplicate_is_replayed_from_store():
+    dedup = TransactionDeduplicator()
+    calls = []
+    first, _ = await dedup.run(KEY, FINGERPRINT, slow_upstream(calls, 0))
+    second, outcome = await dedup.run(KEY, FINGERPRINT, slow_upstream(calls, 0))
+    assert outcome == DedupOutcome.REPLAYED
+    assert second == first
+    assert calls == [1]
+    assert dedup.stats() == {"inflight": 0, "new": 1, "coalesced": 0, "replayed": 1}
+
+
+async def test_failure_shared_with_waiters_and_not_stored():
+    dedup = TransactionDeduplicator()
+    calls = []
+    failing = slow_upstream(calls, error=UpstreamError("boom"))
+    results = await asyncio.gather(
+        dedup.run(KEY, FINGERPRINT, failing),
+        dedup.run(KEY, FINGERPRINT, failing),
+        return_exceptions=True,
+    )
+    assert all(isinstance(r, UpstreamError) for r in results)
+    assert calls == [1]
+
+    _, outcome = await dedup.run(KEY, FINGERPRINT, slow_upstream(calls, 0))
+    assert outcome == DedupOutcome.NEW
+    assert len(calls) == 2
+
+
+async def test_upstream_5xx_response_not_replayed():
+    dedup = TransactionDeduplicator()
+    calls = []
+
+    async def unavailable():
+        calls.append(1)
+        return StoredResponse(content="trxid=R1&status=503", upstream_status=503)
+
+    first, _ = await dedup.run(KEY, FINGERPRINT, unavailable)
+    assert first.upstream_status == 503
+    second, outcome = await dedup.run(KEY, FINGERPRINT, slow_upstream(calls, 0))
+    assert outcome == DedupOutcome.NEW
+    assert second.content == "trxid=R1&call=2"
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize("completed", [True, False])
+async def test_refid_reused_for_other_transaction_rejected(completed):
+    dedup = TransactionDeduplicator()
+    first = asyncio.create_task(dedup.run(KEY, FINGERPRINT, slow_upstream([])))
+    if completed:
+        await first
+    else:
+        await asyncio.sleep(0)
+    with pytest.raises(DuplicateTransactionError):
+        await dedup.run(KEY, ("DATA01", "0899", "DGP01"), slow_upstream([]))
+    await first
+
+
+async def test_caller_disconnect_does_not_cancel_upstream():
+    dedup = TransactionDeduplicator()
+    calls = []
+    first = asyncio.create_task(dedup.run(KEY, FINGERPRINT, slow_upstream(calls)))
+    await asyncio.sleep(0.01)
+    first.cancel()
+    await asyncio.sleep(0.08)
+    stored, outcome = await dedup.run(KEY, FINGERPRINT, slow_upstream(calls))
+    assert outcome == DedupOutcome.REPLAYED
+    assert stored.content == "trxid=R1&call=1"
+
+
+async def test_memory_store_ttl_and_bound(mocker):
+    store = InMemoryDedupStore(max_entries=2, ttl=10)
+    assert isinstance(store, DedupStore)
+    for refid in ("R1", "R2", "R3"):
+        await store.put(("M1", refid), StoredResponse(content=refid))
+    assert len(store) == 2
+    assert await store.get(("M1", "R1")) is None
+
+    # hit memperbarui urutan LRU: R2 bertahan, R3 yang dibuang
+    assert await store.get(("M1", "R2")) is not None
+    await store.put(("M1", "R4"), StoredResponse(content="R4"))
+    assert await store.get(("M1", "R2")) is not None
+    assert await store.get(("M1", "R3")) is None
+
+    now = mocker.patch("src.service.dedup.srv_dedup.time.monotonic")
+    now.return_value = 10**9
+    assert await store.get(("M1", "R4")) is None
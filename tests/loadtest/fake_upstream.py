@@ -0,0 +1,111 @@
+"""Fake Digipos upstream untuk load test lokal.
+
+Response catalog diambil dari fixture benchmark (`tests/benchmarks/fixtures`)
+sesuai query `category`. Latency, jitter, error rate dan ukuran catalog bisa
+diatur:
+    python -m tests.loadtest.fake_upstream --port 9001 --latency-ms 80 \\
+        --jitter-ms 20 --error-rate 0.02 --catalog-size medium
+"""
+
+import argparse
+import asyncio
+import random
+from dataclasses import asdict, dataclass, field
+
+import uvicorn
+from fastapi import FastAPI, Request, Response
+from tests.benchmarks.record_fixtures import SIZES, fixture_path, load_fixture
+
+API_PATH = "/digipos/api/trx"
+
+
+@dataclass
+class FakeUpstreamConfig:
+    latency_ms: float = 50.0
+    jitter_ms: float = 10.0
+    error_rate: float = 0.0
+    # status yang dipakai saat error diinjeksi (dipilih acak)
+    error_statuses: tuple[int, ...] = (500, 502, 503)
+    catalog_size: str = "medium"
+    seed: int | None = None
+
+
+@dataclass
+class FakeUpstreamStats:
+    requests: int = 0
+    errors: int = 0
+    by_category: dict[str, int] = field(default_factory=dict)
+
+
+def create_fake_upstream(config: FakeUpstreamConfig | None = None) -> FastAPI:
+    config = config or FakeUpstreamConfig()
+    if config.catalog_size not in SIZES:
+        raise ValueError(f"catalog_size must be one of {list(SIZES)}")
+    rng = random.Random(config.seed)
+    stats = FakeUpstreamStats()
+    payloads: dict[str, bytes] = {}
+
+    def payload_for(category: str) -> bytes | None:
+        category = category.upper()
+        if category not in payloads:
+            if not fixture_path(category, config.catalog_size).exists():
+                return None
+            payloads[category] = load_fixture(category, config.catalog_size)
+        return payloads[category]
+
+    app = FastAPI()
+
+    @app.api_route(API_PATH, methods=["GET", "POST"])
+    async def trx(request: Request) -> Response:
+        params = dict(request.query_params)
+        if request.method == "POST":
+            params.update(await request.json())
+        category = str(params.get("category", "DATA"))
+        stats.requests += 1
+        stats.by_category[category] = stats.by_category.get(category, 0) + 1
+
+        delay = max(config.latency_ms + rng.uniform(-1, 1) * config.jitter_ms, 0)
+        await asyncio.sleep(delay / 1000)
+
+        if rng.random() < config.error_rate:
+            stats.errors += 1
+            return Response(status_code=rng.choice(config.error_statuses))
+        body = payload_for(category)
+        if body is None:
+            return Response(status_code=404)
+        return Response(content=body, media_type="application/json")
+
+    @app.get("/_stats")
+    async def upstream_stats() -> dict:
+        return {"config": asdict(config), **asdict(stats)}
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fake Digipos upstream")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9001)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--catalog-size", choices=list(SIZES), default="medium")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    config = FakeUpstreamConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        catalog_size=args.catalog_size,
+        seed=args.seed,
+    )
+    uvicorn.run(
+        create_fake_upstream(config),
+        host=args.host,
+        port=args.port,
+        log_level="warning",
+    )
+
+
+if __name__ == "__main__":
+    main()
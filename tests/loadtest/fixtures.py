@@ -0,0 +1,127 @@
+"""Data fixture (members/modules/products) untuk app yang di-load test."""
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import yaml
+from src.service.auth.srv_signature import OtomaxSignatureService
+from src.service.parser.digipos.factory_parser import ProcessorFactory
+from tests.loadtest.fake_upstream import API_PATH
+
+PROVIDER = "digipos"
+
+
+@dataclass(frozen=True)
+class LoadMember:
+    memberid: str
+    pin: str
+    password: str
+
+
+@dataclass(frozen=True)
+class LoadFixtures:
+    data_path: Path
+    members: list[LoadMember]
+    moduleids: list[str]
+    products: dict[str, str]  # productid -> category
+
+    def sign(self, member: LoadMember, product: str, dest: str, refid: str) -> str:
+        return OtomaxSignatureService.generate_transaction_signature(
+            memberid=member.memberid,
+            product=product,
+            dest=dest,
+            refid=refid,
+            pin=member.pin,
+            password=member.password,
+        )
+
+
+def _product(productid: str, category: str, moduleids: list[str]) -> dict:
+    return {
+        "productid": productid,
+        "name": f"Load test {category}",
+        "provider": PROVIDER,
+        "type": "catalog",
+        "is_active": True,
+        "api_path": API_PATH,
+        "method": "GET",
+        "json": 1,
+        "required_params": {
+            "username": "modules.username",
+            "to": "request.dest",
+            "up_harga": "request.markup",
+            "trxid": "request.refid",
+            "category": category,
+            "payment_method": "LINKAJA",
+            "kolom": "1",
+        },
+        "list_modules": moduleids,
+        "routing_mode": "failover" if len(moduleids) > 1 else "fixed",
+    }
+
+
+def write_fixtures(
+    data_path: Path,
+    upstream_url: str,
+    members: int = 5,
+    modules: int = 1,
+    categories: list[str] | None = None,
+) -> LoadFixtures:
+    """Tulis members.yaml, modules.yaml, digipos.yaml ke `data_path`."""
+    data_path.mkdir(parents=True, exist_ok=True)
+    categories = categories or sorted(ProcessorFactory.get_supported_categories())
+
+    load_members = [
+        LoadMember(f"LOAD{i:03d}", f"{100000 + i}", f"loadpass{i:03d}")
+        for i in range(members)
+    ]
+    moduleids = [f"LOADDGP{i:02d}" for i in range(modules)]
+    products = {f"LT{category}": category for category in categories}
+
+    member_rows = [
+        {
+            "memberid": m.memberid,
+            "name": f"Load member {m.memberid}",
+            "pin": m.pin,
+            "password": m.password,
+            "is_active": True,
+            "ipaddress": "127.0.0.1",
+            "report_url": "http://127.0.0.1/report",
+            "allow_nosign": False,
+        }
+        for m in load_members
+    ]
+    module_rows = [
+        {
+            "moduleid": moduleid,
+            "name": f"Load module {moduleid}",
+            "username": "loaduser",
+            "msisdn": "081200000000",
+            "pin": "123456",
+            "password": "loadsecret",
+            "email": "load@example.com",
+            "is_active": True,
+            "base_url": upstream_url.rstrip("/"),
+            "timeout": 10,
+            "max_retries": 1,
+            "second_wait": 0,
+            "provider": PROVIDER,
+            "max_concurrency": 100,
+            "max_queue": 1000,
+        }
+        for moduleid in moduleids
+    ]
+    product_rows = [
+        _product(productid, category, moduleids)
+        for productid, category in products.items()
+    ]
+
+    for filename, key, rows in (
+        ("members.yaml", "members", member_rows),
+        ("modules.yaml", "modules", module_rows),
+        ("digipos.yaml", "products", product_rows),
+    ):
+        (data_path / filename).write_text(
+            yaml.safe_dump({key: rows}, sort_keys=False), encoding="utf-8"
+        )
+    return LoadFixtures(data_path, load_members, moduleids, products)
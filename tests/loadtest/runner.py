@@ -0,0 +1,299 @@
+"""Load test end-to-end `/digipos/trx` terhadap fake Digipos upstream.
+
+Menjalankan fake upstream + app (`src.main:app`) sebagai subprocess dengan
+data fixture di temp dir, lalu mengirim request open-loop pada target RPS.
+Latency dihitung dari jadwal kirim (bukan saat benar-benar terkirim) supaya
+antrian di sisi client tidak menyembunyikan lambatnya server.
+
+    python -m tests.loadtest.runner --rps 200 --duration 30 \\
+        --latency-ms 80 --error-rate 0.01 --catalog-size large
+
+Report: throughput, p50/p95/p99 latency, breakdown error dan CPU app per
+request, dicetak dan disimpan ke `.reports/loadtest/`.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import count
+from pathlib import Path
+
+import httpx
+from tests.benchmarks.record_fixtures import SIZES
+from tests.loadtest.fixtures import LoadFixtures, write_fixtures
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+REPORT_DIR = BASE_DIR / ".reports" / "loadtest"
+
+
+@dataclass
+class LoadSamples:
+    latencies: list[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    errors: Counter = field(default_factory=Counter)
+    sent: int = 0
+
+    def record(self, latency: float, status: int | None, error: str | None) -> None:
+        self.latencies.append(latency)
+        if status is not None:
+            self.statuses[status] += 1
+        if error is not None:
+            self.errors[error] += 1
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Percentile dengan interpolasi linear (values tidak perlu urut)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(samples: LoadSamples, elapsed: float, cpu_seconds: float | None) -> dict:
+    completed = len(samples.latencies)
+    ok = samples.statuses.get(200, 0)
+    errors = dict(samples.errors)
+    for status, n in samples.statuses.items():
+        if status != 200:
+            errors[f"http_{status}"] = errors.get(f"http_{status}", 0) + n
+    return {
+        "sent": samples.sent,
+        "completed": completed,
+        "ok": ok,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(completed / elapsed, 2) if elapsed else 0.0,
+        "ok_rps": round(ok / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(samples.latencies, 50) * 1000, 2),
+            "p95": round(percentile(samples.latencies, 95) * 1000, 2),
+            "p99": round(percentile(samples.latencies, 99) * 1000, 2),
+            "max": round(max(samples.latencies, default=0.0) * 1000, 2),
+        },
+        "errors": dict(sorted(errors.items())),
+        "error_rate": round(1 - ok / completed, 4) if completed else 0.0,
+        "cpu_ms_per_request": (
+            round(cpu_seconds * 1000 / completed, 3)
+            if cpu_seconds is not None and completed
+            else None
+        ),
+    }
+
+
+def process_cpu_seconds(pid: int) -> float | None:
+    """CPU time (user + system) process dari /proc; None jika tidak ada."""
+    try:
+        fields = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    # field 14/15 (utime, stime), offset 2 karena pid + comm sudah dipotong
+    ticks = int(fields[11]) + int(fields[12])
+    return ticks / os.sysconf("SC_CLK_TCK")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_ready(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                response = await client.get(url)
+                if response.status_code < 500:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise TimeoutError(f"{url} not ready after {timeout}s")
+
+
+def build_params(fixtures: LoadFixtures, seq: int) -> dict:
+    member = fixtures.members[seq % len(fixtures.members)]
+    productids = list(fixtures.products)
+    product = productids[seq % len(productids)]
+    dest = f"0812{seq % 10**8:08d}"
+    refid = f"LT{seq:09d}"
+    return {
+        "memberid": member.memberid,
+        "dest": dest,
+        "product": product,
+        "refid": refid,
+        "moduleid": fixtures.moduleids[seq % len(fixtures.moduleids)],
+        "markup": 0,
+        "sign": fixtures.sign(member, product, dest, refid),
+    }
+
+
+async def drive_load(
+    app_url: str,
+    fixtures: LoadFixtures,
+    rps: float,
+    duration: float,
+    max_inflight: int = 1000,
+    timeout: float = 30.0,
+) -> tuple[LoadSamples, float]:
+    """Kirim request open-loop pada `rps` selama `duration` detik."""
+    samples = LoadSamples()
+    limits = httpx.Limits(max_connections=max_inflight)
+    inflight = asyncio.Semaphore(max_inflight)
+    url = f"{app_url}/digipos/trx"
+
+    async with httpx.AsyncClient(limits=limits, timeout=timeout) as client:
+
+        async def one(seq: int, scheduled: float) -> None:
+            status = error = None
+            try:
+                async with inflight:
+                    response = await client.get(url, params=build_params(fixtures, seq))
+                status = response.status_code
+            except httpx.HTTPError as e:
+                error = e.__class__.__name__
+            samples.record(time.perf_counter() - scheduled, status, error)
+
+        tasks = []
+        start = time.perf_counter()
+        interval = 1 / rps
+        for seq in count():
+            scheduled = start + seq * interval
+            if scheduled - start >= duration:
+                break
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            samples.sent += 1
+            tasks.append(asyncio.create_task(one(seq, scheduled)))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+    return samples, elapsed
+
+
+def start_process(args: list[str], env: dict[str, str]) -> subprocess.Popen:
+    return subprocess.Popen(
+        args,
+        cwd=BASE_DIR,
+        env={**os.environ, **env},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def stop_process(process: subprocess.Popen) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+async def run(args: argparse.Namespace) -> dict:
+    upstream_port, app_port = free_port(), free_port()
+    upstream_url = f"http://127.0.0.1:{upstream_port}"
+    app_url = f"http://127.0.0.1:{app_port}"
+    processes = []
+    with tempfile.TemporaryDirectory(prefix="mkit-loadtest-") as tmp:
+        fixtures = write_fixtures(
+            Path(tmp),
+            upstream_url,
+            members=args.members,
+            modules=args.modules,
+            categories=args.categories,
+        )
+        try:
+            processes.append(
+                start_process(
+                    [
+                        sys.executable,
+                        "-m",
+                        "tests.loadtest.fake_upstream",
+                        f"--port={upstream_port}",
+                        f"--latency-ms={args.latency_ms}",
+                        f"--jitter-ms={args.jitter_ms}",
+                        f"--error-rate={args.error_rate}",
+                        f"--catalog-size={args.catalog_size}",
+                    ],
+                    {},
+                )
+            )
+            app = start_process(
+                [
+                    sys.executable,
+                    "-m",
+                    "uvicorn",
+                    "src.main:app",
+                    f"--port={app_port}",
+                    "--log-level=warning",
+                    "--no-access-log",
+                ],
+                {
+                    "DATA_PATH": tmp,
+                    "APP_ENV": os.getenv("APP_ENV", "LOADTEST"),
+                    "APP_DEBUG": os.getenv("APP_DEBUG", "false"),
+                    "APP_NAME": os.getenv("APP_NAME", "mkit-loadtest"),
+                },
+            )
+            processes.append(app)
+            await wait_ready(f"{upstream_url}/_stats")
+            await wait_ready(f"{app_url}/health")
+
+            cpu_before = process_cpu_seconds(app.pid)
+            samples, elapsed = await drive_load(
+                app_url, fixtures, args.rps, args.duration, args.max_inflight
+            )
+            cpu_after = process_cpu_seconds(app.pid)
+            cpu = (
+                cpu_after - cpu_before
+                if cpu_before is not None and cpu_after is not None
+                else None
+            )
+        finally:
+            for process in processes:
+                stop_process(process)
+
+    return {
+        "config": {key: value for key, value in vars(args).items() if key != "output"},
+        "summary": summarize(samples, elapsed, cpu),
+    }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load test /digipos/trx")
+    parser.add_argument("--rps", type=float, default=50.0)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--max-inflight", type=int, default=1000)
+    parser.add_argument("--members", type=int, default=5)
+    parser.add_argument("--modules", type=int, default=1)
+    parser.add_argument("--categories", nargs="*", default=None)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--catalog-size", choices=list(SIZES), default="medium")
+    parser.add_argument("--output", type=Path, default=None)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+    output = args.output or REPORT_DIR / f"loadtest-{int(time.time())}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    print(json.dumps(report["summary"], indent=2))
+    print(f"report: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import pytest
+from fastapi.testclient import TestClient
+from src.domain.digipos.rep_digipos import DigiposProductRepository
+from src.domain.member.rep_member import MemberRepository
+from src.domain.module.rep_module import ModuleRepository
+from src.domain.transaction.sch_transaction import DigiposTrxModel
+from src.service.auth.srv_memberauth import MemberAuthService
+from tests.loadtest.fake_upstream import (
+    API_PATH,
+    FakeUpstreamConfig,
+    create_fake_upstream,
+)
+from tests.loadtest.fixtures import write_fixtures
+from tests.loadtest.runner import LoadSamples, build_params, percentile, summarize
+
+
+def test_percentile_interpolates():
+    values = [0.4, 0.1, 0.3, 0.2]
+    assert percentile(values, 0) == pytest.approx(0.1)
+    assert percentile(values, 50) == pytest.approx(0.25)
+    assert percentile(values, 100) == pytest.approx(0.4)
+    assert percentile([], 99) == 0.0
+
+
+def test_summarize_breaks_down_errors():
+    samples = LoadSamples(sent=5)
+    for latency, status, error in [
+        (0.01, 200, None),
+        (0.02, 200, None),
+        (0.03, 502, None),
+        (0.04, None, "ReadTimeout"),
+        (0.05, 200, None),
+    ]:
+        samples.record(latency, status, error)
+    summary = summarize(samples, elapsed=1.0, cpu_seconds=0.05)
+    assert summary["ok"] == 3
+    assert summary["throughput_rps"] == 5
+    assert summary["errors"] == {"ReadTimeout": 1, "http_502": 1}
+    assert summary["error_rate"] == pytest.approx(0.4)
+    assert summary["latency_ms"]["p50"] == pytest.approx(30)
+    assert summary["cpu_ms_per_request"] == pytest.approx(10)
+
+
+def test_fake_upstream_serves_catalog_per_category():
+    client = TestClient(
+        create_fake_upstream(FakeUpstreamConfig(latency_ms=0, jitter_ms=0))
+    )
+    data = client.get(API_PATH, params={"category": "DATA"}).json()
+    vf = client.get(API_PATH, params={"category": "VF"}).json()
+    assert "paket" in data
+    assert "res" in vf
+    assert client.get(API_PATH, params={"category": "NOPE"}).status_code == 404
+    assert client.get("/_stats").json()["by_category"]["DATA"] == 1
+
+
+def test_fake_upstream_injects_errors():
+    config = FakeUpstreamConfig(
+        latency_ms=0, jitter_ms=0, error_rate=1.0, error_statuses=(503,), seed=1
+    )
+    client = TestClient(create_fake_upstream(config))
+    assert client.get(API_PATH, params={"category": "DATA"}).status_code == 503
+    assert client.get("/_stats").json()["errors"] == 1
+
+
+def test_fixtures_load_and_sign(tmp_path):
+    fixtures = write_fixtures(
+        tmp_path, "http://127.0.0.1:9001", members=2, modules=2, categories=["DATA"]
+    )
+    members = MemberRepository(tmp_path / "members.yaml")
+    modules = ModuleRepository(tmp_path / "modules.yaml")
+    products = DigiposProductRepository(tmp_path / "digipos.yaml")
+    assert len(members.get_all_members()) == 2
+    assert len(modules.get_all_modules()) == 2
+    product = products.get_product_by_id("LTDATA")
+    assert product is not None
+    assert product.routing_mode == "failover"
+
+    params = build_params(fixtures, 3)
+    member = MemberAuthService(members).authenticate_and_verify(
+        DigiposTrxModel(**params)
+    )
+    assert member.memberid == params["memberid"]
@@ -0,0 +1,254 @@
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+import pytest
+import yaml
+from src.custom.cst_exceptions import ServiceError
+from src.domain.member.rep_member import MemberRepository
+from src.domain.member.sch_member import MemberInDB
+from src.domain.transaction.sch_transaction import DigiposTrxModel
+from src.service.auth import MemberAuthService
+from src.service.dto import srv_dtoimport
+from src.service.dto.srv_dtostore import SqliteRecordStore, import_yaml
+from tests.loadtest.fixtures import write_fixtures
+from tests.loadtest.runner import build_params
+
+
+@pytest.fixture
+def env(tmp_path):
+    fixtures = write_fixtures(tmp_path, "http://127.0.0.1:9001", members=50)
+    yaml_path = tmp_path / "members.yaml"
+    db_path = tmp_path / "members.db"
+    import_yaml(yaml_path, db_path, "members", "memberid", MemberInDB)
+    return fixtures, yaml_path, db_path
+
+
+def edit_members(path, edit):
+    data = yaml.safe_load(path.read_text(encoding="utf-8"))
+    edit(data["members"])
+    path.write_text(yaml.safe_dump(data, sort_keys=False), encoding="utf-8")
+
+
+def reimport(yaml_path, db_path):
+    return import_yaml(yaml_path, db_path, "members", "memberid", MemberInDB)
+
+
+def test_store_lookup_with_bounded_lru(env):
+    _, _, db_path = env
+    store = SqliteRecordStore(db_path, "members", MemberInDB, max_cached=10)
+    assert len(store) == 50
+    assert store.ids()[:2] == ["LOAD000", "LOAD001"]
+
+    for i in range(30):
+        assert store.get(f"LOAD{i:03d}").memberid == f"LOAD{i:03d}"
+    assert store.get("LOAD029") is store.get("LOAD029")
+    assert store.get("NOPE") is None
+    assert "NOPE" not in store
+
+    stats = store.stats()
+    assert stats["cached"] == 10
+    assert stats["missing"] == 1
+    assert stats["evictions"] == 20
+    # LOAD029 dua kali + "NOPE" dari negative cache
+    assert stats["hits"] == 3
+
+
+def test_unknown_ids_do_not_evict_hot_records(env):
+    _, _, db_path = env
+    store = SqliteRecordStore(db_path, "members", MemberInDB, max_missing=5)
+    hot = store.get("LOAD001")
+    for i in range(100):
+        assert store.get(f"SCAN{i:04d}") is None
+    assert store.get("LOAD001") is hot
+    stats = store.stats()
+    assert (stats["cached"], stats["missing"], stats["evictions"]) == (1, 5, 0)
+
+
+def test_reimport_writes_diff_and_store_refresh_evicts(env):
+    _, yaml_path, db_path = env
+    store = SqliteRecordStore(db_path, "members", MemberInDB)
+    old = store.get("LOAD001")
+    assert not reimport(yaml_path, db_path)
+    assert not store.refresh()
+
+    def edit(rows):
+        rows[1]["name"] = "Renamed"
+        rows.pop(2)
+        rows.append({**rows[0], "memberid": "NEW001"})
+
+    edit_members(yaml_path, edit)
+    diff = reimport(yaml_path, db_path)
+    assert (diff.added, diff.removed, diff.changed) == (
+        {"NEW001"},
+        {"LOAD002"},
+        {"LOAD001"},
+    )
+    assert diff.reordered
+    assert store.refresh().stale == diff.stale
+    assert store.generation == 2
+    assert store.get("LOAD001") is not old
+    assert store.get("LOAD001").name == "Renamed"
+    assert store.get("LOAD002") is None
+    assert len(store) == 50
+
+
+def test_refresh_merges_several_imports(env):
+    _, yaml_path, db_path = env
+    store = SqliteRecordStore(db_path, "members", MemberInDB)
+    edit_members(yaml_path, lambda rows: rows.append({**rows[0], "memberid": "TEMP01"}))
+    reimport(yaml_path, db_path)
+    edit_members(yaml_path, lambda rows: rows[-1].update(name="Again"))
+    reimport(yaml_path, db_path)
+
+    diff = store.refresh()
+    assert diff.added == {"TEMP01"}
+    assert not diff.changed
+
+
+def test_reimport_into_empty_table_invalidates_missing_ids(env):
+    _, yaml_path, db_path = env
+    original = yaml_path.read_text(encoding="utf-8")
+    edit_members(yaml_path, lambda rows: rows.clear())
+    reimport(yaml_path, db_path)
+    store = SqliteRecordStore(db_path, "members", MemberInDB)
+    assert store.get("LOAD000") is None
+
+    yaml_path.write_text(original, encoding="utf-8")
+    assert len(reimport(yaml_path, db_path).added) == 50
+    assert len(store.refresh().added) == 50
+    assert store.get("LOAD000").memberid == "LOAD000"
+
+
+def changes_count(db_path):
+    with closing(sqlite3.connect(db_path)) as conn:
+        return conn.execute("SELECT COUNT(*) FROM changes").fetchone()[0]
+
+
+def rename(name):
+    return lambda rows: rows[0].update(name=name)
+
+
+def test_changes_pruned_up_to_slowest_reader(env):
+    _, yaml_path, db_path = env
+    # import pertama tanpa reader: tidak ada yang perlu disimpan
+    assert changes_count(db_path) == 0
+    slow = SqliteRecordStore(db_path, "members", MemberInDB)
+    fast = SqliteRecordStore(db_path, "members", MemberInDB)
+
+    for name in ("A", "B"):
+        edit_members(yaml_path, rename(name))
+        reimport(yaml_path, db_path)
+        fast.refresh()
+    assert changes_count(db_path) == 2  # slow masih di generation 1
+
+    assert slow.refresh().changed == {"LOAD000"}
+    edit_members(yaml_path, rename("C"))
+    reimport(yaml_path, db_path)
+    assert changes_count(db_path) == 1
+
+    slow.close()
+    fast.close()
+    edit_members(yaml_path, rename("D"))
+    reimport(yaml_path, db_path)
+    assert changes_count(db_path) == 0
+
+
+def test_reader_behind_pruned_changes_drops_whole_cache(env):
+    _, yaml_path, db_path = env
+    store = SqliteRecordStore(db_path, "members", MemberInDB)
+    old = store.get("LOAD001")
+    with closing(sqlite3.connect(db_path)) as conn, conn:
+        conn.execute("DELETE FROM readers")  # mis. reader dari host lain
+
+    edit_members(yaml_path, rename("Pruned"))
+    reimport(yaml_path, db_path)
+    assert changes_count(db_path) == 0
+
+    diff = store.refresh()
+    assert len(diff.changed) == 50
+    assert store.get("LOAD001") is not old
+    assert store.get("LOAD000").name == "Pruned"
+
+
+def test_lookup_not_blocked_while_refresh_waits_for_import(env):
+    _, yaml_path, db_path = env
+    store = SqliteRecordStore(db_path, "members", MemberInDB)
+    edit_members(yaml_path, rename("Busy"))
+    reimport(yaml_path, db_path)
+
+    # import lain sedang menulis: refresh menunggu write lock untuk register
+    with closing(sqlite3.connect(db_path, isolation_level=None)) as writer:
+        writer.execute("BEGIN IMMEDIATE")
+        writer.execute("UPDATE records SET position = position")
+        diffs = []
+        refresh = threading.Thread(target=lambda: diffs.append(store.refresh()))
+        refresh.start()
+        time.sleep(0.1)
+        start = time.monotonic()
+        assert store.get("LOAD020").memberid == "LOAD020"
+        assert store.get("LOAD000").name == "Busy"
+        assert time.monotonic() - start < 0.5
+        assert refresh.is_alive()
+        writer.execute("ROLLBACK")
+    refresh.join(timeout=5)
+    assert diffs[0].changed == {"LOAD000"}
+
+
+def test_unreadable_database_on_miss_is_service_error(env):
+    _, _, db_path = env
+    store = SqliteRecordStore(db_path, "members", MemberInDB)
+    hot = store.get("LOAD001")
+
+    class LockedConnection:
+        def execute(self, *_args):
+            raise sqlite3.OperationalError("database is locked")
+
+    store._read_conn = LockedConnection()
+    assert store.get("LOAD001") is hot  # record di LRU tetap dilayani
+    with pytest.raises(ServiceError) as exc_info:
+        store.get("LOAD002")
+    assert exc_info.value.status_code == 503
+
+
+def test_invalid_yaml_leaves_database_untouched(env):
+    _, yaml_path, db_path = env
+    edit_members(yaml_path, lambda rows: rows[0].update(pin="1"))
+    with pytest.raises(ValueError):
+        reimport(yaml_path, db_path)
+    store = SqliteRecordStore(db_path, "members", MemberInDB)
+    assert store.generation == 1
+    assert store.get("LOAD000").pin.get_secret_value() == "100000"
+
+
+def test_store_rejects_other_kind(env):
+    _, _, db_path = env
+    with pytest.raises(ValueError):
+        SqliteRecordStore(db_path, "modules", MemberInDB)
+
+
+def test_repository_with_store_authenticates_and_reloads(env):
+    fixtures, yaml_path, db_path = env
+    repo = MemberRepository(store=SqliteRecordStore(db_path, "members", MemberInDB))
+    assert repo.file_path == db_path
+    assert repo.get_member_count() == 50
+    assert repo.has_member("LOAD007")
+
+    trx = DigiposTrxModel(**build_params(fixtures, 7))
+    member = MemberAuthService(repo).authenticate_and_verify(trx)
+    assert member.memberid == trx.memberid
+
+    edit_members(yaml_path, lambda rows: rows[3].update(is_active=False))
+    reimport(yaml_path, db_path)
+    assert repo.reload().stale == {"LOAD003"}
+    assert repo.version == 2
+    assert repo.is_member_active("LOAD003") is False
+
+
+def test_import_cli(tmp_path, capsys):
+    write_fixtures(tmp_path, "http://127.0.0.1:9001", members=3)
+    assert srv_dtoimport.main(["members", str(tmp_path / "members.yaml")]) == 0
+    assert "added=3" in capsys.readouterr().out
+    assert len(SqliteRecordStore(tmp_path / "members.db", "members", MemberInDB)) == 3
+    assert srv_dtoimport.main(["members", str(tmp_path / "missing.yaml")]) == 1
@@ -0,0 +1,99 @@
+import json
+import random
+import re
+import time
+
+import pytest
+
+BENCH_ROUNDS = 20
+QUOTA_TEMPLATES = [
+    "DATA National/Internet {d} Days {gb} GB Nasional, Local Data/Kuota Lokal Internet {d} Days {gb2} GB",
+    "Main Quota/Internet {gb} GB, Apps Quota/YouTube {mb} MB, Validity/{d} Days",
+    "Voice/Nelpon {mnt} Menit ke Semua Operator, SMS/{sms} SMS Nasional, Validity/{d} Days",
+    "Music RBT/NSP Lagu Pilihan {d} Days",
+    "Internet {gb}.5 GB, Kuota Malam/Internet {gb2} GB Nasional, Roaming/Internet {mb} MB",
+    "Game Quota/Mobile Legends {gb} GB, Local Data/Kuota Lokal {gb2} GB , , Validity/{d} Days",
+]
+NAME_TEMPLATES = [
+    "Internet OMG! {gb}GB",
+    "Combo Sakti {gb}GB",
+    "Kuota Ketengan {mb}MB",
+    "Paket Nelpon {mnt} Menit",
+    "Roaming Umroh {d} Hari",
+    "Music Max {d} Hari",
+]
+SUBCATEGORIES = ["Internet OMG", "Combo", "Ketengan", "Voice", "Roaming", "Music"]
+
+
+def make_product(rng: random.Random, index: int, price_field: str = "total_") -> dict:
+    values = {
+        "d": rng.choice([1, 3, 7, 14, 30]),
+        "gb": rng.randint(1, 50),
+        "gb2": rng.randint(1, 100),
+        "mb": rng.choice([100, 250, 500, 750]),
+        "mnt": rng.choice([60, 100, 300]),
+        "sms": rng.choice([50, 100, 200]),
+    }
+    kind = index % len(QUOTA_TEMPLATES)
+    return {
+        "productId": f"{10000000 + index}",
+        "productName": NAME_TEMPLATES[kind].format(**values),
+        "productSubCategory": SUBCATEGORIES[kind],
+        "quota": QUOTA_TEMPLATES[kind].format(**values),
+        price_field: str(rng.randint(5, 300) * 1000),
+    }
+
+
+def make_catalog(size: int, items_key: str = "paket", seed: int = 42) -> dict:
+    """Catalog berbentuk response Digipos (anonim, isi deterministik)."""
+    rng = random.Random(seed)
+    price_field = "price" if items_key == "res" else "total_"
+    products = [make_product(rng, i, price_field) for i in range(size)]
+    if items_key == "res":
+        return {"req": {"category": "VF"}, "res": products}
+    return {"to": "081234567890", "paket": products}
+
+
+@pytest.fixture
+def catalog_json():
+    def _make(size: int, items_key: str = "paket") -> str:
+        return json.dumps(make_catalog(size, items_key))
+
+    return _make
+
+
+def legacy_optimize_quota(processor, quota: str) -> str:
+    """Implementasi lama optimize_quota (inline re.sub), sebagai referensi."""
+    if not quota:
+        return quota
+    optimized = processor.clean_quota_metadata(quota)
+    optimized = re.sub(r"\b(\d+)\s+Days\b", r"\1D", optimized, flags=re.IGNORECASE)
+    optimized = re.sub(
+        r"\b(\d+(?:\.\d+)?)\s+GB\b", r"\1GB", optimized, flags=re.IGNORECASE
+    )
+    optimized = re.sub(r"\b(\d+)\s+MB\b", r"\1MB", optimized, flags=re.IGNORECASE)
+    optimized = re.sub(r"\bInternet\b", "Net", optimized, flags=re.IGNORECASE)
+    optimized = re.sub(r"\bNasional\b", "Nas", optimized, flags=re.IGNORECASE)
+    optimized = re.sub(r"\s+", " ", optimized)
+    optimized = re.sub(r",\s*,", ",", optimized)
+    optimized = re.sub(r"^\s*,\s*", "", optimized)
+    optimized = re.sub(r"\s*,\s*$", "", optimized)
+    return optimized.strip()
+
+
+def legacy_prefix_excluded(product_name: str, patterns: list[str]) -> bool:
+    return any(
+        re.match(rf"^{re.escape(pattern)}", product_name, re.IGNORECASE)
+        for pattern in patterns
+        if pattern.strip()
+    )
+
+
+def best_of(func, rounds: int = BENCH_ROUNDS) -> float:
+    """Waktu terbaik (detik) dari beberapa kali eksekusi `func`."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
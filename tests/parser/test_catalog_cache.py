@@ -0,0 +1,63 @@
+import json
+
+import pytest
+from src.service.parser.digipos import parser_service
+from src.service.parser.digipos.base_parser import ProcessResult
+from src.service.parser.digipos.cache_parser import ParsedCatalogCache, body_digest
+from tests.parser.conftest import make_catalog
+
+
+@pytest.fixture
+def fresh_cache(monkeypatch):
+    cache = ParsedCatalogCache(max_entries=4, ttl=60)
+    monkeypatch.setattr(parser_service, "catalog_cache", cache)
+    return cache
+
+
+def test_repeated_catalog_hits_cache(fresh_cache, mocker):
+    raw = json.dumps(make_catalog(30))
+    first = parser_service.process_category_response("DATA", raw)
+    spy = mocker.patch.object(
+        parser_service.ProcessorFactory, "create_processor", autospec=True
+    )
+    second = parser_service.process_category_response("DATA", raw)
+    assert first == second
+    spy.assert_not_called()
+    stats = fresh_cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_cache_key_includes_category(fresh_cache):
+    raw = json.dumps(make_catalog(10))
+    parser_service.process_category_result("DATA", raw)
+    parser_service.process_category_result("VOICE_SMS", raw)
+    assert fresh_cache.stats()["size"] == 2
+    assert fresh_cache.stats()["hits"] == 0
+
+
+def test_lru_eviction():
+    cache = ParsedCatalogCache(max_entries=2, ttl=60)
+    result = ProcessResult(output="x")
+    keys = [("DATA", 0, 7000, (), body_digest(str(i))) for i in range(3)]
+    cache.put(keys[0], result)
+    cache.put(keys[1], result)
+    assert cache.get(keys[0]) is result  # keys[0] jadi most recent
+    cache.put(keys[2], result)
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is result
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expiry(mocker):
+    cache = ParsedCatalogCache(max_entries=2, ttl=10)
+    clock = mocker.patch("src.service.parser.digipos.cache_parser.time.monotonic")
+    clock.return_value = 100.0
+    key = ("DATA", 0, 7000, (), body_digest("body"))
+    cache.put(key, ProcessResult(output="x"))
+    clock.return_value = 109.0
+    assert cache.get(key) is not None
+    clock.return_value = 111.0
+    assert cache.get(key) is None
+    assert cache.stats()["expired"] == 1
+    assert cache.stats()["size"] == 0
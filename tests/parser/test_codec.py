@@ -0,0 +1,40 @@
+import json
+
+import pytest
+from src.service.parser.digipos import codec_parser
+from src.service.parser.digipos.recharge_parser import RechargeProcessor
+from tests.parser.conftest import make_catalog
+
+
+@pytest.mark.parametrize("backend", list(codec_parser.BACKENDS))
+def test_backends_decode_identically(backend):
+    raw = json.dumps(make_catalog(50))
+    loads = codec_parser.BACKENDS[backend]
+    assert loads(raw) == json.loads(raw)
+    assert loads(raw.encode()) == json.loads(raw)
+
+
+def test_stdlib_fallback_always_available():
+    assert "json" in codec_parser.BACKENDS
+    assert codec_parser.JSON_BACKEND in codec_parser.BACKENDS
+
+
+def test_invalid_json_raises_value_error():
+    with pytest.raises(ValueError):
+        codec_parser.decode_json(b"{not json")
+
+
+def test_set_unknown_backend_raises():
+    with pytest.raises(ValueError, match="not installed"):
+        codec_parser.set_json_backend("simdjson-nope")
+
+
+def test_predecoded_body_is_not_decoded_again(mocker):
+    raw = json.dumps(make_catalog(20))
+    expected = RechargeProcessor("DATA").process_response(raw)
+    spy = mocker.patch("src.service.parser.digipos.base_parser.decode_json")
+    result = RechargeProcessor("DATA").process_with_report(
+        raw.encode(), data=json.loads(raw)
+    )
+    spy.assert_not_called()
+    assert result.output == expected
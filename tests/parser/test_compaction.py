@@ -0,0 +1,88 @@
+import json
+
+import pytest
+from src.service.parser.digipos.base_parser import MAX_CHAR_LIMIT, CompactionLevel
+from src.service.parser.digipos.recharge_parser import RechargeProcessor
+from tests.parser.conftest import make_catalog
+
+
+class CountingProcessor(RechargeProcessor):
+    def __init__(self, category):
+        super().__init__(category)
+        self.format_calls = 0
+
+    def format_product_output(self, product):
+        self.format_calls += 1
+        return super().format_product_output(product)
+
+
+class CheapFirstProcessor(RechargeProcessor):
+    def get_product_priority(self, product):
+        return float(product["total_"])
+
+
+@pytest.mark.parametrize("size", [1, 20, 100, 300, 1000])
+def test_output_always_fits_budget(size):
+    result = RechargeProcessor("DATA").process_with_report(
+        json.dumps(make_catalog(size))
+    )
+    assert len(result.output) <= MAX_CHAR_LIMIT
+    assert result.kept_products + result.dropped_products <= result.total_products
+
+
+def test_small_catalog_is_not_compacted():
+    catalog = make_catalog(10)
+    result = RechargeProcessor("DATA").process_with_report(json.dumps(catalog))
+    assert result.level == CompactionLevel.NONE
+    assert catalog["paket"][0]["quota"] in result.output
+
+
+def test_levels_escalate_until_fit():
+    processor = RechargeProcessor("DATA")
+    raw = json.dumps(make_catalog(100))
+    full = processor.process_with_report(raw, budget=10**6)
+    assert full.level == CompactionLevel.NONE
+    levels = [
+        processor.process_with_report(raw, budget=budget).level
+        for budget in (len(full.output), len(full.output) - 1, 5000, 100)
+    ]
+    assert levels[0] == CompactionLevel.NONE
+    assert levels[1] >= CompactionLevel.STRIP_METADATA
+    assert levels == sorted(levels)
+    assert levels[-1] == CompactionLevel.DROP_PRODUCTS
+
+
+def test_abbreviate_level_matches_optimize_quota_hook():
+    processor = RechargeProcessor("DATA")
+    catalog = make_catalog(40)
+    result = processor.process_with_report(json.dumps(catalog), budget=2500)
+    if result.level == CompactionLevel.ABBREVIATE:
+        first = catalog["paket"][0]
+        assert processor.optimize_quota(first["quota"]) in result.output
+
+
+def test_format_cost_is_linear():
+    processor = CountingProcessor("DATA")
+    size = 500
+    processor.process_with_report(json.dumps(make_catalog(size)))
+    assert processor.format_calls <= size * (1 + 3)
+
+
+def test_drops_lowest_priority_first():
+    catalog = make_catalog(200)
+    result = CheapFirstProcessor("DATA").process_with_report(
+        json.dumps(catalog), budget=2000
+    )
+    assert result.level == CompactionLevel.DROP_PRODUCTS
+    kept_prices = [
+        int(p["total_"])
+        for p in catalog["paket"]
+        if f"#{p['productId']}|" in result.output
+    ]
+    dropped_prices = [
+        int(p["total_"])
+        for p in catalog["paket"]
+        if f"#{p['productId']}|" not in result.output
+        and "Music RBT/NSP" not in p["quota"]
+    ]
+    assert min(kept_prices) >= max(dropped_prices)
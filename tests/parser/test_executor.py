@@ -0,0 +1,104 @@
+import asyncio
+import json
+
+import pytest
+from src.service.parser.digipos import base_parser, parser_service
+from src.service.parser.digipos.cache_parser import ParsedCatalogCache
+from src.service.parser.digipos.executor_parser import (
+    ParserExecutor,
+    ParserExecutorMode,
+)
+from tests.parser.conftest import make_catalog
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    cache = ParsedCatalogCache()
+    monkeypatch.setattr(parser_service, "catalog_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def big_catalog():
+    return json.dumps(make_catalog(300)).encode()
+
+
+def run(executor, *args, **kwargs):
+    try:
+        return asyncio.run(executor.process(*args, **kwargs))
+    finally:
+        executor.shutdown()
+
+
+def test_inline_mode_never_offloads(big_catalog):
+    executor = ParserExecutor(ParserExecutorMode.INLINE, offload_threshold=0)
+    result = run(executor, "DATA", big_catalog)
+    assert result == parser_service.parse_category("DATA", big_catalog)
+    assert executor.stats()["inline"] == 1
+    assert executor.stats()["offloaded"] == 0
+
+
+def test_small_body_stays_inline():
+    executor = ParserExecutor("thread", offload_threshold=10**9)
+    run(executor, "DATA", json.dumps(make_catalog(10)))
+    assert executor.stats()["inline"] == 1
+    assert executor._pool is None
+
+
+def test_thread_mode_matches_inline(big_catalog):
+    executor = ParserExecutor("thread", offload_threshold=1)
+    data = json.loads(big_catalog)
+    result = run(executor, "DATA", big_catalog, data=data)
+    assert result == parser_service.parse_category("DATA", big_catalog)
+    stats = executor.stats()
+    assert stats["offloaded"] == 1
+    assert stats["pending"] == 0
+    assert stats["parse_time"]["count"] == 1
+    assert stats["queue_time"]["count"] == 1
+
+
+def test_cache_hit_skips_offload(big_catalog):
+    executor = ParserExecutor("thread", offload_threshold=1)
+
+    async def twice():
+        first = await executor.process("DATA", big_catalog)
+        second = await executor.process("DATA", big_catalog)
+        return first, second
+
+    try:
+        first, second = asyncio.run(twice())
+    finally:
+        executor.shutdown()
+    assert first is second
+    assert executor.stats()["offloaded"] == 1
+
+
+def test_cache_hit_skips_decode_and_keeps_document(big_catalog, monkeypatch):
+    executor = ParserExecutor()
+    first = run(executor, "DATA", big_catalog)
+    assert first.document == {"to": "081234567890"}
+
+    def no_decode(_data):
+        raise AssertionError("cache hit must not decode the body")
+
+    monkeypatch.setattr(base_parser, "decode_json", no_decode)
+    assert run(executor, "DATA", big_catalog) is first
+
+
+def test_unsupported_category_raises_from_worker(big_catalog):
+    executor = ParserExecutor("thread", offload_threshold=1)
+    with pytest.raises(ValueError, match="Unsupported category"):
+        run(executor, "NOPE", big_catalog)
+
+
+@pytest.mark.slow
+def test_process_mode_matches_inline(big_catalog):
+    executor = ParserExecutor("process", max_workers=1, offload_threshold=1)
+    result = run(executor, "DATA", big_catalog)
+    assert result == parser_service.parse_category("DATA", big_catalog)
+    assert executor.stats()["offloaded"] == 1
+
+
+def test_invalid_mode_rejected():
+    with pytest.raises(ValueError):
+        ParserExecutor("fork-bomb")
@@ -0,0 +1,69 @@
+import json
+
+import pytest
+from src.service.parser.digipos.actvcr_parser import ActivationProcessor
+from src.service.parser.digipos.factory_parser import ProcessorFactory
+from src.service.parser.digipos.recharge_parser import RechargeProcessor
+from src.service.parser.digipos.registry_parser import (
+    PROCESSORS,
+    register_processor,
+)
+from tests.parser.conftest import make_catalog
+
+
+def test_known_categories_registered():
+    assert ProcessorFactory.get_supported_categories() >= {
+        "DATA",
+        "VOICE_SMS",
+        "HVC_VOICE_SMS",
+        "VF",
+    }
+    assert ProcessorFactory.get_processor_type("data") == "RECHARGE"
+    assert ProcessorFactory.get_processor_type("VF") == "ACTIVATION"
+
+
+def test_processor_instances_are_shared():
+    first = ProcessorFactory.create_processor("DATA")
+    assert first is ProcessorFactory.create_processor("data")
+    assert isinstance(first, RechargeProcessor)
+    assert first.category == "DATA"
+    assert isinstance(ProcessorFactory.create_processor("VF"), ActivationProcessor)
+
+
+def test_unsupported_category_raises():
+    with pytest.raises(ValueError, match="Unsupported category"):
+        ProcessorFactory.create_processor("NOPE")
+    with pytest.raises(ValueError, match="Unsupported category"):
+        ProcessorFactory.get_processor_type("NOPE")
+
+
+def test_shared_processor_is_reusable():
+    processor = ProcessorFactory.create_processor("DATA")
+    raw = json.dumps(make_catalog(40))
+    assert processor.process_response(raw) == processor.process_response(raw)
+    assert processor.process_response(raw) == RechargeProcessor(
+        "DATA"
+    ).process_response(raw)
+
+
+def test_new_category_without_touching_factory():
+    @register_processor("promo_x")
+    class PromoProcessor(RechargeProcessor):
+        pass
+
+    try:
+        processor = ProcessorFactory.create_processor("PROMO_X")
+        assert isinstance(processor, PromoProcessor)
+        assert ProcessorFactory.get_processor_type("promo_x") == "RECHARGE"
+    finally:
+        PROCESSORS.pop("PROMO_X", None)
+
+
+def test_duplicate_registration_rejected():
+    with pytest.raises(ValueError, match="already registered"):
+
+        @register_processor("DATA")
+        class OtherProcessor(RechargeProcessor):
+            pass
+
+    assert type(PROCESSORS["DATA"]) is RechargeProcessor
@@ -0,0 +1,115 @@
+import json
+
+import pytest
+from src.domain.parser.rep_parser import ParserRuleRepository
+from src.service.parser.digipos import parser_service, rules_parser
+from src.service.parser.digipos.cache_parser import ParsedCatalogCache
+from src.service.parser.digipos.recharge_parser import RechargeProcessor
+from tests.parser.conftest import make_catalog
+
+RULES_YAML = """
+rules:
+  - scope: RECHARGE
+    exclude_quota_metadata: []
+    word_replacements: {internet: INET}
+  - scope: DATA
+    exclude_productnames: ["Combo Sakti"]
+"""
+
+
+@pytest.fixture(autouse=True)
+def restore_ruleset(monkeypatch):
+    monkeypatch.setattr(parser_service, "catalog_cache", ParsedCatalogCache())
+    original = rules_parser.get_active_ruleset()
+    yield
+    rules_parser.set_active_ruleset(original)
+
+
+@pytest.fixture
+def rules_file(tmp_path):
+    path = tmp_path / "parser_rules.yaml"
+    path.write_text(RULES_YAML, encoding="utf-8")
+    return path
+
+
+def product_names(output: str) -> list[str]:
+    return [line.split("|")[1] for line in output.split("#") if "|" in line]
+
+
+def test_missing_file_uses_builtin_defaults(tmp_path):
+    before = rules_parser.get_active_ruleset().version
+    repo = ParserRuleRepository(tmp_path / "missing.yaml")
+    assert repo.get_all_rules() == []
+    assert repo.version > before
+
+    raw = json.dumps(make_catalog(30))
+    assert (
+        parser_service.process_category_response("DATA", raw)
+        == RechargeProcessor("DATA")
+        .process_with_report(
+            raw,
+            rules=rules_parser.compile_rules(
+                RechargeProcessor("DATA").default_rule_spec
+            ),
+        )
+        .output
+    )
+
+
+def test_rules_from_yaml_override_processor_defaults(rules_file):
+    ParserRuleRepository(rules_file)
+    catalog = make_catalog(30)
+    raw = json.dumps(catalog)
+
+    data_output = parser_service.process_category_response("DATA", raw)
+    assert not any(n.startswith("Combo Sakti") for n in product_names(data_output))
+    # RECHARGE override mematikan exclusion Music RBT/NSP
+    music = [p for p in catalog["paket"] if "Music RBT/NSP" in p["quota"]]
+    assert music
+    assert f"#{music[0]['productId']}|" in data_output
+
+    voice_output = parser_service.process_category_response("VOICE_SMS", raw)
+    assert any(n.startswith("Combo Sakti") for n in product_names(voice_output))
+
+    rules = RechargeProcessor("DATA").resolve_rules()
+    assert rules.quota_rules.abbreviate("Internet Nasional") == "INET Nasional"
+
+
+def test_invalid_reload_keeps_last_good_rules(rules_file):
+    repo = ParserRuleRepository(rules_file)
+    version = repo.version
+    rules_file.write_text("rules: {not: a list}", encoding="utf-8")
+    repo.reload()
+    assert repo.version == version
+    assert repo.get_rule("data") is not None
+
+
+def test_reload_swaps_version_and_bypasses_cached_output(rules_file):
+    raw = json.dumps(make_catalog(30))
+    repo = ParserRuleRepository(rules_file)
+    first = parser_service.process_category_response("DATA", raw)
+
+    rules_file.write_text("rules: []", encoding="utf-8")
+    repo.reload()
+    second = parser_service.process_category_response("DATA", raw)
+    assert first != second
+    assert parser_service.get_cache_stats()["hits"] == 0
+
+
+def test_in_flight_request_keeps_pinned_rules(rules_file):
+    processor = RechargeProcessor("DATA")
+    pinned = processor.resolve_rules()
+    ParserRuleRepository(rules_file)
+    assert processor.resolve_rules() is not pinned
+
+    raw = json.dumps(make_catalog(30))
+    seen = []
+
+    class ObservingProcessor(RechargeProcessor):
+        def format_product_output(self, product):
+            seen.append(self.rules)
+            return super().format_product_output(product)
+
+    ObservingProcessor("DATA").process_with_report(raw, rules=pinned)
+    assert seen
+    assert all(rules is pinned for rules in seen)
@@ -0,0 +1,70 @@
+import json
+
+from src.service.parser.digipos.actvcr_parser import ActivationProcessor
+from src.service.parser.digipos.base_parser import MAX_CHAR_LIMIT
+from src.service.parser.digipos.recharge_parser import RechargeProcessor
+from tests.parser.conftest import make_catalog
+
+
+class CustomRechargeProcessor(RechargeProcessor):
+    def get_exclude_subcategories(self):
+        return ["Roaming"]
+
+    def get_exclude_productnames(self):
+        return ["kuota ketengan"]
+
+    def format_product_output(self, product):
+        return f"[{product['productId']}:{product['quota']}]"
+
+
+def multi_pass_reference(processor, catalog: dict, optimize: bool) -> str:
+    """Filter berurutan seperti pipeline lama (multi-pass)."""
+    products = catalog[processor.items_key]
+    subcats = processor.get_exclude_subcategories()
+    if any(subcats):
+        products = [p for p in products if p["productSubCategory"] not in subcats]
+    names = [n.lower() for n in processor.get_exclude_productnames() if n.strip()]
+    products = [
+        p
+        for p in products
+        if not any(p["productName"].lower().startswith(n) for n in names)
+    ]
+    quotas = [q for q in processor.get_exclude_quota_metadata() if q.strip()]
+    products = [p for p in products if not any(q in p["quota"] for q in quotas)]
+    if optimize:
+        for p in products:
+            p["quota"] = processor.optimize_quota(p["quota"])
+    return "".join(processor.format_product_output(p) for p in products)
+
+
+def test_recharge_pipeline_filters_and_formats():
+    processor = RechargeProcessor("DATA")
+    catalog = make_catalog(12)
+    output = processor.process_response(json.dumps(catalog))
+    assert "Music RBT/NSP" not in output  # excluded by quota metadata
+    assert output.startswith("#10000000|")
+    assert output == multi_pass_reference(processor, make_catalog(12), False)
+
+
+def test_pipeline_uses_overridden_hooks():
+    processor = CustomRechargeProcessor("DATA")
+    catalog = make_catalog(300)
+    raw = json.dumps(catalog)
+    assert len(raw) > MAX_CHAR_LIMIT
+    output = processor.process_response(raw)
+    assert output == multi_pass_reference(processor, make_catalog(300), True)
+    assert "Roaming" not in output
+
+
+def test_activation_pipeline_reads_res_key():
+    processor = ActivationProcessor("VF")
+    catalog = make_catalog(6, "res")
+    output = processor.process_response(json.dumps(catalog))
+    first = catalog["res"][0]
+    assert output.startswith(
+        f"#{first['productId']}|{first['productName']}({first['quota']})|{first['price']}"
+    )
+
+
+def test_empty_catalog():
+    assert RechargeProcessor("DATA").process_response('{"to": "0812"}') == ""
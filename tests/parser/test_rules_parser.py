@@ -0,0 +1,67 @@
+import pytest
+from src.service.parser.digipos.actvcr_parser import ActivationProcessor
+from src.service.parser.digipos.recharge_parser import RechargeProcessor
+from src.service.parser.digipos.rules_parser import (
+    QuotaRuleEngine,
+    compile_prefix_matcher,
+    compile_substring_matcher,
+)
+from tests.parser.conftest import (
+    legacy_optimize_quota,
+    legacy_prefix_excluded,
+    make_catalog,
+)
+
+
+@pytest.mark.parametrize(
+    "quota,expected",
+    [
+        (
+            "DATA National/Internet 30 Days 12 GB Nasional, Local Data/Kuota Lokal Internet 30 Days 43 GB",
+            "Net 30D 12GB Nas,Kuota Lokal Net 30D 43GB",
+        ),
+        ("Internet 1.5 GB, , Apps/YouTube 500 mb", "Net 1.5GB,YouTube 500MB"),
+        ("", ""),
+        ("Internetan 30 Dayss", "Internetan 30 Dayss"),
+    ],
+)
+def test_optimize_quota_examples(quota, expected):
+    assert RechargeProcessor("DATA").optimize_quota(quota) == expected
+
+
+@pytest.mark.parametrize("processor_cls", [RechargeProcessor, ActivationProcessor])
+def test_compiled_rules_match_legacy_on_catalog(processor_cls):
+    processor = processor_cls("DATA")
+    for product in make_catalog(500)["paket"]:
+        quota = product["quota"]
+        assert processor.optimize_quota(quota) == legacy_optimize_quota(
+            processor, quota
+        )
+
+
+def test_rule_engine_stages_compose_to_optimize():
+    rules = QuotaRuleEngine()
+    quota = "Main/Internet 30 Days 12 GB Nasional"
+    staged = rules.cleanup(rules.abbreviate(rules.shorten_units(quota.split("/")[1])))
+    assert staged == rules.optimize(quota) == "Net 30D 12GB Nas"
+
+
+def test_custom_word_replacements():
+    rules = QuotaRuleEngine(word_replacements={"Kuota": "Q"})
+    assert rules.optimize("Kuota Lokal 2 GB") == "Q Lokal 2GB"
+
+
+def test_prefix_matcher_matches_legacy():
+    patterns = ["Music", "", "Kuota Ket"]
+    matcher = compile_prefix_matcher(tuple(patterns))
+    for product in make_catalog(100)["paket"]:
+        name = product["productName"]
+        assert bool(matcher(name)) == legacy_prefix_excluded(name, patterns)
+    assert compile_prefix_matcher(("", " ")) is None
+
+
+def test_substring_matcher():
+    matcher = compile_substring_matcher(("Music RBT/NSP",))
+    assert matcher("Music RBT/NSP Lagu Pilihan 7 Days")
+    assert not matcher("music rbt/nsp")
+    assert compile_substring_matcher(("",)) is None
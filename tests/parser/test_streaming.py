@@ -0,0 +1,90 @@
+import json
+
+import pytest
+from src.service.parser.digipos import parser_service
+from src.service.parser.digipos.codec_parser import IncrementalItemsDecoder
+from src.service.parser.digipos.factory_parser import ProcessorFactory
+from tests.parser.conftest import make_catalog
+
+
+def chunked(raw: bytes, size: int):
+    for i in range(0, len(raw), size):
+        yield raw[i : i + size]
+
+
+@pytest.mark.parametrize("items_key", ["paket", "res"])
+@pytest.mark.parametrize("chunk_size", [1, 7, 512, 10**6])
+def test_decoder_yields_items_across_chunks(items_key, chunk_size):
+    doc = make_catalog(30, items_key)
+    raw = json.dumps(doc, ensure_ascii=False).encode()
+    decoder = IncrementalItemsDecoder(items_key)
+    items = []
+    for chunk in chunked(raw, chunk_size):
+        items += decoder.feed(chunk)
+    rest, document = decoder.close()
+    assert items + rest == doc[items_key]
+    assert document == {k: v for k, v in doc.items() if k != items_key}
+
+
+def test_decoder_items_arrive_before_body_ends():
+    raw = json.dumps(make_catalog(10)).encode()
+    decoder = IncrementalItemsDecoder("paket")
+    assert decoder.feed(raw[: len(raw) // 2])
+
+
+def test_decoder_handles_tricky_strings_and_nested_keys():
+    doc = {
+        "to": 'x"paket":[',
+        "req": {"paket": [1, 2]},
+        "paket": [{"productName": "A ]}, é", "n": [1, {"x": "\\"}]}],
+        "after": [1, 2],
+    }
+    raw = json.dumps(doc, ensure_ascii=False).encode()
+    decoder = IncrementalItemsDecoder("paket")
+    items = []
+    for chunk in chunked(raw, 3):
+        items += decoder.feed(chunk)
+    rest, document = decoder.close()
+    assert items + rest == doc["paket"]
+    assert document["req"] == {"paket": [1, 2]}
+    assert document["after"] == [1, 2]
+
+
+def test_decoder_without_items_array_falls_back():
+    decoder = IncrementalItemsDecoder("paket")
+    assert decoder.feed(b'{"status": "error", "message": "x"}') == []
+    assert decoder.close() == ([], {"status": "error", "message": "x"})
+
+
+@pytest.mark.parametrize("body", [b'{"paket": [{"a": 1}, {"a"', b"{not json"])
+def test_decoder_truncated_or_invalid_body_raises(body):
+    decoder = IncrementalItemsDecoder("paket")
+    decoder.feed(body)
+    with pytest.raises(ValueError):
+        decoder.close()
+
+
+@pytest.mark.parametrize(
+    ("category", "size"), [("DATA", 40), ("DATA", 600), ("VF", 80)]
+)
+def test_stream_matches_buffered_pipeline(category, size):
+    processor = ProcessorFactory.create_processor(category)
+    raw = json.dumps(make_catalog(size, processor.items_key)).encode()
+    expected = processor.process_with_report(raw)
+
+    stream = parser_service.open_category_stream(category)
+    for chunk in chunked(raw, 1024):
+        stream.feed(chunk)
+    assert stream.finish() == expected
+    assert stream.received == len(raw)
+
+
+def test_stream_reset_discards_partial_body():
+    raw = json.dumps(make_catalog(20)).encode()
+    stream = parser_service.open_category_stream("DATA")
+    stream.feed(raw[:300])
+    stream.reset()
+    stream.feed(raw)
+    result = stream.finish()
+    assert result.total_products == 20
+    assert stream.document == {"to": "081234567890"}
@@ -0,0 +1,134 @@
+import uuid
+
+import pytest
+from src.domain.digipos.sch_digipos import DGProductInDB
+from src.domain.module.sch_module import ModuleInDB
+from src.domain.transaction.sch_transaction import DigiposTrxModel
+from src.service.srv_querybuilder import DigiposQueryBuilder
+
+from tests.upstream.conftest import valid_module_dict
+
+
+class FakeRepo:
+    def __init__(self, items):
+        self.items = items
+        self.lookups = 0
+
+    def get_product_by_id(self, productid):
+        self.lookups += 1
+        return self.items.get(productid)
+
+    get_module_by_id = get_product_by_id
+
+
+def make_product(**overrides):
+    data = {
+        "productid": "DATA01",
+        "name": "Paket Data",
+        "provider": "digipos",
+        "type": "data",
+        "is_active": True,
+        "api_path": "/api/trx",
+        "method": "GET",
+        "json": 1,
+        "required_params": {
+            "username": "modules.username",
+            "to": "request.dest",
+            "up_harga": "request.markup",
+            "trxid": "request.trxid",
+            "category": "DATA",
+            "payment_method": "LINKAJA",
+            "kolom": "request.subproduct",
+        },
+        "optional_params": {"pin": "modules.pin", "refid": "request.refid"},
+        "list_modules": ["DGP01"],
+    }
+    data.update(overrides)
+    return DGProductInDB(**data)
+
+
+@pytest.fixture
+def builder():
+    product_repo = FakeRepo({"DATA01": make_product()})
+    module_repo = FakeRepo({"DGP01": ModuleInDB(**valid_module_dict())})
+    return DigiposQueryBuilder(product_repo, module_repo)
+
+
+def make_trx(**overrides):
+    data = {
+        "memberid": "M1",
+        "dest": "0812",
+        "product": "DATA01",
+        "moduleid": "DGP01",
+        "refid": "R1",
+        "markup": 500,
+    }
+    data.update(overrides)
+    return DigiposTrxModel(**data)
+
+
+def test_build_resolves_static_and_request_values(builder):
+    result = builder.build(make_trx())
+    params = result["params"]
+    assert result["method"] == "GET"
+    assert result["url"] == "http://digipos.local/api/trx"
+    # urutan key sama dengan mapping produk, slot None (kolom) dilewati
+    assert list(params) == [
+        "username",
+        "to",
+        "up_harga",
+        "trxid",
+        "category",
+        "payment_method",
+        "pin",
+        "refid",
+        "json",
+    ]
+    assert params["username"] == "dguser"
+    assert params["to"] == "0812"
+    assert params["up_harga"] == 500
+    assert params["pin"] == "123456"
+    assert params["refid"] == "R1"
+    assert params["json"] == 1
+    uuid.UUID(params["trxid"])
+
+
+def test_template_reused_and_fresh_trxid_per_request(builder):
+    first = builder.build(make_trx())
+    second = builder.build(make_trx(dest="0899", subproduct="X"))
+    assert builder.stats()["templates"] == 1
+    assert second["params"]["to"] == "0899"
+    assert second["params"]["kolom"] == "X"
+    assert first["params"]["trxid"] != second["params"]["trxid"]
+    assert "kolom" not in first["params"]
+
+
+def test_reloaded_objects_recompile_template(builder):
+    builder.build(make_trx())
+    # reload membuat objek baru: template lama tidak dipakai lagi
+    builder.product_repo.items["DATA01"] = make_product(api_path="/api/v2/trx")
+    assert builder.build(make_trx())["url"].endswith("/api/v2/trx")
+    assert builder.stats() == {"templates": 1, "invalidations": 0}
+
+
+def test_invalidate_drops_templates(builder):
+    builder.build(make_trx())
+    builder.invalidate()
+    assert builder.stats() == {"templates": 0, "invalidations": 1}
+
+
+def test_targeted_invalidate_keeps_unrelated_templates(builder):
+    builder.build(make_trx())
+    assert builder.invalidate(productids={"OTHER"}, moduleids=()) == 0
+    assert builder.stats()["templates"] == 1
+    assert builder.invalidate(moduleids={"DGP01"}) == 1
+    assert builder.stats() == {"templates": 0, "invalidations": 2}
+
+
+def test_unknown_product_not_cached(builder):
+    assert builder.build(make_trx(product="NOPE")) == {
+        "method": None,
+        "url": "",
+        "params": {},
+    }
+    assert builder.stats()["templates"] == 0
@@ -0,0 +1,64 @@
+import json
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from src.domain.module.sch_module import ModuleInDB
+from src.router.rtr_digipos import forward_digipos_trx
+from src.service.parser.digipos import parser_service
+from src.service.parser.digipos.base_parser import MAX_CHAR_LIMIT
+from src.service.parser.digipos.cache_parser import ParsedCatalogCache
+from src.service.parser.digipos.executor_parser import ParserExecutor
+from src.service.upstream.srv_forwarder import UpstreamForwarder
+from src.service.upstream.srv_httpclient import UpstreamClientRegistry
+
+from tests.parser.conftest import make_catalog
+from tests.upstream.conftest import valid_module_dict
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(parser_service, "catalog_cache", ParsedCatalogCache())
+
+
+class StaticQueryBuilder:
+    def __init__(self, params):
+        self.params = params
+
+    def build_resolved(self, _trx, _product, module):
+        return {"method": "GET", "url": module.base_url, "params": self.params}
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+async def test_reply_body_fits_char_limit(streaming):
+    # catalog besar + `to` dan trxid panjang: prefix reply ikut makan budget
+    catalog = make_catalog(600)
+    catalog["to"] = "0812" * 100
+    body = json.dumps(catalog).encode()
+
+    clients = UpstreamClientRegistry()
+    clients._create_client = lambda _module: httpx.AsyncClient(
+        transport=httpx.MockTransport(
+            lambda _request: httpx.Response(200, content=body)
+        )
+    )
+    product = SimpleNamespace(
+        required_params=SimpleNamespace(category="DATA"), idempotent=False
+    )
+    ctx = SimpleNamespace(
+        product=product, module=ModuleInDB(**valid_module_dict()), candidates=[]
+    )
+    executor = ParserExecutor(streaming=streaming)
+    stored = await forward_digipos_trx(
+        SimpleNamespace(),
+        ctx,
+        UpstreamForwarder(clients),
+        executor,
+        StaticQueryBuilder({"trxid": "T" * 64}),
+    )
+    await clients.aclose()
+
+    assert int(stored.headers["X-Products-Dropped"]) > 0
+    assert stored.content.startswith(f"trxid={'T' * 64}&status=200&to=0812")
+    assert len(stored.content) <= MAX_CHAR_LIMIT
+    assert executor.stats()["streamed"] == int(streaming)
@@ -0,0 +1,153 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+import yaml
+from src.domain.digipos.rep_digipos import DigiposProductRepository
+from src.domain.member.rep_member import MemberRepository
+from src.domain.module.rep_module import ModuleRepository
+from src.service.dto.srv_dtosnapshot import SnapshotPublisher, active_only
+
+from tests.loadtest.fixtures import write_fixtures
+
+
+@pytest.fixture
+def data_path(tmp_path):
+    write_fixtures(
+        tmp_path, "http://127.0.0.1:9001", members=3, modules=2, categories=["DATA"]
+    )
+    return tmp_path
+
+
+def test_publish_builds_immutable_indexed_snapshot():
+    publisher = SnapshotPublisher(lambda item: item["id"])
+    snapshot = publisher.publish([{"id": "A"}, {"id": "B"}])
+    assert snapshot.version == 1
+    assert publisher.current is snapshot
+    assert list(snapshot.by_id) == ["A", "B"]
+    with pytest.raises(TypeError):
+        snapshot.by_id["C"] = {"id": "C"}  # type: ignore[index]
+    assert publisher.publish([]).version == 2
+
+
+def test_reload_swaps_snapshot_and_bumps_version(data_path):
+    repo = MemberRepository(data_path / "members.yaml")
+    first = repo.snapshot
+    assert repo.version == 1
+
+    write_fixtures(data_path, "http://127.0.0.1:9001", members=5, modules=2)
+    repo.reload()
+
+    assert repo.version == 2
+    assert repo.get_member_count() == 5
+    # snapshot lama tidak ikut berubah (reader yang masih memegangnya aman)
+    assert len(first) == 3
+    assert set(first.by_id) == {m.memberid for m in first.items}
+
+
+@pytest.mark.parametrize(
+    ("repo_cls", "filename"),
+    [
+        (MemberRepository, "members.yaml"),
+        (ModuleRepository, "modules.yaml"),
+        (DigiposProductRepository, "digipos.yaml"),
+    ],
+)
+def test_failed_reload_keeps_last_good_snapshot(data_path, repo_cls, filename):
+    repo = repo_cls(data_path / filename)
+    before = repo.snapshot
+    (data_path / filename).write_text("not: [valid", encoding="utf-8")
+
+    repo.reload()
+
+    assert repo.snapshot is before
+    stats = repo.snapshot_stats()
+    assert stats["version"] == 1
+    assert stats["failed_reloads"] == 1
+    assert stats["last_error"]
+
+
+def test_digipos_missing_file_keeps_products(data_path):
+    repo = DigiposProductRepository(data_path / "digipos.yaml")
+    (data_path / "digipos.yaml").unlink()
+    repo.reload()
+    assert repo.has_product("LTDATA")
+    assert len(repo.get_all_products()) == 1
+
+
+def test_clear_data_publishes_empty_snapshot(data_path):
+    repo = ModuleRepository(data_path / "modules.yaml")
+    held = repo.snapshot
+    repo.clear_data()
+    assert repo.get_module_count() == 0
+    assert repo.version == 2
+    assert len(held) == 2
+
+
+def test_readers_never_see_torn_state(data_path):
+    repo = MemberRepository(data_path / "members.yaml")
+    stop = threading.Event()
+    torn = []
+
+    def reader():
+        while not stop.is_set():
+            snapshot = repo.snapshot
+            if [m.memberid for m in snapshot.items] != list(snapshot.by_id):
+                torn.append(snapshot.version)
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    try:
+        for members in (1, 4, 2, 6):
+            write_fixtures(data_path, "http://127.0.0.1:9001", members=members)
+            repo.reload()
+    finally:
+        stop.set()
+        thread.join()
+
+    assert torn == []
+    assert repo.version == 5
+
+
+def test_build_indexes_multi_key_and_active_only():
+    publisher = SnapshotPublisher(
+        lambda item: item.id,
+        {
+            "tag": lambda item: item.tags,
+            "active_tag": active_only(lambda item: item.tags),
+        },
+    )
+    a = SimpleNamespace(id="A", tags=["x", "y", "x"], is_active=True)
+    b = SimpleNamespace(id="B", tags=["y"], is_active=False)
+    assert publisher.current.lookup("tag", "x") == ()
+
+    snapshot = publisher.publish([a, b])
+    assert snapshot.lookup("tag", "x") == (a,)
+    assert snapshot.lookup("tag", "y") == (a, b)
+    assert snapshot.lookup("active_tag", "y") == (a,)
+    with pytest.raises(KeyError):
+        snapshot.lookup("missing", "x")
+
+
+def test_product_and_module_indexes_rebuilt_on_reload(data_path):
+    products = DigiposProductRepository(data_path / "digipos.yaml")
+    modules = ModuleRepository(data_path / "modules.yaml")
+    assert [p.productid for p in products.get_products_by_module("LOADDGP01")] == [
+        "LTDATA"
+    ]
+    assert len(modules.get_module_by_provider("digipos")) == 2
+    assert modules.get_module_by_provider("other") == []
+
+    path = data_path / "digipos.yaml"
+    data = yaml.safe_load(path.read_text(encoding="utf-8"))
+    data["products"][0].update(is_active=False, type="voucher")
+    path.write_text(yaml.safe_dump(data, sort_keys=False), encoding="utf-8")
+    products.reload()
+
+    assert products.get_products_by_type("catalog") == []
+    assert len(products.get_products_by_type("voucher")) == 1
+    assert products.get_products_by_provider("digipos", active_only=True) == []
+    assert products.get_active_products() == []
+    assert len(products.find_products(provider="digipos", moduleid="LOADDGP00")) == 1
+    assert products.find_products(moduleid="LOADDGP00", active_only=True) == []
+    assert products.snapshot_stats()["indexes"]["module"] == 2
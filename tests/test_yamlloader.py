@@ -0,0 +1,138 @@
+import pytest
+import yaml
+from src.domain.member.rep_member import MemberRepository
+from src.domain.member.sch_member import MemberInDB
+from src.mlogg import logger
+from src.service.dto.srv_dtoloader import GenericYamlLoader, LoadDiff, cache_path_for
+
+from tests.loadtest.fixtures import write_fixtures
+
+
+@pytest.fixture
+def members_file(tmp_path):
+    write_fixtures(tmp_path, "http://127.0.0.1:9001", members=4, categories=["DATA"])
+    return tmp_path / "members.yaml"
+
+
+def edit_members(path, edit):
+    data = yaml.safe_load(path.read_text(encoding="utf-8"))
+    edit(data["members"])
+    path.write_text(yaml.safe_dump(data, sort_keys=False), encoding="utf-8")
+
+
+@pytest.fixture
+def loader():
+    return GenericYamlLoader("members", "memberid", MemberInDB, logger)
+
+
+def test_first_load_adds_everything(loader, members_file):
+    result = loader.load_incremental(members_file)
+    assert len(result.items) == 4
+    assert result.diff.added == {"LOAD000", "LOAD001", "LOAD002", "LOAD003"}
+    assert not result.diff.changed
+    assert not result.diff.removed
+
+
+def test_only_changed_items_revalidated(loader, members_file, mocker):
+    first = {m.memberid: m for m in loader.load_incremental(members_file).items}
+
+    def edit(rows):
+        rows[1]["name"] = "Renamed"
+        rows.pop(2)
+        rows.append({**rows[0], "memberid": "NEW001"})
+
+    edit_members(members_file, edit)
+    validate = mocker.spy(loader, "_validate")
+    result = loader.load_incremental(members_file)
+
+    assert validate.call_count == 2
+    assert result.diff == LoadDiff(
+        added=frozenset({"NEW001"}),
+        removed=frozenset({"LOAD002"}),
+        changed=frozenset({"LOAD001"}),
+    )
+    assert result.diff.stale == {"LOAD001", "LOAD002"}
+    second = {m.memberid: m for m in result.items}
+    assert second["LOAD000"] is first["LOAD000"]
+    assert second["LOAD001"] is not first["LOAD001"]
+    assert second["LOAD001"].name == "Renamed"
+
+
+def test_unchanged_and_reordered(loader, members_file):
+    loader.load_incremental(members_file)
+    assert not loader.load_incremental(members_file).diff
+
+    edit_members(members_file, lambda rows: rows.reverse())
+    result = loader.load_incremental(members_file)
+    assert result.diff.reordered
+    assert result.items[0].memberid == "LOAD003"
+
+
+def test_failed_load_keeps_previous_state(loader, members_file):
+    loader.load_incremental(members_file)
+    original = members_file.read_text(encoding="utf-8")
+    edit_members(members_file, lambda rows: rows[0].update(pin="1"))
+    with pytest.raises(ValueError):
+        loader.load_incremental(members_file)
+
+    members_file.write_text(original, encoding="utf-8")
+    assert not loader.load_incremental(members_file).diff
+
+
+def test_repository_skips_publish_when_unchanged(members_file):
+    repo = MemberRepository(members_file)
+    snapshot = repo.snapshot
+    assert not repo.reload()
+    assert repo.snapshot is snapshot
+
+    edit_members(members_file, lambda rows: rows[0].update(is_active=False))
+    assert repo.reload().changed == {"LOAD000"}
+    assert repo.version == 2
+    assert repo.get_member_by_id("LOAD001") is snapshot.by_id["LOAD001"]
+
+
+def test_repository_clear_data_forces_full_load(members_file):
+    repo = MemberRepository(members_file)
+    repo.clear_data()
+    assert len(repo.reload().added) == 4
+    assert repo.get_member_count() == 4
+
+
+def test_sidecar_cache_skips_parse_and_validation(members_file, mocker):
+    cold = GenericYamlLoader("members", "memberid", MemberInDB, logger, cache=True)
+    expected = cold.load_incremental(members_file).items
+    assert cache_path_for(members_file).exists()
+
+    warm = GenericYamlLoader("members", "memberid", MemberInDB, logger, cache=True)
+    parse = mocker.spy(warm, "_parse_items")
+    validate = mocker.spy(warm, "_validate")
+    result = warm.load_incremental(members_file)
+
+    assert parse.call_count == 0
+    assert validate.call_count == 0
+    assert result.items == expected
+    assert len(result.diff.added) == 4
+
+
+def test_sidecar_cache_ignored_when_file_changes(members_file, mocker):
+    GenericYamlLoader(
+        "members", "memberid", MemberInDB, logger, cache=True
+    ).load_incremental(members_file)
+    edit_members(members_file, lambda rows: rows[0].update(name="Changed"))
+
+    warm = GenericYamlLoader("members", "memberid", MemberInDB, logger, cache=True)
+    parse = mocker.spy(warm, "_parse_items")
+    result = warm.load_incremental(members_file)
+    assert parse.call_count == 1
+    assert result.items[0].name == "Changed"
+
+
+def test_corrupt_sidecar_falls_back_to_yaml(members_file):
+    cache_path_for(members_file).write_bytes(b"not a pickle")
+    loader = GenericYamlLoader("members", "memberid", MemberInDB, logger, cache=True)
+    assert len(loader.load_incremental(members_file).items) == 4
+
+
+def test_cache_disabled_writes_no_sidecar(loader, members_file):
+    loader.load_incremental(members_file)
+    assert not cache_path_for(members_file).exists()
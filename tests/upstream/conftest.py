@@ -0,0 +1,30 @@
+import pytest
+from src.domain.module.sch_module import ModuleInDB
+
+
+def valid_module_dict(**overrides):
+    data = {
+        "moduleid": "DGP01",
+        "name": "Digipos 01",
+        "username": "dguser",
+        "msisdn": "08123456789",
+        "pin": "123456",
+        "password": "secret",
+        "email": "module@example.com",
+        "is_active": True,
+        "base_url": "http://digipos.local",
+        "timeout": 5,
+        "max_retries": 2,
+        "second_wait": 1,
+        "provider": "digipos",
+    }
+    data.update(overrides)
+    return data
+
+
+@pytest.fixture
+def make_module():
+    def _make(**overrides):
+        return ModuleInDB(**valid_module_dict(**overrides))
+
+    return _make
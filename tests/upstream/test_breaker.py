@@ -0,0 +1,80 @@
+import httpx
+import pytest
+from src.custom.cst_exceptions import ServiceError, UpstreamError
+from src.service.upstream.srv_breaker import (
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    CircuitState,
+)
+from src.service.upstream.srv_forwarder import UpstreamForwarder
+from src.service.upstream.srv_httpclient import UpstreamClientRegistry
+
+
+def test_breaker_opens_after_threshold():
+    breaker = CircuitBreaker("DGP01", failure_threshold=2, recovery_timeout=60)
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    with pytest.raises(ServiceError) as exc_info:
+        breaker.before_call()
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.context["moduleid"] == "DGP01"
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker("DGP01", failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_half_open_allows_limited_probe_then_closes():
+    breaker = CircuitBreaker("DGP01", failure_threshold=1, recovery_timeout=0)
+    breaker.record_failure()
+    assert breaker.state == CircuitState.HALF_OPEN
+    breaker.before_call()
+    with pytest.raises(ServiceError):
+        breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_half_open_failure_reopens():
+    breaker = CircuitBreaker("DGP01", failure_threshold=1, recovery_timeout=0)
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.recovery_timeout = 60
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+
+
+def test_registry_uses_module_config(make_module):
+    registry = CircuitBreakerRegistry()
+    breaker = registry.get(make_module(breaker_failure_threshold=3))
+    assert breaker.failure_threshold == 3
+    assert registry.get(make_module(breaker_failure_threshold=7)) is breaker
+    assert breaker.failure_threshold == 7
+    assert registry.stats()["DGP01"]["state"] == "closed"
+
+
+async def test_forwarder_fails_fast_when_open(make_module):
+    calls = {"count": 0}
+
+    def handler(request):
+        calls["count"] += 1
+        raise httpx.ConnectError("down", request=request)
+
+    clients = UpstreamClientRegistry()
+    module = make_module(max_retries=0, breaker_failure_threshold=1)
+    clients._create_client = lambda _m: httpx.AsyncClient(
+        transport=httpx.MockTransport(handler)
+    )
+    forwarder = UpstreamForwarder(clients)
+    with pytest.raises(UpstreamError):
+        await forwarder.forward(module, "GET", "http://x/trx", {})
+    with pytest.raises(ServiceError):
+        await forwarder.forward(module, "GET", "http://x/trx", {})
+    assert calls["count"] == 1
+    await clients.aclose()
@@ -0,0 +1,117 @@
+import httpx
+import pytest
+from src.custom.cst_exceptions import UpstreamError
+from src.service.upstream.srv_forwarder import UpstreamForwarder, is_failover_safe
+from src.service.upstream.srv_health import ModuleHealthTracker
+from src.service.upstream.srv_httpclient import UpstreamClientRegistry
+
+
+def make_forwarder(handlers):
+    clients = UpstreamClientRegistry()
+    clients._create_client = lambda module: httpx.AsyncClient(
+        transport=httpx.MockTransport(handlers[module.moduleid])
+    )
+    return UpstreamForwarder(clients)
+
+
+def query_for(method="GET"):
+    def build(module):
+        return {"method": method, "url": f"http://{module.moduleid}/trx", "params": {}}
+
+    return build
+
+
+def down(request):
+    raise httpx.ConnectError("down", request=request)
+
+
+def ok(_request):
+    return httpx.Response(200, json={"ok": True})
+
+
+def test_health_rank_prefers_low_latency_and_errors(make_module):
+    tracker = ModuleHealthTracker()
+    fast, slow, broken = (
+        make_module(moduleid="FAST1"),
+        make_module(moduleid="SLOW1"),
+        make_module(moduleid="BROKE"),
+    )
+    tracker.finish("FAST1", 0.05, True)
+    tracker.finish("SLOW1", 0.8, True)
+    tracker.finish("BROKE", 0.05, False)
+    ranked = tracker.rank([slow, broken, fast])
+    assert [m.moduleid for m in ranked] == ["FAST1", "SLOW1", "BROKE"]
+
+
+async def test_failover_to_next_module(make_module):
+    forwarder = make_forwarder({"MODA1": down, "MODB1": ok})
+    modules = [
+        make_module(moduleid="MODA1", max_retries=0),
+        make_module(moduleid="MODB1", max_retries=0),
+    ]
+    module, query, result = await forwarder.forward_with_failover(modules, query_for())
+    assert module.moduleid == "MODB1"
+    assert query["url"] == "http://MODB1/trx"
+    assert result.failovers == 1
+    assert result.moduleid == "MODB1"
+    assert forwarder.health.stats()["MODA1"]["error_rate"] == 1.0
+    await forwarder.clients.aclose()
+
+
+async def test_failover_raises_when_all_fail(make_module):
+    forwarder = make_forwarder({"MODA1": down, "MODB1": down})
+    modules = [
+        make_module(moduleid="MODA1", max_retries=0),
+        make_module(moduleid="MODB1", max_retries=0),
+    ]
+    with pytest.raises(UpstreamError):
+        await forwarder.forward_with_failover(modules, query_for())
+    await forwarder.clients.aclose()
+
+
+@pytest.mark.parametrize("method", ["GET", "POST"])
+async def test_sent_request_not_failed_over_by_default(make_module, method):
+    # pembelian Digipos juga GET: module lain = akun lain = potensi double charge
+    def read_timeout(request):
+        raise httpx.ReadTimeout("slow", request=request)
+
+    calls = {"count": 0}
+
+    def counted_ok(request):
+        calls["count"] += 1
+        return ok(request)
+
+    forwarder = make_forwarder({"MODA1": read_timeout, "MODB1": counted_ok})
+    modules = [
+        make_module(moduleid="MODA1", max_retries=0),
+        make_module(moduleid="MODB1", max_retries=0),
+    ]
+    with pytest.raises(UpstreamError):
+        await forwarder.forward_with_failover(modules, query_for(method))
+    assert calls["count"] == 0
+    await forwarder.clients.aclose()
+
+
+@pytest.mark.parametrize(
+    ("idempotent", "served_by"), [(False, "MODA1"), (True, "MODB1")]
+)
+async def test_5xx_failed_over_only_for_idempotent_product(
+    make_module, idempotent, served_by
+):
+    forwarder = make_forwarder({"MODA1": lambda _r: httpx.Response(503), "MODB1": ok})
+    modules = [
+        make_module(moduleid="MODA1", max_retries=0),
+        make_module(moduleid="MODB1", max_retries=0),
+    ]
+    module, _, result = await forwarder.forward_with_failover(
+        modules, query_for(), idempotent=idempotent
+    )
+    assert module.moduleid == served_by
+    assert result.failovers == int(idempotent)
+    await forwarder.clients.aclose()
+
+
+def test_is_failover_safe():
+    assert is_failover_safe(UpstreamError(cause=httpx.ConnectError("down")))
+    assert not is_failover_safe(UpstreamError(cause=httpx.ReadError("x")))
+    assert is_failover_safe(UpstreamError(cause=httpx.ReadError("x")), idempotent=True)
@@ -0,0 +1,43 @@
+import httpx
+from src.service.upstream.srv_httpclient import UpstreamClientRegistry
+
+
+async def test_client_reused_per_module(make_module):
+    registry = UpstreamClientRegistry()
+    module = make_module()
+    client = await registry.acquire(module)
+    assert isinstance(client, httpx.AsyncClient)
+    assert await registry.acquire(module) is client
+    assert await registry.acquire(make_module(moduleid="DGP02")) is not client
+    await registry.aclose()
+
+
+async def test_client_rebuilt_when_config_changes(make_module):
+    registry = UpstreamClientRegistry()
+    client = registry.get_client(make_module())
+    new_client = registry.get_client(make_module(max_connections=5))
+    assert new_client is not client
+    assert registry.stats()["retired"] == 1
+    await registry.aclose()
+    assert client.is_closed
+    assert new_client.is_closed
+
+
+async def test_rebuild_retires_removed_and_inactive(make_module):
+    registry = UpstreamClientRegistry()
+    registry.get_client(make_module())
+    registry.get_client(make_module(moduleid="DGP02"))
+    registry.rebuild([make_module(), make_module(moduleid="DGP02", is_active=False)])
+    stats = registry.stats()
+    assert set(stats["modules"]) == {"DGP01"}
+    assert stats["retired"] == 1
+    await registry.aclose()
+    assert registry.stats() == {"modules": {}, "retired": 0}
+
+
+async def test_pool_stats_shape(make_module):
+    registry = UpstreamClientRegistry()
+    registry.get_client(make_module())
+    stats = registry.stats()["modules"]["DGP01"]
+    assert stats == {"open": 0, "idle": 0, "active": 0, "waiting": 0}
+    await registry.aclose()
@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+from src.custom.cst_exceptions import ServiceError
+from src.service.upstream.srv_limiter import (
+    ConcurrencyLimiter,
+    ConcurrencyLimiterRegistry,
+)
+
+
+async def test_limiter_admits_up_to_max_concurrency():
+    limiter = ConcurrencyLimiter("DGP01", max_concurrency=2, max_queue=0)
+    assert await limiter.acquire() == 0.0
+    assert await limiter.acquire() == 0.0
+    with pytest.raises(ServiceError) as exc_info:
+        await limiter.acquire()
+    assert exc_info.value.status_code == 503
+    assert limiter.snapshot()["rejected"] == 1
+
+
+async def test_queued_request_waits_for_slot():
+    limiter = ConcurrencyLimiter("DGP01", max_concurrency=1, max_queue=1)
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0.01)
+    assert limiter.snapshot()["queue_depth"] == 1
+    limiter.release()
+    waited = await waiter
+    assert waited > 0
+    stats = limiter.snapshot()
+    assert stats["queue_depth"] == 0
+    assert stats["active"] == 1
+    assert stats["max_queue_depth"] == 1
+
+
+async def test_queue_timeout_rejects():
+    limiter = ConcurrencyLimiter(
+        "DGP01", max_concurrency=1, max_queue=5, queue_timeout=0.01
+    )
+    await limiter.acquire()
+    with pytest.raises(ServiceError):
+        await limiter.acquire()
+    stats = limiter.snapshot()
+    assert stats["timeouts"] == 1
+    assert stats["queue_depth"] == 0
+
+
+async def test_slot_releases_on_error():
+    limiter = ConcurrencyLimiter("DGP01", max_concurrency=1, max_queue=0)
+    with pytest.raises(RuntimeError):
+        async with limiter.slot():
+            raise RuntimeError("boom")
+    assert limiter.snapshot()["active"] == 0
+
+
+def test_registry_recreates_limiter_on_config_change(make_module):
+    registry = ConcurrencyLimiterRegistry()
+    limiter = registry.get(make_module(max_concurrency=3))
+    assert registry.get(make_module(max_concurrency=3)) is limiter
+    assert registry.get(make_module(max_concurrency=4)) is not limiter
+    assert registry.stats()["DGP01"]["max_concurrency"] == 4
@@ -0,0 +1,225 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from src.custom.cst_exceptions import (
+    UpstreamError,
+    UpstreamResponseTooLargeError,
+    UpstreamTimeoutError,
+)
+from src.service.parser.digipos import parser_service
+from src.service.upstream.srv_retry import RetryPolicy, send_with_retry
+
+
+def make_client(handler):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def flaky_handler(failures, error=None, status=503):
+    calls = {"count": 0}
+
+    def handler(request):
+        calls["count"] += 1
+        if calls["count"] <= failures:
+            if error is not None:
+                raise error("boom", request=request)
+            return httpx.Response(status)
+        return httpx.Response(200, json={"ok": True})
+
+    return handler, calls
+
+
+async def test_get_retries_on_connect_error(make_module):
+    handler, calls = flaky_handler(2, error=httpx.ConnectError)
+    module = make_module(max_retries=2, second_wait=0)
+    async with make_client(handler) as client:
+        result = await send_with_retry(client, module, "GET", "http://x/trx", {})
+    assert result.response.status_code == 200
+    assert result.attempts == 3
+    assert result.retries == 2
+    assert calls["count"] == 3
+
+
+async def test_idempotent_retries_on_retryable_status(make_module):
+    handler, calls = flaky_handler(1, status=502)
+    module = make_module(max_retries=1, second_wait=0)
+    async with make_client(handler) as client:
+        result = await send_with_retry(
+            client, module, "GET", "http://x/trx", {}, idempotent=True
+        )
+    assert result.response.status_code == 200
+    assert calls["count"] == 2
+
+
+@pytest.mark.parametrize(
+    ("error", "status"), [(httpx.ReadTimeout, 503), (None, 503), (None, 504)]
+)
+async def test_get_purchase_not_resent_by_default(make_module, error, status):
+    # method GET bukan jaminan idempotent: pembelian Digipos juga GET
+    handler, calls = flaky_handler(1, error=error, status=status)
+    module = make_module(max_retries=3, second_wait=0)
+    async with make_client(handler) as client:
+        if error is None:
+            result = await send_with_retry(client, module, "GET", "http://x/trx", {})
+            assert result.response.status_code == status
+        else:
+            with pytest.raises(UpstreamTimeoutError):
+                await send_with_retry(client, module, "GET", "http://x/trx", {})
+    assert calls["count"] == 1
+
+
+async def test_slow_streamed_body_bounded_by_module_deadline(make_module):
+    async def trickle():
+        for _ in range(100):
+            await asyncio.sleep(0.05)  # tiap read < timeout httpx
+            yield b"x"
+
+    module = make_module(timeout=1, max_retries=0)
+    handler = respond(200, content=trickle())
+    started = time.monotonic()
+    async with make_client(handler) as client:
+        with pytest.raises(UpstreamTimeoutError):
+            await send_with_retry(client, module, "GET", "http://x/trx", {})
+    assert time.monotonic() - started < 2.0
+
+
+async def test_post_not_retried_after_request_sent(make_module):
+    handler, calls = flaky_handler(1, error=httpx.ReadTimeout)
+    module = make_module(max_retries=3, second_wait=0)
+    async with make_client(handler) as client:
+        with pytest.raises(UpstreamTimeoutError):
+            await send_with_retry(client, module, "POST", "http://x/trx", {})
+    assert calls["count"] == 1
+
+
+async def test_post_retried_when_nothing_sent(make_module):
+    handler, calls = flaky_handler(1, error=httpx.ConnectError)
+    module = make_module(max_retries=1, second_wait=0)
+    async with make_client(handler) as client:
+        result = await send_with_retry(client, module, "POST", "http://x/trx", {})
+    assert result.attempts == 2
+    assert calls["count"] == 2
+
+
+async def test_post_status_not_retried(make_module):
+    handler, calls = flaky_handler(1, status=503)
+    module = make_module(max_retries=3, second_wait=0)
+    async with make_client(handler) as client:
+        result = await send_with_retry(client, module, "POST", "http://x/trx", {})
+    assert result.response.status_code == 503
+    assert calls["count"] == 1
+
+
+async def test_retries_exhausted_raises_upstream_error(make_module):
+    handler, calls = flaky_handler(5, error=httpx.ConnectError)
+    module = make_module(max_retries=1, second_wait=0)
+    async with make_client(handler) as client:
+        with pytest.raises(UpstreamError) as exc_info:
+            await send_with_retry(client, module, "GET", "http://x/trx", {})
+    assert exc_info.value.context["attempts"] == 2
+    assert calls["count"] == 2
+
+
+async def test_backoff_never_exceeds_deadline(make_module):
+    handler, calls = flaky_handler(10, error=httpx.ConnectError)
+    module = make_module(max_retries=10, second_wait=5, timeout=1)
+    async with make_client(handler) as client:
+        with pytest.raises(UpstreamError):
+            await send_with_retry(client, module, "GET", "http://x/trx", {})
+    assert calls["count"] < 11
+
+
+def test_backoff_is_bounded_by_exponential_cap():
+    policy = RetryPolicy(max_retries=3, base_wait=1.0, deadline=10.0)
+    for attempt in (1, 2, 3):
+        assert 0 <= policy.backoff(attempt) <= 2 ** (attempt - 1)
+    assert RetryPolicy(max_retries=3, base_wait=0, deadline=10).backoff(3) == 0
+
+
+class RecordingConsumer:
+    def __init__(self):
+        self.chunks = []
+        self.resets = 0
+
+    def feed(self, chunk):
+        self.chunks.append(chunk)
+
+    def reset(self):
+        self.resets += 1
+        self.chunks.clear()
+
+
+def respond(status, **kwargs):
+    def handler(_request):
+        return httpx.Response(status, **kwargs)
+
+    return handler
+
+
+async def stream_body(size, chunk=1024):
+    for _ in range(size // chunk):
+        yield b"x" * chunk
+
+
+async def test_body_over_declared_size_rejected(make_module):
+    module = make_module(max_body_size=100, max_retries=0)
+    handler = respond(200, content=b"x" * 101)
+    async with make_client(handler) as client:
+        with pytest.raises(UpstreamResponseTooLargeError) as exc_info:
+            await send_with_retry(client, module, "GET", "http://x/trx", {})
+    assert exc_info.value.context["size"] == 101
+
+
+async def test_streamed_body_aborted_once_limit_crossed(make_module):
+    module = make_module(max_body_size=4096, max_retries=0)
+    handler = respond(200, content=stream_body(10**6))
+    async with make_client(handler) as client:
+        with pytest.raises(UpstreamResponseTooLargeError) as exc_info:
+            await send_with_retry(client, module, "GET", "http://x/trx", {})
+    assert exc_info.value.context["size"] == 5120
+
+
+async def test_body_within_limit_is_returned(make_module):
+    module = make_module(max_body_size=4096)
+    handler = respond(200, content=stream_body(4096))
+    async with make_client(handler) as client:
+        result = await send_with_retry(client, module, "GET", "http://x/trx", {})
+    assert result.body == b"x" * 4096
+
+
+async def test_consumer_receives_success_body_only(make_module):
+    handler, _ = flaky_handler(1, status=502)
+    module = make_module(max_retries=1, second_wait=0)
+    consumer = RecordingConsumer()
+    async with make_client(handler) as client:
+        result = await send_with_retry(
+            client, module, "GET", "http://x/trx", {}, consumer, idempotent=True
+        )
+    assert result.body == b""
+    assert b"".join(consumer.chunks) == b'{"ok":true}'
+    assert consumer.resets == 1
+
+
+async def test_consumer_not_fed_error_status(make_module):
+    module = make_module(max_retries=0)
+    handler = respond(404, json={"error": "x"})
+    consumer = RecordingConsumer()
+    async with make_client(handler) as client:
+        result = await send_with_retry(
+            client, module, "GET", "http://x/trx", {}, consumer
+        )
+    assert consumer.chunks == []
+    assert result.body == b'{"error":"x"}'
+
+
+async def test_invalid_streamed_body_raises_upstream_error(make_module):
+    module = make_module(max_retries=0)
+    handler = respond(200, content=b'{"paket": [{"productName": "\xff\xfe"}]}')
+    stream = parser_service.open_category_stream("DATA")
+    async with make_client(handler) as client:
+        with pytest.raises(UpstreamError) as exc_info:
+            await send_with_retry(client, module, "GET", "http://x/trx", {}, stream)
+    assert exc_info.value.message == "Upstream returned a non-JSON response"
+    assert exc_info.value.context["status"] == 200
+    assert isinstance(exc_info.value.__cause__, UnicodeDecodeError)